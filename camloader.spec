@@ -40,6 +40,8 @@ a = Analysis(
         're',
         'time',
         'typing',
+        'ctypes',
+        'fcntl',
         
         # Third-party modules
         'PIL',
@@ -50,15 +52,36 @@ a = Analysis(
         
         # Application modules
         'camera',
+        'camera.async_controller',
+        'camera.background',
+        'camera.cache',
         'camera.controller',
+        'camera.daemon',
+        'camera.dependencies',
+        'camera.enforcer',
+        'camera.events',
+        'camera.executor',
+        'camera.identity',
+        'camera.profile',
+        'camera.remote',
+        'camera.watcher',
+        'camera.writer',
+        'camera.v4l2_ioctl',
         'gui', 
+        'gui.dispatch',
+        'gui.imaging',
         'gui.main_window',
         'gui.parameter_frame',
         'gui.preview_frame',
         'config',
         'config.manager',
+        'config.startup',
+        'config.store',
+        'config.writer',
+        'headless',
         'utils',
         'utils.logger',
+        'utils.profiler',
     ],
     hookspath=[],  # Additional hook directories
     hooksconfig={},  # Hook configuration
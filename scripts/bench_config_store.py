@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Config Store Benchmark
+Compares the SQLite config store against the previous per-device JSON files
+
+Usage: python scripts/bench_config_store.py [--configs N] [--controls N] [--rounds N]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config.store import KIND_BACKUP, KIND_CONFIG, ConfigStore  # noqa: E402
+
+def make_config(index: int, controls: int) -> dict:
+    """A saved configuration shaped like ConfigManager.save_camera_config output"""
+    camera_id = f"usb/046d:{index:04x}:SN{index:06d}#0"
+    return {
+        "camera_id": camera_id,
+        "device_path": f"/dev/video{index * 2}",
+        "device_name": f"Camera {index}",
+        "saved_at": datetime.now().isoformat(),
+        "parameters": {
+            f"control_{n}": {
+                "name": f"control_{n}", "value": n, "min_val": 0, "max_val": 255, "step": 1,
+                "default_value": 128, "param_type": "int", "flags": [], "original_value": n,
+            }
+            for n in range(controls)
+        },
+    }
+
+def write_legacy_files(config_dir: Path, configs: list):
+    """Per-device files as written by earlier versions (pretty-printed, config + backup)"""
+    for config in configs:
+        stem = config["camera_id"].replace("/", "_").replace(":", "_").replace("#", "_")
+        with open(config_dir / f"{stem}.json", 'w') as f:
+            json.dump(config, f, indent=2)
+        with open(config_dir / f"{stem}_backup.json", 'w') as f:
+            json.dump(dict(config, backed_up_at=config["saved_at"]), f, indent=2)
+
+def legacy_list(config_dir: Path) -> list:
+    """Previous list_saved_configs: glob and parse every file for three header fields"""
+    configs = []
+    for config_file in config_dir.glob("*.json"):
+        if config_file.name.endswith("_backup.json"):
+            continue
+        with open(config_file, 'r') as f:
+            data = json.load(f)
+        configs.append({"device_path": data.get("device_path"), "device_name": data.get("device_name"),
+                        "saved_at": data.get("saved_at")})
+    return configs
+
+def legacy_load_all(config_dir: Path) -> dict:
+    """Previous load_all_configs"""
+    configs = {}
+    for config_file in config_dir.glob("*.json"):
+        if not config_file.name.endswith("_backup.json"):
+            with open(config_file, 'r') as f:
+                data = json.load(f)
+            configs[data["camera_id"]] = data
+    return configs
+
+def measure(func, rounds: int) -> float:
+    """Best of five runs per call, to filter out scheduler noise"""
+    return min(timeit.repeat(func, number=rounds, repeat=5)) / rounds
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the config store")
+    parser.add_argument("--configs", type=int, default=1000, help="Stored camera configurations")
+    parser.add_argument("--controls", type=int, default=40, help="Controls per configuration")
+    parser.add_argument("--rounds", type=int, default=5, help="Calls per timed run")
+    args = parser.parse_args()
+    
+    configs = [make_config(index, args.controls) for index in range(args.configs)]
+    middle = configs[len(configs) // 2]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_dir = Path(tmp) / "configs"
+        legacy_dir.mkdir()
+        write_legacy_files(legacy_dir, configs)
+        
+        started = timeit.default_timer()
+        store = ConfigStore(Path(tmp) / "camloader.db")
+        imported = store.import_files(legacy_dir)
+        import_s = timeit.default_timer() - started
+        
+        stem = middle["camera_id"].replace("/", "_").replace(":", "_").replace("#", "_")
+        legacy_file = legacy_dir / f"{stem}.json"
+        
+        def legacy_get():
+            with open(legacy_file, 'r') as f:
+                return json.load(f)
+        
+        def legacy_save():
+            with open(legacy_file, 'w') as f:
+                json.dump(middle, f, indent=2)
+        
+        batch = {(config["camera_id"], kind): config for config in configs[:100] for kind in (KIND_CONFIG, KIND_BACKUP)}
+        
+        rows = [
+            ("list (header fields)", measure(lambda: legacy_list(legacy_dir), args.rounds),
+             measure(lambda: store.list(KIND_CONFIG), args.rounds)),
+            ("load all", measure(lambda: legacy_load_all(legacy_dir), args.rounds),
+             measure(lambda: store.load_all(KIND_CONFIG), args.rounds)),
+            ("get one camera", measure(legacy_get, args.rounds * 100),
+             measure(lambda: store.get(middle["camera_id"]), args.rounds * 100)),
+            ("save one camera", measure(legacy_save, args.rounds * 20),
+             measure(lambda: store.put(middle["camera_id"], KIND_CONFIG, middle), args.rounds * 20)),
+        ]
+        batch_s = measure(lambda: store.put_many(batch), args.rounds)
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT camera_id, device_path, device_name, saved_at FROM configs "
+            "WHERE kind = ? ORDER BY camera_id", (KIND_CONFIG,)
+        ).fetchall()
+        store.close()
+    
+    print(f"{args.configs} configurations x {args.controls} controls "
+          f"(+ backups), best of 5 runs")
+    print(f"First-run import of {imported} JSON files: {import_s * 1000:.0f} ms")
+    print(f"  {'operation':<22} {'JSON files':>12} {'store':>12}")
+    for name, legacy, store_s in rows:
+        print(f"  {name:<22} {legacy * 1000:9.3f} ms {store_s * 1000:9.3f} ms ({legacy / store_s:.0f}x)")
+    print(f"  {'save 100 (one batch)':<22} {'':>12} {batch_s * 1000:9.3f} ms")
+    print("Listing query plan: " + "; ".join(row[-1] for row in plan))
+
+if __name__ == "__main__":
+    main()
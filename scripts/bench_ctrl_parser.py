@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Control Parser Benchmark
+Compares the v4l2-ctl --list-ctrls parser against the previous per-field regex parser
+
+Usage: python scripts/bench_ctrl_parser.py [--rounds N]
+"""
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from camera.controller import (  # noqa: E402
+    _CONTROL_LINE_PATTERN, V4L2Parameter, parse_control_line, parse_control_list
+)
+
+LEGACY_FIELD_PATTERNS = [
+    r"^\s*(\w+)", r"\((\w+)\)", r"value=([+-]?\d+)", r"min=([+-]?\d+)",
+    r"max=([+-]?\d+)", r"step=([+-]?\d+)", r"flags=([^\s]+)",
+]
+
+# Captured v4l2-ctl outputs from different cameras and v4l2-ctl versions
+CORPUS = {
+    "Logitech C920 (v4l2-ctl 1.22, --list-ctrls-menus)": """
+User Controls
+                     
+                     brightness 0x00980900 (int)    : min=0 max=255 step=1 default=128 value=128
+                       contrast 0x00980901 (int)    : min=0 max=255 step=1 default=128 value=128
+                     saturation 0x00980902 (int)    : min=0 max=255 step=1 default=128 value=128
+ white_balance_automatic 0x0098090c (bool)   : default=1 value=1
+                           gain 0x00980913 (int)    : min=0 max=255 step=1 default=0 value=0
+           power_line_frequency 0x00980918 (menu)   : min=0 max=2 default=2 value=2 (60 Hz)
+\t\t\t\t0: Disabled
+\t\t\t\t1: 50 Hz
+\t\t\t\t2: 60 Hz
+      white_balance_temperature 0x0098091a (int)    : min=2000 max=6500 step=1 default=4000 value=4000 flags=inactive
+                      sharpness 0x0098091b (int)    : min=0 max=255 step=1 default=128 value=128
+         backlight_compensation 0x0098091c (int)    : min=0 max=1 step=1 default=0 value=0
+
+Camera Controls
+                  
+                  auto_exposure 0x009a0901 (menu)   : min=0 max=3 default=3 value=3 (Aperture Priority Mode)
+\t\t\t\t1: Manual Mode
+\t\t\t\t3: Aperture Priority Mode
+         exposure_time_absolute 0x009a0902 (int)    : min=3 max=2047 step=1 default=250 value=250 flags=inactive
+     exposure_dynamic_framerate 0x009a0903 (bool)   : default=0 value=1
+                   pan_absolute 0x009a0908 (int)    : min=-36000 max=36000 step=3600 default=0 value=0
+                  tilt_absolute 0x009a0909 (int)    : min=-36000 max=36000 step=3600 default=0 value=0
+                 focus_absolute 0x009a090a (int)    : min=0 max=250 step=5 default=0 value=0 flags=inactive
+     focus_automatic_continuous 0x009a090c (bool)   : default=1 value=1
+                  zoom_absolute 0x009a090d (int)    : min=100 max=500 step=1 default=100 value=100
+""",
+    "Generic UVC webcam (v4l2-ctl 1.14, no control IDs)": """
+                     brightness (int)    : min=-64 max=64 step=1 default=0 value=0
+                       contrast (int)    : min=0 max=64 step=1 default=32 value=32
+                     saturation (int)    : min=0 max=128 step=1 default=64 value=64
+                            hue (int)    : min=-40 max=40 step=1 default=0 value=0
+ white_balance_temperature_auto (bool)   : default=1 value=1
+                          gamma (int)    : min=72 max=500 step=1 default=100 value=100
+                           gain (int)    : min=0 max=100 step=1 default=0 value=0
+           power_line_frequency (menu)   : min=0 max=2 default=1 value=1
+      white_balance_temperature (int)    : min=2800 max=6500 step=1 default=4600 value=4600 flags=inactive
+                      sharpness (int)    : min=0 max=6 step=1 default=3 value=3
+         backlight_compensation (int)    : min=0 max=2 step=1 default=1 value=1
+                  exposure_auto (menu)   : min=0 max=3 default=3 value=3
+              exposure_absolute (int)    : min=1 max=5000 step=1 default=157 value=157 flags=inactive
+         exposure_auto_priority (bool)   : default=0 value=1
+""",
+    "CSI sensor via libcamera bridge (v4l2-ctl 1.24)": """
+User Controls
+                
+                horizontal_flip 0x00980914 (bool)   : default=0 value=0 flags=modify-layout
+                  vertical_flip 0x00980915 (bool)   : default=0 value=0 flags=modify-layout
+
+Camera Controls
+             
+             camera_orientation 0x009a0922 (menu)   : min=0 max=2 default=0 value=0 (Front) flags=read-only
+\t\t\t\t0: Front
+\t\t\t\t1: Back
+\t\t\t\t2: External
+         camera_sensor_rotation 0x009a0923 (int)    : min=0 max=0 step=1 default=0 value=0 flags=read-only
+
+Image Source Controls
+              
+              vertical_blanking 0x009e0901 (int)    : min=8 max=65503 step=1 default=1202 value=1202
+            horizontal_blanking 0x009e0902 (int)    : min=5352 max=5352 step=1 default=5352 value=5352 flags=read-only
+                  analogue_gain 0x009e0903 (int)    : min=0 max=978 step=1 default=0 value=0
+
+Image Processing Controls
+                 
+                 link_frequency 0x009f0901 (intmenu): min=0 max=0 default=0 value=0 (456000000 0x1b2e0200)
+\t\t\t\t0: 456000000 (0x1b2e0200)
+                     pixel_rate 0x009f0902 (int64)  : min=840000000 max=840000000 step=1 default=840000000 value=840000000 flags=read-only
+                   test_pattern 0x009f0903 (menu)   : min=0 max=4 default=0 value=0 (Disabled)
+\t\t\t\t0: Disabled
+\t\t\t\t1: Color Bars
+\t\t\t\t2: Solid Color
+\t\t\t\t3: Grey Color Bars
+\t\t\t\t4: PN9
+""",
+    "Capture card (v4l2-ctl 1.22, mixed types)": """
+User Controls
+                     
+                     brightness 0x00980900 (int)    : min=0 max=255 step=1 default=128 value=128 flags=slider
+                       contrast 0x00980901 (int)    : min=0 max=255 step=1 default=128 value=128 flags=slider
+                           mute 0x00980909 (bool)   : default=0 value=0
+                  reset_decoder 0x00981900 (button) : flags=write-only, execute-on-write
+              audio_input_mask 0x00981901 (bitmask): max=0x0000000f default=0x00000001 value=0x00000001
+                   device_label 0x00981902 (str)    : min=0 max=31 step=1 value='HDMI capture 1' flags=has-payload
+            signal_lock_status 0x00981903 (int)    : min=0 max=1 step=1 default=0 value=1 flags=read-only, volatile
+""",
+}
+
+def legacy_parse_control_line(line: str):
+    """Previous parser: one re.search per field"""
+    name_match = re.search(r"^\s*(\w+)", line)
+    if not name_match:
+        return None
+    type_match = re.search(r"\((\w+)\)", line)
+    value_match = re.search(r"value=([+-]?\d+)", line)
+    min_match = re.search(r"min=([+-]?\d+)", line)
+    max_match = re.search(r"max=([+-]?\d+)", line)
+    step_match = re.search(r"step=([+-]?\d+)", line)
+    flags_match = re.search(r"flags=([^\s]+)", line)
+    if not value_match:
+        return None
+    param = V4L2Parameter(
+        name=name_match.group(1),
+        value=int(value_match.group(1)),
+        min_val=int(min_match.group(1)) if min_match else None,
+        max_val=int(max_match.group(1)) if max_match else None,
+        step=int(step_match.group(1)) if step_match else None,
+        param_type=type_match.group(1) if type_match else "int"
+    )
+    if flags_match:
+        param.flags = flags_match.group(1).split(',')
+    return param
+
+def control_lines():
+    """Every control line of the corpus (menu entries and headers excluded)"""
+    lines = []
+    for output in CORPUS.values():
+        lines.extend(line for line in output.splitlines() if re.match(r"^\s*\w+\s+(0x|\()", line))
+    return lines
+
+def measure(func, rounds: int) -> float:
+    """Best of five runs, to filter out scheduler noise"""
+    return min(timeit.repeat(func, number=rounds, repeat=5))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the v4l2-ctl control parser")
+    parser.add_argument("--rounds", type=int, default=1000, help="Iterations over the corpus per run")
+    args = parser.parse_args()
+    
+    lines = control_lines()
+    legacy_scan = measure(lambda: [[re.search(pattern, line) for pattern in LEGACY_FIELD_PATTERNS]
+                                   for line in lines], args.rounds)
+    single_scan = measure(lambda: [_CONTROL_LINE_PATTERN.match(line) for line in lines], args.rounds)
+    legacy = measure(lambda: [legacy_parse_control_line(line) for line in lines], args.rounds)
+    single = measure(lambda: [parse_control_line(line) for line in lines], args.rounds)
+    full = measure(lambda: [parse_control_list(output) for output in CORPUS.values()], args.rounds)
+    
+    per_line = 1e9 / (len(lines) * args.rounds)
+    print(f"{len(lines)} control lines from {len(CORPUS)} outputs, {args.rounds} rounds")
+    print("Field extraction (regex work only):")
+    print(f"  legacy per-field regex:   {legacy_scan * per_line:8.0f} ns/line")
+    print(f"  single-pass pattern:      {single_scan * per_line:8.0f} ns/line ({legacy_scan / single_scan:.1f}x)")
+    print("Complete parse into V4L2Parameter:")
+    print(f"  legacy per-field regex:   {legacy * per_line:8.0f} ns/line")
+    print(f"  single-pass parser:       {single * per_line:8.0f} ns/line ({legacy / single:.1f}x)")
+    print(f"  full output incl. menus:  {full * per_line:8.0f} ns/control line")
+    
+    legacy_count = sum(1 for line in lines if legacy_parse_control_line(line))
+    menu_count = sum(len(p.menu_items) for output in CORPUS.values() for p in parse_control_list(output))
+    print(f"Controls recognised: legacy {legacy_count}, single-pass {len(lines)} "
+          f"(+{menu_count} menu entries, defaults and control IDs)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Startup Import Check
+Fails if GUI startup loads OpenCV/Pillow or the headless path loads the GUI toolkit
+
+Usage: python scripts/check_startup_imports.py
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Entry module -> modules it must not pull in at import time
+CHECKS = {
+    "gui.main_window": ["cv2", "numpy", "PIL"],
+    "headless": ["tkinter", "cv2", "numpy", "PIL", "gui"],
+}
+
+PROBE = """
+import json, sys
+sys.path.insert(0, {src!r})
+import {module}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+def loaded_modules(module: str) -> list:
+    """Modules present after importing module in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(src=str(SRC_DIR), module=module)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main() -> int:
+    failed = False
+    for module, forbidden in CHECKS.items():
+        loaded = loaded_modules(module)
+        leaked = sorted({
+            name for name in loaded
+            if any(name == banned or name.startswith(banned + ".") for banned in forbidden)
+        })
+        if leaked:
+            failed = True
+            print(f"FAIL {module}: imports {', '.join(leaked)}")
+        else:
+            print(f"ok   {module} ({len(loaded)} modules)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Async Camera Controller
+asyncio front end of CameraController for concurrent multi-camera operations
+"""
+
+import asyncio
+import functools
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from camera.controller import CameraController, CameraDevice, IS_LINUX
+from camera.profile import ApplyPlan, ApplyReport, ApplySummary, build_plan
+
+logger = logging.getLogger(__name__)
+
+class AsyncCameraController:
+    """Coroutine-based camera operations on top of a CameraController
+    
+    The wrapped controller keeps owning cameras and parameter state, so
+    both can be used side by side. Operations on one device node are
+    serialized by a per-device lock (a semaphore of one); operations on
+    different cameras run concurrently under a single event loop.
+    
+    v4l2-ctl reads and writes run as ``asyncio.create_subprocess_exec``
+    processes, so waiting on many cameras needs no threads. Work that is
+    already fast or rare (ioctl calls, control enumeration, unlocking,
+    detection) runs the synchronous controller code in the loop's default
+    executor, a bounded thread pool.
+    """
+    
+    def __init__(self, controller: CameraController):
+        self.controller = controller
+        self._locks: Dict[str, asyncio.Lock] = {}
+    
+    @classmethod
+    async def detect(cls, **kwargs) -> 'AsyncCameraController':
+        """Detect cameras; kwargs are passed to CameraController"""
+        controller = await cls._run_sync(functools.partial(CameraController, **kwargs))
+        return cls(controller)
+    
+    @staticmethod
+    async def _run_sync(func: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    def _lock(self, device_path: str) -> asyncio.Lock:
+        lock = self._locks.get(device_path)
+        if lock is None:
+            lock = self._locks[device_path] = asyncio.Lock()
+        return lock
+    
+    def _uses_subprocess(self, device_path: str) -> bool:
+        """Whether reads and writes of the device go through v4l2-ctl"""
+        return IS_LINUX and not self.controller.uses_ioctl(device_path)
+    
+    async def _run_v4l2_command(self, command: List[str]):
+        return await self.controller.executor.run_async(self.controller.resolve_command(command))
+    
+    def get_cameras(self) -> List[CameraDevice]:
+        return self.controller.get_cameras()
+    
+    def get_camera(self, device_path: str) -> Optional[CameraDevice]:
+        return self.controller.get_camera(device_path)
+    
+    async def load_parameters(self, device_path: str) -> Optional[CameraDevice]:
+        """Make sure a camera's parameters are loaded (enumerates controls once)"""
+        camera = self.controller.get_camera(device_path)
+        if camera and not camera.parameters_loaded:
+            async with self._lock(device_path):
+                await self._run_sync(camera.load_parameters)
+        return camera
+    
+    async def set_parameter(self, device_path: str, param_name: str, value: Any) -> bool:
+        results = await self.set_parameters(device_path, {param_name: value})
+        return results.get(param_name, False)
+    
+    async def set_parameters(self, device_path: str, values: Dict[str, Any]) -> Dict[str, bool]:
+        """Set several parameters in one round-trip (see CameraController.set_parameters)"""
+        await self.load_parameters(device_path)
+        async with self._lock(device_path):
+            return await self._set_parameters(device_path, values)
+    
+    async def _set_parameters(self, device_path: str, values: Dict[str, Any]) -> Dict[str, bool]:
+        controller = self.controller
+        camera = controller.get_camera(device_path)
+        if not camera:
+            logger.error(f"Camera not found: {device_path}")
+            return {name: False for name in values}
+        if not self._uses_subprocess(device_path):
+            return await self._run_sync(controller.set_parameters, device_path, values)
+        
+        pending, results = controller._split_known_values(camera, values)
+        if not pending:
+            return results
+        
+        success, _ = await self._run_v4l2_command(controller.set_ctrl_command(device_path, pending))
+        if success:
+            batch_results = {name: True for name in pending}
+        else:
+            # Find out which controls were rejected
+            logger.debug(f"Batch --set-ctrl failed for {device_path}, retrying per control")
+            batch_results = {}
+            for name, value in pending.items():
+                batch_results[name], _ = await self._run_v4l2_command(
+                    controller.set_ctrl_command(device_path, {name: value})
+                )
+        return controller._record_set_results(camera, pending, batch_results, results)
+    
+    async def get_parameters(self, device_path: str, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Read several parameters in one round-trip (see CameraController.get_parameters)"""
+        await self.load_parameters(device_path)
+        async with self._lock(device_path):
+            return await self._get_parameters(device_path, names)
+    
+    async def _get_parameters(self, device_path: str, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        controller = self.controller
+        camera = controller.get_camera(device_path)
+        if not camera:
+            return {}
+        if not self._uses_subprocess(device_path):
+            return await self._run_sync(controller.get_parameters, device_path, names)
+        
+        names = [name for name in (names if names is not None else camera.parameters) if name in camera.parameters]
+        if not names:
+            return {}
+        success, output = await self._run_v4l2_command(controller.get_ctrl_command(device_path, names))
+        values = controller._parse_get_ctrl(camera, output)
+        if not success:
+            logger.debug(f"--get-ctrl reported an error for {device_path}, read {len(values)}/{len(names)} values")
+        for name, value in values.items():
+            camera.parameters[name].value = value
+        return values
+    
+    async def backup_parameters(self, device_path: str) -> bool:
+        """Backup all current parameter values as original values"""
+        camera = await self.load_parameters(device_path)
+        if not camera:
+            return False
+        
+        async with self._lock(device_path):
+            await self._get_parameters(device_path)
+            for param in camera.parameters.values():
+                # Parameters that could not be read keep their last known value
+                param.original_value = param.value
+        
+        logger.info(f"Backed up parameters for {camera.name}")
+        return True
+    
+    async def restore_parameters(self, device_path: str) -> bool:
+        """Restore all parameters to their original values and verify them"""
+        camera = await self.load_parameters(device_path)
+        if not camera:
+            return False
+        
+        async with self._lock(device_path):
+            targets = {param.name: param.original_value for param in camera.parameters.values()}
+            report = await self._apply_profile(camera, targets)
+            readback = await self._get_parameters(device_path, report.written)
+            return self.controller._verify_restore(camera, targets, report, readback)
+    
+    async def apply_profile(self, device_path: str, values: Dict[str, Any], dry_run: bool = False) -> ApplyReport:
+        """Write only the values that differ from the device (see camera.profile.apply_profile)"""
+        camera = await self.load_parameters(device_path)
+        if not camera:
+            return ApplyReport(ApplyPlan.for_missing_camera(device_path, values))
+        
+        async with self._lock(device_path):
+            return await self._apply_profile(camera, values, dry_run)
+    
+    async def _apply_profile(self, camera: CameraDevice, values: Dict[str, Any], dry_run: bool = False) -> ApplyReport:
+        known = [name for name in values if name in camera.parameters]
+        current = await self._get_parameters(camera.device_path, known) if known else {}
+        plan = build_plan(camera, values, current)
+        if dry_run:
+            return ApplyReport(plan)
+        
+        results = {}
+        for batch in plan.batches:
+            results.update(await self._set_parameters(camera.device_path, batch))
+        report = ApplyReport(plan, results)
+        logger.info(f"Applied profile to {camera.device_path}: {report.summary()}")
+        return report
+    
+    async def try_unlock_parameter(self, device_path: str, param_name: str) -> bool:
+        """Try to unlock a parameter by disabling related auto modes"""
+        await self.load_parameters(device_path)
+        async with self._lock(device_path):
+            return await self._run_sync(self.controller.try_unlock_parameter, device_path, param_name)
+    
+    async def run_locked(self, device_path: str, func: Callable, *args) -> Any:
+        """Run synchronous controller code on a camera, serialized with its other operations"""
+        await self.load_parameters(device_path)
+        async with self._lock(device_path):
+            return await self._run_sync(func, *args)
+    
+    async def enable_control_events(self, device_path: str) -> bool:
+        """Track control changes of a camera (see CameraController.enable_control_events)"""
+        await self.load_parameters(device_path)
+        return await self._run_sync(self.controller.enable_control_events, device_path)
+    
+    async def apply_all(self, profiles: Dict[str, Dict[str, Any]], dry_run: bool = False,
+                        max_workers: Optional[int] = None, timeout: Optional[float] = None) -> ApplySummary:
+        """Apply profiles to several cameras at once
+        
+        Args:
+            profiles: Mapping of device path to parameter values
+            dry_run: Only read and diff, write nothing
+            max_workers: Cameras applied at the same time (default: all)
+            timeout: Seconds after which a camera is reported as an error,
+                so a hung device does not hold up the result. Its apply is
+                not cancelled: it keeps the device lock and its slot until
+                the running write returns.
+        
+        Returns:
+            Summary with a report (or error) per device path
+        """
+        summary = ApplySummary()
+        slots = asyncio.Semaphore(max_workers) if max_workers else None
+        
+        async def apply(device_path: str) -> ApplyReport:
+            if slots:
+                await slots.acquire()
+            task = asyncio.ensure_future(self.apply_profile(device_path, profiles[device_path], dry_run))
+            if slots:
+                task.add_done_callback(lambda task: slots.release())
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+            if task in done:
+                return task.result()
+            task.add_done_callback(functools.partial(self._log_late_failure, device_path))
+            raise TimeoutError(f"No result within {timeout:g} s")
+        
+        device_paths = list(profiles)
+        outcomes = await asyncio.gather(*(apply(device_path) for device_path in device_paths), return_exceptions=True)
+        for device_path, outcome in zip(device_paths, outcomes):
+            summary.add(device_path, outcome)
+        return summary.finish()
+    
+    @staticmethod
+    def _log_late_failure(device_path: str, task: asyncio.Task):
+        """Outcome of an apply that was already reported as timed out"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Apply to {device_path} failed after its timeout: {task.exception()}")
+    
+    async def restore_all(self) -> Dict[str, bool]:
+        """Restore the original values of every camera at once"""
+        device_paths = [camera.device_path for camera in self.controller.get_cameras()]
+        results = await asyncio.gather(*(self.restore_parameters(device_path) for device_path in device_paths))
+        return dict(zip(device_paths, results))
+    
+    async def close(self):
+        """Stop background work of the wrapped controller"""
+        await self._run_sync(self.controller.close)
@@ -0,0 +1,208 @@
+"""
+Background Controller
+Future-based facade that runs CameraController operations off the caller's thread
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from camera.controller import CameraController
+from camera.profile import ApplySummary, apply_profile
+from camera.remote import RemoteCameraController
+from utils.profiler import profile_span
+
+logger = logging.getLogger(__name__)
+
+class BackgroundController:
+    """Runs camera operations on worker threads and returns futures
+    
+    Operations on one device node run one at a time, in submission order,
+    on that device's own worker, so a hung device only delays its own
+    queue. Detection and other device-independent work run on a shared
+    pool. Results are delivered through the returned futures; GUI code
+    hands them over to its own thread (see gui.dispatch.UiDispatcher).
+    
+    Each operation uses the controller that is current when it is
+    submitted, so a refresh does not redirect queued work. A
+    ParameterWriteQueue writes through the device workers as well;
+    operations that read or overwrite parameter values run after the
+    writes queued for the device before them.
+    
+    With a daemon socket, detection connects to a camloader daemon
+    (see camera.daemon) instead of probing the devices itself.
+    """
+    
+    GENERAL_WORKERS = 2
+    
+    def __init__(self, controller: Optional[CameraController] = None, writer=None,
+                 daemon_socket: Optional[str] = None):
+        self.controller = controller
+        self.writer = writer
+        self.daemon_socket = daemon_socket
+        self._device_workers: Dict[str, ThreadPoolExecutor] = {}
+        self._general = ThreadPoolExecutor(max_workers=self.GENERAL_WORKERS,
+                                           thread_name_prefix="camloader-bg")
+        self._lock = threading.Lock()
+        if writer:
+            writer.set_submit(self.submit)
+    
+    def set_controller(self, controller: Optional[CameraController]):
+        """Switch to another controller (e.g. after a full refresh)"""
+        self.controller = controller
+    
+    def submit(self, device_path: Optional[str], func: Callable, *args, **kwargs) -> Future:
+        """Run func on the device's worker (or the shared pool if device_path is None)"""
+        if device_path is None:
+            return self._general.submit(func, *args, **kwargs)
+        with self._lock:
+            worker = self._device_workers.get(device_path)
+            if worker is None:
+                name = device_path.rsplit("/", 1)[-1]
+                worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"camloader-{name}")
+                self._device_workers[device_path] = worker
+        return worker.submit(func, *args, **kwargs)
+    
+    def submit_settled(self, device_path: str, func: Callable, *args, **kwargs) -> Future:
+        """Like submit, but run after the parameter writes queued for the device so far"""
+        if self.writer:
+            self.writer.hand_over(device_path)
+        return self.submit(device_path, func, *args, **kwargs)
+    
+    def detect(self, **kwargs) -> Future:
+        """Detect cameras; resolves to a new CameraController(**kwargs)
+        
+        With a daemon socket it resolves to a RemoteCameraController
+        (only on_camera_found applies, the daemon did the probing).
+        """
+        if self.daemon_socket is not None:
+            return self.submit(None, RemoteCameraController, self.daemon_socket or None,
+                               on_camera_found=kwargs.get('on_camera_found'))
+        return self.submit(None, CameraController, **kwargs)
+    
+    def close_controller(self, controller: CameraController) -> Future:
+        """Stop a controller's background work without waiting for it"""
+        return self.submit(None, controller.close)
+    
+    def load_parameters(self, device_path: str) -> Future:
+        """Make sure a camera's parameters are loaded; resolves to the camera (or None)"""
+        controller = self.controller
+        
+        def load():
+            camera = controller.get_camera(device_path)
+            if camera:
+                camera.load_parameters()
+            return camera
+        
+        return self.submit(device_path, load)
+    
+    def get_parameters(self, device_path: str, names: Optional[List[str]] = None) -> Future:
+        return self.submit_settled(device_path, self.controller.get_parameters, device_path, names)
+    
+    def set_parameters(self, device_path: str, values: Dict[str, Any]) -> Future:
+        return self.submit_settled(device_path, self.controller.set_parameters, device_path, values)
+    
+    def backup_parameters(self, device_path: str) -> Future:
+        return self.submit_settled(device_path, self.controller.backup_parameters, device_path)
+    
+    def restore_parameters(self, device_path: str) -> Future:
+        return self.submit_settled(device_path, self.controller.restore_parameters, device_path)
+    
+    def try_unlock_parameter(self, device_path: str, param_name: str) -> Future:
+        return self.submit_settled(device_path, self.controller.try_unlock_parameter, device_path, param_name)
+    
+    def enable_control_events(self, device_path: str) -> Future:
+        return self.submit(device_path, self.controller.enable_control_events, device_path)
+    
+    def apply_profiles(self, profiles: Dict[str, Dict[str, Any]], max_workers: Optional[int] = None,
+                       timeout: Optional[float] = None) -> Future:
+        """Apply profiles to several cameras at once; resolves to an ApplySummary
+        
+        Each camera runs on its own device worker, at most max_workers at a
+        time. A camera without result after timeout seconds is reported as
+        an error and the summary does not wait for it; its work carries on
+        in the background and keeps its slot until it returns, so no more
+        than max_workers cameras are ever written at once.
+        """
+        controller = self.controller
+        summary = ApplySummary()
+        combined = Future()
+        slots = threading.Semaphore(max_workers) if max_workers else None
+        pending = set(profiles)
+        lock = threading.Lock()
+        
+        if not profiles:
+            combined.set_result(summary.finish())
+            return combined
+        
+        def finish(device_path: str, outcome: Any):
+            with lock:
+                if device_path not in pending:
+                    return  # Already reported as timed out
+                pending.discard(device_path)
+                summary.add(device_path, outcome)
+                done = not pending
+            if done:
+                combined.set_result(summary.finish())
+        
+        def apply(device_path: str):
+            if slots:
+                slots.acquire()
+            timer = None
+            if timeout:
+                timer = threading.Timer(timeout, finish, (device_path, TimeoutError(f"No result within {timeout:g} s")))
+                timer.daemon = True
+                timer.start()
+            try:
+                with profile_span(f"apply startup config {device_path}", "apply"):
+                    outcome = apply_profile(controller, device_path, profiles[device_path])
+            except Exception as e:
+                outcome = e
+            finally:
+                if timer:
+                    timer.cancel()
+                if slots:
+                    slots.release()
+            finish(device_path, outcome)
+        
+        for device_path in profiles:
+            self.submit_settled(device_path, apply, device_path)
+        return combined
+    
+    @staticmethod
+    def gather(futures: List[Future]) -> Future:
+        """Future resolved with the outcomes of all futures, in order
+        
+        Failed futures contribute their exception instead of a result, so
+        one failing camera does not hide the others.
+        """
+        combined = Future()
+        outcomes: List[Any] = [None] * len(futures)
+        remaining = [len(futures)]
+        lock = threading.Lock()
+        
+        if not futures:
+            combined.set_result([])
+            return combined
+        
+        def collect(index: int, future: Future):
+            error = future.exception()
+            outcomes[index] = error if error is not None else future.result()
+            with lock:
+                remaining[0] -= 1
+                done = remaining[0] == 0
+            if done:
+                combined.set_result(outcomes)
+        
+        for index, future in enumerate(futures):
+            future.add_done_callback(lambda f, index=index: collect(index, f))
+        return combined
+    
+    def shutdown(self):
+        """Stop accepting work; running operations finish in the background"""
+        with self._lock:
+            workers = list(self._device_workers.values())
+            self._device_workers.clear()
+        for worker in workers + [self._general]:
+            worker.shutdown(wait=False)
@@ -0,0 +1,129 @@
+"""
+Detection Cache
+Persists per-device detection results so warm starts skip full probing
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from camera.identity import list_video_nodes, read_device_identity
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+
+class DetectionCache:
+    """On-disk cache of camera detection results
+    
+    Every /dev/videoN node seen during a full probe is recorded under its
+    stable identity (see camera.identity) together with the node's change
+    time. Camera nodes additionally store card name, preview capability,
+    pixel formats and control metadata. The cache is only trusted when the
+    current set of nodes, their identities and change times all match.
+    """
+    
+    def __init__(self, cache_file: Optional[str] = None, dev_root: str = "/dev",
+                 sysfs_root: Optional[str] = None):
+        if cache_file:
+            self.cache_file = Path(cache_file)
+        else:
+            self.cache_file = Path.home() / ".camloader" / "detection_cache.json"
+        self.dev_root = dev_root
+        self.sysfs_root = sysfs_root
+        self._lock = threading.Lock()  # Saves may come from prefetch threads
+    
+    def _identity(self, device_path: str) -> Optional[str]:
+        if self.sysfs_root:
+            return read_device_identity(device_path, self.sysfs_root)
+        return read_device_identity(device_path)
+    
+    def _node_state(self, device_path: str) -> Optional[Dict]:
+        """Identity and change time of a device node"""
+        try:
+            ctime_ns = os.stat(device_path).st_ctime_ns
+        except OSError:
+            return None
+        return {'identity': self._identity(device_path), 'ctime_ns': ctime_ns}
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        """Current identity/change-time state of every video node"""
+        nodes = {}
+        for device_path in list_video_nodes(self.dev_root):
+            state = self._node_state(device_path)
+            if state:
+                nodes[device_path] = state
+        return nodes
+    
+    def load(self) -> Optional[List[Dict]]:
+        """Return cached camera entries if the cache matches the current devices
+        
+        Returns:
+            Camera entries in detection order, or None if the cache is
+            missing, stale or unreadable
+        """
+        if not self.cache_file.exists():
+            return None
+        
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable detection cache {self.cache_file}: {e}")
+            return None
+        
+        if data.get('version') != CACHE_VERSION:
+            logger.info("Detection cache version changed, re-probing")
+            return None
+        
+        cached_nodes = data.get('nodes', {})
+        current_nodes = self.snapshot()
+        if set(cached_nodes) != set(current_nodes):
+            logger.info("Video device set changed since last run, re-probing")
+            return None
+        
+        for device_path, state in current_nodes.items():
+            cached = cached_nodes[device_path]
+            if state['identity'] is None or cached.get('identity') != state['identity']:
+                logger.info(f"Identity of {device_path} changed, re-probing")
+                return None
+            if cached.get('ctime_ns') != state['ctime_ns']:
+                logger.info(f"{device_path} was recreated since last run, re-probing")
+                return None
+        
+        return data.get('cameras', [])
+    
+    def save(self, cameras: List[Dict]):
+        """Store camera entries together with the current node state
+        
+        Args:
+            cameras: Entries with device_path, name, is_available, formats
+                     and parameters (V4L2Parameter.to_dict() per control)
+        """
+        data = {
+            'version': CACHE_VERSION,
+            'nodes': self.snapshot(),
+            'cameras': cameras,
+        }
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(".tmp")
+            with self._lock:
+                with open(tmp_file, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_file, self.cache_file)
+            logger.debug(f"Saved detection cache for {len(cameras)} camera(s) to {self.cache_file}")
+        except Exception as e:
+            logger.warning(f"Failed to save detection cache: {e}")
+    
+    def invalidate(self):
+        """Remove the cache file so the next start re-probes everything"""
+        try:
+            self.cache_file.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove detection cache: {e}")
@@ -3,16 +3,28 @@ V4L2 Camera Controller
 Handles camera detection, parameter management, and V4L2 communication
 """
 
-import subprocess
 import shutil
 import json
 import logging
-import os
 import re
 import platform
-from typing import Dict, List, Optional, Tuple, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from pathlib import Path
 
+from camera.cache import DetectionCache
+from camera.events import ControlEventMonitor
+from camera.executor import CommandExecutor, get_executor
+from camera.identity import read_device_info, read_stable_id, stable_ids
+from camera.dependencies import locking_controls, manual_value
+from camera.profile import ApplyReport, apply_profile
+from camera.v4l2_ioctl import (
+    V4L2IoctlBackend, V4L2_CAP_DEVICE_CAPS, V4L2_CAP_VIDEO_CAPTURE, V4L2_CAP_VIDEO_CAPTURE_MPLANE
+)
+from utils.profiler import profile_span
+
 logger = logging.getLogger(__name__)
 
 # Platform detection
@@ -23,17 +35,21 @@ class V4L2Parameter:
     """Represents a V4L2 camera parameter"""
     
     def __init__(self, name: str, value: Any, min_val: Any = None, 
-                 max_val: Any = None, step: Any = None, param_type: str = "int"):
+                 max_val: Any = None, step: Any = None, param_type: str = "int",
+                 default_value: Any = None, control_id: Optional[int] = None):
         self.name = name
         self.value = value
         self.min_val = min_val
         self.max_val = max_val
         self.step = step
         self.param_type = param_type
+        self.default_value = default_value
+        self.control_id = control_id  # V4L2 control ID, e.g. 0x00980900
         self.original_value = value  # For backup purposes
         self.is_readonly = False  # Whether parameter can be changed
         self.is_inactive = False  # Whether parameter is currently inactive
         self.flags = []  # V4L2 control flags
+        self.menu_items: Dict[int, Any] = {}  # Menu index -> label (menu) or value (intmenu)
     
     def to_dict(self) -> Dict:
         """Convert parameter to dictionary for serialization"""
@@ -47,7 +63,10 @@ class V4L2Parameter:
             'original_value': self.original_value,
             'is_readonly': self.is_readonly,
             'is_inactive': self.is_inactive,
-            'flags': self.flags
+            'flags': self.flags,
+            'default_value': self.default_value,
+            'control_id': self.control_id,
+            'menu_items': self.menu_items
         }
     
     @classmethod
@@ -59,27 +78,183 @@ class V4L2Parameter:
             min_val=data.get('min_val'),
             max_val=data.get('max_val'),
             step=data.get('step'),
-            param_type=data.get('param_type', 'int')
+            param_type=data.get('param_type', 'int'),
+            default_value=data.get('default_value'),
+            control_id=data.get('control_id')
         )
         param.original_value = data.get('original_value', data['value'])
         param.is_readonly = data.get('is_readonly', False)
         param.is_inactive = data.get('is_inactive', False)
         param.flags = data.get('flags', [])
+        # JSON turns the integer menu indices into strings
+        param.menu_items = {int(index): item for index, item in data.get('menu_items', {}).items()}
         return param
     
+    def update_flags(self, flags: List[str]):
+        """Set V4L2 flags and the lock state derived from them"""
+        self.flags = list(flags)
+        self.is_readonly = 'read-only' in self.flags
+        self.is_inactive = 'inactive' in self.flags or 'grabbed' in self.flags
+    
     @property
     def is_locked(self) -> bool:
         """Check if parameter is locked (readonly or inactive)"""
         return self.is_readonly or self.is_inactive
 
+# One control line of v4l2-ctl --list-ctrls / --list-ctrls-menus. v4l2-ctl
+# prints the fields space-separated in a fixed order, so a single anchored
+# match extracts all of them; fields a control type does not have are absent:
+#   brightness 0x00980900 (int)    : min=0 max=255 step=1 default=128 value=128 flags=slider
+#   exposure_auto 0x009a0901 (menu)   : min=0 max=3 default=3 value=3 (Aperture Priority Mode)
+# Older v4l2-ctl versions omit the control ID.
+_CONTROL_LINE_PATTERN = re.compile(
+    r" *(\w+) +(?:(0x[0-9a-fA-F]+) +)?\((\w+)\) *:"
+    r"(?: min=([-\w]+))?"
+    r"(?: max=([-\w]+))?"
+    r"(?: step=([-\w]+))?"
+    r"(?: default=([-\w]+))?"
+    r"(?: value=(?:'([^']*)'|([-\w]+))(?: \([^)]*\))?)?"
+    r"(?: flags=(.*))?"
+)
+
+# Menu entry printed below a menu control by --list-ctrls-menus:
+#   "\t\t\t\t1: Manual Mode" or, for integer menus, "\t\t\t\t0: 100000000 (0x5f5e100)"
+_MENU_ITEM_PATTERN = re.compile(r"\s+(\d+): (.*)")
+
+def parse_control_line(line: str) -> Optional[V4L2Parameter]:
+    """Parse one v4l2-ctl control line into a parameter
+    
+    Every control type is returned, including button, string and bitmask
+    controls; ``value`` is None for controls without a readable value.
+    """
+    match = _CONTROL_LINE_PATTERN.match(line)
+    if not match:
+        return None
+    
+    # int(x, 0) accepts both decimal and the 0x-prefixed bitmask values
+    name, control_id, param_type, min_val, max_val, step, default, string, value, flags = match.groups()
+    param = V4L2Parameter(
+        name,
+        string if string is not None else (int(value, 0) if value else None),
+        int(min_val, 0) if min_val else None,
+        int(max_val, 0) if max_val else None,
+        int(step, 0) if step else None,
+        param_type,
+        int(default, 0) if default else None,
+        int(control_id, 16) if control_id else None
+    )
+    
+    if flags:
+        param.flags = flags.rstrip().split(', ')
+        param.is_readonly = 'read-only' in param.flags
+        param.is_inactive = 'inactive' in param.flags or 'grabbed' in param.flags
+    
+    return param
+
+def parse_control_list(output: str) -> List[V4L2Parameter]:
+    """Parse complete v4l2-ctl --list-ctrls or --list-ctrls-menus output
+    
+    Menu entries are attached to the preceding menu control as
+    ``menu_items`` (labels for menu, integers for intmenu controls).
+    Control class headers such as "User Controls" are skipped.
+    """
+    params = []
+    current = None
+    for line in output.splitlines():
+        match = _MENU_ITEM_PATTERN.match(line)
+        if match:
+            if current is not None and current.param_type in ('menu', 'intmenu'):
+                index, item = match.groups()
+                item = item.rstrip()
+                if current.param_type == 'intmenu':
+                    item = int(item.split(' ', 1)[0], 0)
+                current.menu_items[int(index)] = item
+            continue
+        
+        try:
+            current = parse_control_line(line)
+        except ValueError as e:
+            logger.warning(f"Failed to parse numeric values from line: {line}, Error: {e}")
+            current = None
+        if current is not None:
+            params.append(current)
+    return params
+
 class CameraDevice:
     """Represents a V4L2 camera device"""
     
     def __init__(self, device_path: str, name: str):
         self.device_path = device_path
         self.name = name
-        self.parameters: Dict[str, V4L2Parameter] = {}
+        self._parameters: Dict[str, V4L2Parameter] = {}
         self.is_available = True
+        self.formats: List[str] = []  # Pixel format FourCCs, e.g. ['YUYV', 'MJPG']
+        self.stable_id: Optional[str] = None  # See camera.identity.read_stable_id
+        
+        # Lazy parameter loading (see set_parameter_loader)
+        self._parameter_loader: Optional[Callable[['CameraDevice'], None]] = None
+        self._on_parameters_loaded: Optional[Callable[['CameraDevice'], None]] = None
+        self._parameters_loaded = True
+        self._parameters_loading = False
+        self._load_lock = threading.RLock()
+    
+    @property
+    def parameters(self) -> Dict[str, V4L2Parameter]:
+        """Camera parameters, loaded on first access if a loader is set"""
+        if not self._parameters_loaded:
+            self.load_parameters()
+        return self._parameters
+    
+    @parameters.setter
+    def parameters(self, value: Dict[str, V4L2Parameter]):
+        self._parameters = value
+        self._parameters_loaded = True
+    
+    @property
+    def key(self) -> str:
+        """Key of this camera's configurations: the stable ID, or the device path without one"""
+        return self.stable_id or self.device_path
+    
+    @property
+    def parameters_loaded(self) -> bool:
+        """Whether parameters have been loaded (no loader call pending)"""
+        return self._parameters_loaded
+    
+    def set_parameter_loader(self, loader: Callable[['CameraDevice'], None],
+                             on_loaded: Optional[Callable[['CameraDevice'], None]] = None):
+        """Defer parameter loading until the parameters are first accessed
+        
+        The loader receives this camera and fills ``camera.parameters``.
+        on_loaded is called with this camera after a successful load, once
+        ``parameters_loaded`` is true.
+        """
+        with self._load_lock:
+            self._parameter_loader = loader
+            self._on_parameters_loaded = on_loaded
+            self._parameters_loaded = False
+    
+    def load_parameters(self):
+        """Run the pending parameter loader, if any
+        
+        Safe to call from several threads: concurrent callers wait for the
+        first load, and nested access from inside the loader returns the
+        dictionary being filled.
+        """
+        with self._load_lock:
+            if self._parameters_loaded or self._parameters_loading:
+                return
+            self._parameters_loading = True
+            on_loaded, self._on_parameters_loaded = self._on_parameters_loaded, None
+            try:
+                with profile_span(f"load parameters {self.device_path}", "parameters"):
+                    self._parameter_loader(self)
+            finally:
+                self._parameters_loading = False
+                self._parameters_loaded = True
+                self._parameter_loader = None
+        
+        if on_loaded:
+            on_loaded(self)
     
     def __str__(self):
         return f"{self.name} ({self.device_path})"
@@ -87,10 +262,55 @@ class CameraDevice:
 class CameraController:
     """Main controller for V4L2 camera operations"""
     
-    def __init__(self):
+    # Control types exposed as parameters (numeric controls with a settable value)
+    PARAMETER_CTRL_TYPES = ('int', 'int64', 'bool', 'menu', 'intmenu')
+    
+    # Pixel format entries in --list-formats-ext output: "[0]: 'YUYV' (YUYV 4:2:2)"
+    _FORMAT_PATTERN = re.compile(r"\[\d+\]:\s*'([^']+)'")
+    
+    # One "name: value" line per control in --get-ctrl output
+    _GET_CTRL_PATTERN = re.compile(r"^\s*(\w+):\s*([+-]?\d+)\s*$", re.MULTILINE)
+    
+    # Default number of devices probed concurrently during detection
+    DEFAULT_PROBE_WORKERS = 4
+    
+    def __init__(self, use_ioctl: bool = True, probe_workers: Optional[int] = None,
+                 use_cache: bool = True, force_probe: bool = False,
+                 cache: Optional[DetectionCache] = None, lazy_parameters: bool = True,
+                 executor: Optional[CommandExecutor] = None, devices: Optional[List[str]] = None,
+                 on_camera_found: Optional[Callable[['CameraController', CameraDevice], None]] = None):
         self.cameras: Dict[str, CameraDevice] = {}
         self._v4l2_ctl_path = self._find_v4l2_ctl()
-        self._detect_cameras()
+        self.executor = executor or get_executor()
+        self.probe_workers = probe_workers or self.DEFAULT_PROBE_WORKERS
+        
+        # Enumerate controls on first use instead of during detection
+        self.lazy_parameters = lazy_parameters
+        self._prefetch_thread: Optional[threading.Thread] = None
+        
+        # Detection cache: warm starts skip probing when devices are unchanged
+        self._cache = (cache or DetectionCache()) if use_cache and IS_LINUX else None
+        self._force_probe = force_probe
+        
+        # Restrict detection to these device nodes (None: every camera)
+        self._devices = list(devices) if devices is not None else None
+        
+        # Called from detection threads as each camera is found, before the
+        # constructor returns (see _camera_found)
+        self._on_camera_found = on_camera_found
+        
+        # Direct ioctl access is preferred; v4l2-ctl remains the fallback
+        self._ioctl_backend = V4L2IoctlBackend() if use_ioctl and IS_LINUX else None
+        self._ioctl_support: Dict[str, bool] = {}
+        
+        # Control change notifications (see add_parameter_listener)
+        self._parameter_listeners: List[Callable[[str, List[str]], None]] = []
+        self._control_events: Optional[ControlEventMonitor] = None
+        
+        with profile_span("detect cameras", "detect") as span:
+            self._detect_cameras()
+            self._resolve_id_collisions()
+            span['cameras'] = len(self.cameras)
     
     def _find_v4l2_ctl(self) -> str:
         """Find the v4l2-ctl binary path"""
@@ -109,49 +329,39 @@ class CameraController:
         logger.warning("v4l2-ctl not found in PATH or common locations")
         return "v4l2-ctl"  # Fall back to name, hope PATH works
     
-    def _get_clean_env(self):
-        """Get environment with LD_LIBRARY_PATH cleaned for external commands.
+    def _get_ioctl_backend(self, device_path: str) -> Optional[V4L2IoctlBackend]:
+        """Return the ioctl backend if it works for this device, else None"""
+        if not self._ioctl_backend or not self._ioctl_backend.available:
+            return None
         
-        PyInstaller sets LD_LIBRARY_PATH to its temp directory, which contains
-        bundled libraries (e.g. libstdc++.so.6) that may be older than what
-        system tools like v4l2-ctl require. We restore the original
-        LD_LIBRARY_PATH so external commands use system libraries.
-        """
-        env = os.environ.copy()
-        # PyInstaller saves the original value in *_ORIG
-        orig = env.get('LD_LIBRARY_PATH_ORIG')
-        if orig is not None:
-            env['LD_LIBRARY_PATH'] = orig
-        elif 'LD_LIBRARY_PATH' in env:
-            del env['LD_LIBRARY_PATH']
-        return env
-
+        if device_path not in self._ioctl_support:
+            supported = self._ioctl_backend.is_supported(device_path)
+            self._ioctl_support[device_path] = supported
+            logger.debug(f"ioctl backend for {device_path}: {'enabled' if supported else 'unavailable, using v4l2-ctl'}")
+        
+        return self._ioctl_backend if self._ioctl_support[device_path] else None
+    
+    def resolve_command(self, command: List[str]) -> List[str]:
+        """Replace 'v4l2-ctl' with the full path of the binary, if found"""
+        if command and command[0] == "v4l2-ctl" and self._v4l2_ctl_path != "v4l2-ctl":
+            return [self._v4l2_ctl_path] + command[1:]
+        return command
+    
     def _run_v4l2_command(self, command: List[str]) -> Tuple[bool, str]:
         """Run a v4l2 command and return success status and output"""
-        # Replace 'v4l2-ctl' with full path if found
-        if command and command[0] == "v4l2-ctl" and self._v4l2_ctl_path != "v4l2-ctl":
-            command = [self._v4l2_ctl_path] + command[1:]
+        return self.executor.run(self.resolve_command(command))
+    
+    def uses_ioctl(self, device_path: str) -> bool:
+        """Whether operations on this device go through the ioctl backend"""
+        return self._get_ioctl_backend(device_path) is not None
+    
+    def get_command_stats(self) -> Dict[str, Dict]:
+        """Latency and failure statistics of external commands run so far
         
-        try:
-            result = subprocess.run(
-                command, 
-                capture_output=True, 
-                text=True, 
-                timeout=10,
-                env=self._get_clean_env()
-            )
-            if result.returncode != 0 and result.stderr:
-                logger.debug(f"Command stderr: {' '.join(command)}: {result.stderr.strip()}")
-            return result.returncode == 0, result.stdout
-        except subprocess.TimeoutExpired:
-            logger.error(f"Command timeout: {' '.join(command)}")
-            return False, ""
-        except FileNotFoundError:
-            logger.error(f"Command not found: {command[0]}")
-            return False, ""
-        except Exception as e:
-            logger.error(f"Command failed: {' '.join(command)}, Error: {e}")
-            return False, ""
+        Keyed by command type (e.g. "v4l2-ctl --set-ctrl"), see
+        camera.executor.CommandStats.to_dict for the fields.
+        """
+        return self.executor.stats()
     
     def _is_capture_device(self, device_path: str) -> bool:
         """Check if device is a video capture device"""
@@ -209,8 +419,11 @@ class CameraController:
             logger.error(f"_is_capture_device({device_path}): Exception: {e}")
             return False
     
-    def _check_preview_capability(self, device_path: str) -> bool:
-        """Check if camera supports preview/streaming"""
+    def _check_preview_capability(self, device_path: str, camera: Optional[CameraDevice] = None) -> bool:
+        """Check if camera supports preview/streaming
+        
+        If a camera is given, its supported pixel formats are recorded too.
+        """
         try:
             # Check supported formats
             success, output = self._run_v4l2_command([
@@ -220,6 +433,9 @@ class CameraController:
             if not success:
                 return False
             
+            if camera is not None:
+                camera.formats = self._FORMAT_PATTERN.findall(output)
+            
             # Look for common video formats
             common_formats = ['YUYV', 'MJPG', 'RGB', 'YUV', 'H264', 'VP8', 'VP9']
             for fmt in common_formats:
@@ -273,18 +489,123 @@ class CameraController:
                 "focus_absolute": focus_absolute_param,
             }
             dummy_camera.is_available = True
-            self.cameras["dummy0"] = dummy_camera
+            self._camera_found(dummy_camera)
             return
         
         # Log v4l2-ctl location for debugging
         logger.debug(f"Using v4l2-ctl: {self._v4l2_ctl_path}")
         
+        # Warm start: reuse cached detection results if the devices are unchanged
+        if self._cache and not self._force_probe:
+            cached_cameras = self._cache.load()
+            if cached_cameras is not None:
+                if self._devices is not None:
+                    cached_cameras = [entry for entry in cached_cameras if entry['device_path'] in self._devices]
+                self._restore_from_cache(cached_cameras)
+                return
+        
+        if self._devices is not None:
+            self._detect_listed_devices()
+            return
+        
         # Primary method: Use v4l2-ctl --list-devices to discover cameras
         cameras_found = self._detect_via_list_devices()
         
         if not cameras_found:
             logger.info("--list-devices found no cameras, trying /dev/video* scan...")
             self._detect_via_device_scan()
+        
+        self._save_detection_cache()
+    
+    def _restore_from_cache(self, entries: List[Dict]):
+        """Rebuild cameras from cache entries
+        
+        Cached control metadata is reused; current values are read once per
+        camera when its parameters are first needed. Cameras whose controls
+        were never enumerated are loaded from the device instead.
+        """
+        for entry in entries:
+            camera = CameraDevice(entry['device_path'], entry['name'])
+            camera.is_available = entry.get('is_available', True)
+            camera.formats = entry.get('formats', [])
+            
+            cached_parameters = entry.get('parameters')
+            if cached_parameters is None:
+                self._attach_parameters(camera)
+            else:
+                camera.parameters = {
+                    name: V4L2Parameter.from_dict(data) for name, data in cached_parameters.items()
+                }
+                if self.lazy_parameters:
+                    camera.set_parameter_loader(self._read_cached_parameter_values)
+                else:
+                    self._read_cached_parameter_values(camera)
+            
+            self._camera_found(camera)
+        
+        logger.info(f"Restored {len(self.cameras)} camera(s) from detection cache")
+    
+    def _read_cached_parameter_values(self, camera: CameraDevice):
+        """Refresh values of cache-restored parameters with one bulk read"""
+        self.get_parameters(camera.device_path)
+        for param in camera.parameters.values():
+            param.original_value = param.value
+    
+    def _save_detection_cache(self):
+        """Write the current detection results to the cache"""
+        if not self._cache or self._devices is not None:
+            # A partial camera list must not replace the full one
+            return
+        
+        # Cameras whose parameters were never loaded are stored without controls
+        self._cache.save([
+            {
+                'device_path': camera.device_path,
+                'name': camera.name,
+                'is_available': camera.is_available,
+                'formats': camera.formats,
+                'parameters': (
+                    {name: param.to_dict() for name, param in camera.parameters.items()}
+                    if camera.parameters_loaded else None
+                ),
+            }
+            for camera in list(self.cameras.values())
+        ])
+    
+    def _attach_parameters(self, camera: CameraDevice):
+        """Load a camera's parameters now, or defer it when lazy loading is enabled"""
+        if self.lazy_parameters:
+            camera.set_parameter_loader(self._load_camera_parameters, on_loaded=self._deferred_parameters_loaded)
+        else:
+            self._load_camera_parameters(camera)
+    
+    def _deferred_parameters_loaded(self, camera: CameraDevice):
+        """Store the controls of a lazily loaded camera in the detection cache"""
+        self._save_detection_cache()
+    
+    def prefetch_parameters(self, exclude: Optional[List[str]] = None) -> Optional[threading.Thread]:
+        """Load parameters of all not-yet-loaded cameras in the background
+        
+        Args:
+            exclude: Device paths to skip (e.g. the camera already shown)
+        
+        Returns:
+            The prefetch thread, or None if there is nothing to load
+        """
+        exclude = set(exclude or [])
+        pending = [camera for camera in self.cameras.values()
+                   if not camera.parameters_loaded and camera.device_path not in exclude]
+        if not pending:
+            return None
+        
+        def prefetch():
+            self._run_probes(lambda camera: camera.load_parameters(),
+                             [(camera.device_path, (camera,)) for camera in pending])
+        
+        self._prefetch_thread = threading.Thread(target=prefetch, name="camloader-prefetch", daemon=True)
+        self._prefetch_thread.start()
+        logger.info(f"Prefetching parameters for {len(pending)} camera(s) in the background")
+        return self._prefetch_thread
     
     def _detect_via_list_devices(self) -> bool:
         """Detect cameras using v4l2-ctl --list-devices"""
@@ -334,53 +655,53 @@ class CameraController:
         if not device_groups:
             return False
         
-        # For each camera group, use the first /dev/video* device
-        for group_key, (camera_name, device_paths) in device_groups.items():
-            if not device_paths:
-                continue
-            
-            # Use the first video device (typically the capture device)
-            device_path = device_paths[0]
-            logger.info(f"Probing camera: {camera_name} at {device_path}")
-            
-            # Verify it's accessible with --info
-            success, info_output = self._run_v4l2_command([
-                "v4l2-ctl", "--device", device_path, "--info"
-            ])
-            
-            if not success:
-                logger.warning(f"Cannot access {device_path}, trying next device in group")
-                # Try other devices in the group
-                for alt_path in device_paths[1:]:
-                    if alt_path.startswith('/dev/video'):
-                        success, info_output = self._run_v4l2_command([
-                            "v4l2-ctl", "--device", alt_path, "--info"
-                        ])
-                        if success:
-                            device_path = alt_path
-                            break
-            
-            if not success:
-                logger.warning(f"Cannot access any device for camera: {camera_name}")
-                continue
-            
-            # Extract proper card name from --info output
-            if info_output:
-                name_match = re.search(r"Card type\s*:\s*(.+)", info_output)
-                if name_match:
-                    camera_name = name_match.group(1).strip()
-            
-            camera = CameraDevice(device_path, camera_name)
-            camera.is_available = self._check_preview_capability(device_path)
-            
-            self.cameras[device_path] = camera
-            logger.info(f"Found camera: {camera} (Preview: {'Yes' if camera.is_available else 'No'})")
-            
-            # Load initial parameters
-            self._load_camera_parameters(camera)
+        # Probe every camera group concurrently; results keep the --list-devices order
+        groups = [(paths[0], (name, paths)) for name, paths in device_groups.values() if paths]
+        self._probe_cameras(self._probe_device_group, groups)
         
         return len(self.cameras) > 0
     
+    def _probe_device_group(self, camera_name: str, device_paths: List[str]) -> Optional[CameraDevice]:
+        """Probe one --list-devices group and return its camera, if accessible"""
+        # Use the first video device (typically the capture device)
+        device_path = device_paths[0]
+        logger.info(f"Probing camera: {camera_name} at {device_path}")
+        
+        # Verify it's accessible with --info
+        success, info_output = self._run_v4l2_command([
+            "v4l2-ctl", "--device", device_path, "--info"
+        ])
+        
+        if not success:
+            logger.warning(f"Cannot access {device_path}, trying next device in group")
+            # Try other devices in the group
+            for alt_path in device_paths[1:]:
+                if alt_path.startswith('/dev/video'):
+                    success, info_output = self._run_v4l2_command([
+                        "v4l2-ctl", "--device", alt_path, "--info"
+                    ])
+                    if success:
+                        device_path = alt_path
+                        break
+        
+        if not success:
+            logger.warning(f"Cannot access any device for camera: {camera_name}")
+            return None
+        
+        # Extract proper card name from --info output
+        if info_output:
+            name_match = re.search(r"Card type\s*:\s*(.+)", info_output)
+            if name_match:
+                camera_name = name_match.group(1).strip()
+        
+        camera = CameraDevice(device_path, camera_name)
+        camera.is_available = self._check_preview_capability(device_path, camera)
+        logger.info(f"Found camera: {camera} (Preview: {'Yes' if camera.is_available else 'No'})")
+        
+        # Load initial parameters (deferred when lazy loading is enabled)
+        self._attach_parameters(camera)
+        return camera
+    
     def _detect_via_device_scan(self):
         """Fallback: Detect cameras by scanning /dev/video* devices"""
         # Find video devices
@@ -392,118 +713,250 @@ class CameraController:
         
         logger.debug(f"Found video devices: {video_devices}")
         
-        for device_path in video_devices:
-            try:
-                if not self._is_capture_device(device_path):
-                    logger.debug(f"Skipping {device_path} - not a capture device")
-                    continue
+        probes = [(device_path, (device_path,)) for device_path in video_devices]
+        self._probe_cameras(self._probe_scanned_device, probes)
+    
+    def _detect_listed_devices(self):
+        """Probe only the requested device nodes (no --list-devices, no cache update)"""
+        probes = [(device_path, (device_path,)) for device_path in self._devices if Path(device_path).exists()]
+        self._probe_cameras(self._probe_scanned_device, probes)
+    
+    def _probe_scanned_device(self, device_path: str) -> Optional[CameraDevice]:
+        """Probe a single /dev/video* node found by the fallback scan"""
+        try:
+            if not self._is_capture_device(device_path):
+                logger.debug(f"Skipping {device_path} - not a capture device")
+                return None
+            
+            # Get device info
+            success, output = self._run_v4l2_command([
+                "v4l2-ctl", "--device", device_path, "--info"
+            ])
+            
+            if success and output:
+                name_match = re.search(r"Card type\s*:\s*(.+)", output)
+                device_name = name_match.group(1).strip() if name_match else f"Camera {device_path}"
                 
-                # Get device info
-                success, output = self._run_v4l2_command([
-                    "v4l2-ctl", "--device", device_path, "--info"
-                ])
+                camera = CameraDevice(device_path, device_name)
+                camera.is_available = self._check_preview_capability(device_path, camera)
+                logger.info(f"Found camera: {camera} (Preview: {'Yes' if camera.is_available else 'No'})")
                 
-                if success and output:
-                    name_match = re.search(r"Card type\s*:\s*(.+)", output)
-                    device_name = name_match.group(1).strip() if name_match else f"Camera {device_path}"
-                    
-                    camera = CameraDevice(device_path, device_name)
-                    camera.is_available = self._check_preview_capability(device_path)
-                    
-                    self.cameras[device_path] = camera
-                    logger.info(f"Found camera: {camera} (Preview: {'Yes' if camera.is_available else 'No'})")
-                    
-                    # Load initial parameters
-                    self._load_camera_parameters(camera)
-                    
+                # Load initial parameters (deferred when lazy loading is enabled)
+                self._attach_parameters(camera)
+                return camera
+        
+        except Exception as e:
+            logger.warning(f"Failed to detect camera {device_path}: {e}")
+        
+        return None
+    
+    def _camera_found(self, camera: CameraDevice):
+        """Register a detected camera and report it to the on_camera_found callback"""
+        self._identify(camera)
+        self.cameras[camera.device_path] = camera
+        if self._on_camera_found:
+            try:
+                self._on_camera_found(self, camera)
             except Exception as e:
-                logger.warning(f"Failed to detect camera {device_path}: {e}")
+                logger.warning(f"Camera found callback failed for {camera.device_path}: {e}")
+    
+    def _identify(self, camera: CameraDevice):
+        """Set the stable ID configurations are keyed by (sysfs only, cheap)"""
+        if IS_LINUX and camera.stable_id is None:
+            camera.stable_id = read_stable_id(camera.device_path)
+    
+    def _resolve_id_collisions(self):
+        """Give identical cameras sharing a stable ID port-qualified IDs
+        
+        Checked against every present node (see camera.identity.stable_ids),
+        so detection restricted to some devices keys them the same way.
+        """
+        if not IS_LINUX:
+            return
+        unique_ids = stable_ids(self.cameras)
+        for camera in self.cameras.values():
+            if camera.stable_id and camera.stable_id != unique_ids.get(camera.device_path):
+                camera.stable_id = unique_ids.get(camera.device_path)
+                logger.info(f"Camera {camera.device_path} shares its ID with an identical camera, "
+                            f"now keyed as {camera.key}")
+    
+    def _probe_cameras(self, probe: Callable, probes: List[Tuple[str, tuple]]):
+        """Probe devices concurrently, registering each camera as soon as its probe finishes
+        
+        Once all probes are done, the camera list is put back into probe order.
+        """
+        results = self._run_probes(probe, probes, on_result=self._camera_found)
+        self.cameras = {camera.device_path: camera for camera in results if camera}
+    
+    def _run_probes(self, probe: Callable, probes: List[Tuple[str, tuple]],
+                    on_result: Optional[Callable[[Any], None]] = None) -> List[Any]:
+        """Run probe(*args) for every (label, args) entry on a bounded worker pool
+        
+        Results are returned in the order of probes, regardless of which
+        probe finishes first. Each probe's wall time is logged under its label.
+        on_result is called on the probing thread with every result that is
+        not None, in completion order.
+        """
+        def timed_probe(entry):
+            label, args = entry
+            started = time.perf_counter()
+            try:
+                with profile_span(f"probe {label}", "detect"):
+                    result = probe(*args)
+                if result is not None and on_result:
+                    on_result(result)
+                return result
+            except Exception as e:
+                logger.warning(f"Probe of {label} failed: {e}")
+                return None
+            finally:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                logger.info(f"Probed {label} in {elapsed_ms:.1f} ms")
+        
+        if not probes:
+            return []
+        
+        workers = max(1, min(self.probe_workers, len(probes)))
+        started = time.perf_counter()
+        if workers == 1:
+            results = [timed_probe(entry) for entry in probes]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="camloader-probe") as pool:
+                results = list(pool.map(timed_probe, probes))
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Probed {len(probes)} device(s) with {workers} worker(s) in {elapsed_ms:.1f} ms")
+        return results
     
     def _load_camera_parameters(self, camera: CameraDevice):
         """Load all available parameters for a camera"""
         logger.info(f"Loading parameters for {camera.name}")
         
-        # Get list of controls
+        backend = self._get_ioctl_backend(camera.device_path)
+        if backend:
+            try:
+                for control in backend.list_controls(camera.device_path):
+                    param = self._parameter_from_control(control)
+                    if param:
+                        camera.parameters[param.name] = param
+                return
+            except OSError as e:
+                logger.warning(f"ioctl control enumeration failed for {camera.device_path}: {e}, falling back to v4l2-ctl")
+        
+        # Get list of controls together with their menu entries
         success, output = self._run_v4l2_command([
-            "v4l2-ctl", "--device", camera.device_path, "--list-ctrls"
+            "v4l2-ctl", "--device", camera.device_path, "--list-ctrls-menus"
         ])
         
         if not success:
             logger.warning(f"Failed to get controls for {camera.device_path}")
             return
         
-        # Parse control output
-        for line in output.split('\n'):
-            if ':' in line and 'min=' in line:
-                try:
-                    param = self._parse_control_line(line)
-                    if param:
-                        camera.parameters[param.name] = param
-                except Exception as e:
-                    logger.warning(f"Failed to parse control line: {line}, Error: {e}")
+        for param in parse_control_list(output):
+            if param.param_type in self.PARAMETER_CTRL_TYPES and param.value is not None:
+                camera.parameters[param.name] = param
     
-    def _parse_control_line(self, line: str) -> Optional[V4L2Parameter]:
-        """Parse a v4l2-ctl control line"""
-        # Example: brightness 0x00980900 (int)    : min=0 max=255 step=1 default=128 value=128 flags=slider
-        
-        # Extract parameter name
-        name_match = re.search(r"^\s*(\w+)", line)
-        if not name_match:
+    def _parameter_from_control(self, control: Dict) -> Optional[V4L2Parameter]:
+        """Build a parameter from an ioctl backend control description"""
+        if control['type'] not in self.PARAMETER_CTRL_TYPES or control['value'] is None:
             return None
         
-        param_name = name_match.group(1)
-        
-        # Extract type
-        type_match = re.search(r"\((\w+)\)", line)
-        param_type = type_match.group(1) if type_match else "int"
-        
-        # Extract values
-        value_match = re.search(r"value=([+-]?\d+)", line)
-        min_match = re.search(r"min=([+-]?\d+)", line)
-        max_match = re.search(r"max=([+-]?\d+)", line)
-        step_match = re.search(r"step=([+-]?\d+)", line)
-        flags_match = re.search(r"flags=([^\s]+)", line)
-        
-        if not value_match:
-            return None
-        
-        try:
-            value = int(value_match.group(1))
-            min_val = int(min_match.group(1)) if min_match else None
-            max_val = int(max_match.group(1)) if max_match else None
-            step = int(step_match.group(1)) if step_match else None
-            
-            param = V4L2Parameter(
-                name=param_name,
-                value=value,
-                min_val=min_val,
-                max_val=max_val,
-                step=step,
-                param_type=param_type
-            )
-            
-            # Parse flags
-            if flags_match:
-                flags_str = flags_match.group(1)
-                param.flags = flags_str.split(',') if ',' in flags_str else [flags_str]
-                
-                # Check for readonly/inactive flags
-                param.is_readonly = 'read-only' in param.flags or 'ro' in param.flags
-                param.is_inactive = 'inactive' in param.flags or 'grabbed' in param.flags
-            
-            return param
-            
-        except ValueError as e:
-            logger.warning(f"Failed to parse numeric values from line: {line}, Error: {e}")
-            return None
+        param = V4L2Parameter(
+            name=control['name'],
+            value=control['value'],
+            min_val=control['min'],
+            max_val=control['max'],
+            step=control['step'],
+            param_type=control['type'],
+            default_value=control['default'],
+            control_id=control['id']
+        )
+        param.menu_items = dict(control.get('menu_items', {}))
+        param.update_flags(control['flags'])
+        return param
     
     def get_cameras(self) -> List[CameraDevice]:
         """Get list of available cameras"""
         return list(self.cameras.values())
     
     def get_camera(self, device_path: str) -> Optional[CameraDevice]:
-        """Get camera by device path"""
-        return self.cameras.get(device_path)
+        """Get camera by device path or stable ID"""
+        camera = self.cameras.get(device_path)
+        if camera is None and not device_path.startswith("/"):
+            camera = next((c for c in self.cameras.values() if c.stable_id == device_path), None)
+        return camera
+    
+    def add_device(self, device_path: str) -> Optional[CameraDevice]:
+        """Probe a single newly appeared device node and add it if it is a camera
+        
+        Only this node is probed; cameras that are already known are left
+        untouched. Secondary nodes of a known camera (e.g. UVC metadata
+        nodes) are skipped.
+        
+        Returns:
+            The new camera, or None if the node is not a (new) camera
+        """
+        if device_path in self.cameras:
+            return self.cameras[device_path]
+        
+        camera = None
+        if self._is_new_capture_node(device_path):
+            camera = self._probe_scanned_device(device_path)
+            if camera:
+                self._identify(camera)
+                self.cameras[device_path] = camera
+                self._resolve_id_collisions()
+                logger.info(f"Camera added: {camera}")
+        
+        if not camera:
+            # Allow a later retry to re-check ioctl support (e.g. after udev fixed permissions)
+            self._ioctl_support.pop(device_path, None)
+        
+        self._save_detection_cache()
+        return camera
+    
+    def remove_device(self, device_path: str) -> Optional[CameraDevice]:
+        """Forget a device node that disappeared
+        
+        Returns:
+            The removed camera, or None if the node was not a camera
+        """
+        camera = self.cameras.pop(device_path, None)
+        if self._control_events:
+            self._control_events.unwatch(device_path)
+        self._ioctl_support.pop(device_path, None)
+        if self._ioctl_backend:
+            self._ioctl_backend.forget(device_path)
+        
+        if camera:
+            logger.info(f"Camera removed: {camera}")
+        self._save_detection_cache()
+        return camera
+    
+    def _is_new_capture_node(self, device_path: str) -> bool:
+        """Check that a node is a capture node not belonging to a known camera"""
+        info = read_device_info(device_path)
+        if info['bus_path']:
+            for camera in list(self.cameras.values()):
+                known = read_device_info(camera.device_path)
+                if (known['bus_path'], known['vendor_id'], known['product_id']) == \
+                        (info['bus_path'], info['vendor_id'], info['product_id']):
+                    logger.debug(f"Skipping {device_path} - secondary node of {camera.device_path}")
+                    return False
+        
+        backend = self._get_ioctl_backend(device_path)
+        if backend:
+            try:
+                cap = backend.query_capability(device_path)
+                caps = cap['device_caps'] if cap['capabilities'] & V4L2_CAP_DEVICE_CAPS else cap['capabilities']
+                if not caps & (V4L2_CAP_VIDEO_CAPTURE | V4L2_CAP_VIDEO_CAPTURE_MPLANE):
+                    logger.debug(f"Skipping {device_path} - no video capture capability")
+                    return False
+            except OSError as e:
+                logger.debug(f"VIDIOC_QUERYCAP failed on {device_path}: {e}")
+        
+        # Let the v4l2-ctl based probe make the final decision
+        return True
     
     def set_parameter(self, device_path: str, param_name: str, value: Any) -> bool:
         """Set a camera parameter"""
@@ -516,12 +969,27 @@ class CameraController:
             logger.error(f"Parameter not found: {param_name}")
             return False
         
+        if isinstance(value, bool):
+            value = int(value)  # v4l2-ctl expects 0/1 for bool controls
+        
         if not IS_LINUX:
             # Simulate parameter setting for Windows testing
             camera.parameters[param_name].value = value
             logger.info(f"[SIMULATED] Set {param_name}={value} for {camera.name}")
             return True
         
+        backend = self._get_ioctl_backend(device_path)
+        if backend:
+            try:
+                if backend.set_control(device_path, param_name, value):
+                    camera.parameters[param_name].value = value
+                    logger.info(f"Set {param_name}={value} for {camera.name}")
+                    return True
+                logger.error(f"Failed to set {param_name}={value} for {camera.name}")
+                return False
+            except OSError as e:
+                logger.warning(f"ioctl set failed for {device_path}: {e}, falling back to v4l2-ctl")
+        
         # Set the parameter using v4l2-ctl (Linux only)
         success, output = self._run_v4l2_command([
             "v4l2-ctl", "--device", device_path, "--set-ctrl", f"{param_name}={value}"
@@ -535,12 +1003,104 @@ class CameraController:
             logger.error(f"Failed to set {param_name}={value} for {camera.name}")
             return False
     
+    def set_parameters(self, device_path: str, values: Dict[str, Any]) -> Dict[str, bool]:
+        """Set several camera parameters in one round-trip
+        
+        Uses a single VIDIOC_S_EXT_CTRLS (ioctl backend) or a single
+        ``v4l2-ctl --set-ctrl a=1,b=2,...`` call. If the batch is rejected,
+        controls are retried one by one so the result is exact per control.
+        
+        Returns:
+            Mapping of parameter name to success
+        """
+        camera = self.cameras.get(device_path)
+        if not camera:
+            logger.error(f"Camera not found: {device_path}")
+            return {name: False for name in values}
+        
+        pending, results = self._split_known_values(camera, values)
+        if not pending:
+            return results
+        
+        if not IS_LINUX:
+            # Simulate parameter setting for Windows testing
+            for param_name, value in pending.items():
+                camera.parameters[param_name].value = value
+                results[param_name] = True
+            logger.info(f"[SIMULATED] Set {len(pending)} parameters for {camera.name}")
+            return results
+        
+        batch_results = None
+        backend = self._get_ioctl_backend(device_path)
+        if backend:
+            try:
+                batch_results = backend.set_controls(device_path, pending)
+            except OSError as e:
+                logger.warning(f"ioctl batch set failed for {device_path}: {e}, falling back to v4l2-ctl")
+        
+        if batch_results is None:
+            success, output = self._run_v4l2_command(self.set_ctrl_command(device_path, pending))
+            if success:
+                batch_results = {name: True for name in pending}
+            else:
+                # Find out which controls were rejected
+                logger.debug(f"Batch --set-ctrl failed for {device_path}, retrying per control")
+                batch_results = {}
+                for name, value in pending.items():
+                    success, output = self._run_v4l2_command(self.set_ctrl_command(device_path, {name: value}))
+                    batch_results[name] = success
+        
+        return self._record_set_results(camera, pending, batch_results, results)
+    
+    def _split_known_values(self, camera: CameraDevice, values: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, bool]]:
+        """Split values into writable ones (bools as 0/1) and failures for unknown parameters"""
+        pending = {}
+        failures = {}
+        for param_name, value in values.items():
+            if param_name in camera.parameters:
+                pending[param_name] = int(value) if isinstance(value, bool) else value
+            else:
+                logger.error(f"Parameter not found: {param_name}")
+                failures[param_name] = False
+        return pending, failures
+    
+    @staticmethod
+    def set_ctrl_command(device_path: str, values: Dict[str, Any]) -> List[str]:
+        """v4l2-ctl command writing all values in one --set-ctrl call"""
+        controls = ",".join(f"{name}={value}" for name, value in values.items())
+        return ["v4l2-ctl", "--device", device_path, "--set-ctrl", controls]
+    
+    def _record_set_results(self, camera: CameraDevice, pending: Dict[str, Any],
+                            batch_results: Dict[str, bool], results: Dict[str, bool]) -> Dict[str, bool]:
+        """Apply per-control write outcomes to the cached values and log them"""
+        for param_name, value in pending.items():
+            ok = batch_results.get(param_name, False)
+            if ok:
+                camera.parameters[param_name].value = value
+            else:
+                logger.warning(f"Failed to set {param_name}={value} for {camera.name}")
+            results[param_name] = ok
+        
+        success_count = sum(1 for ok in results.values() if ok)
+        logger.info(f"Set {success_count}/{len(results)} parameters for {camera.name}")
+        return results
+    
     def get_parameter(self, device_path: str, param_name: str) -> Optional[Any]:
         """Get current value of a camera parameter"""
         camera = self.cameras.get(device_path)
         if not camera or param_name not in camera.parameters:
             return None
         
+        backend = self._get_ioctl_backend(device_path)
+        if backend:
+            try:
+                value = backend.get_control(device_path, param_name)
+                if value is not None:
+                    camera.parameters[param_name].value = value
+                    return value
+            except OSError as e:
+                logger.warning(f"ioctl get failed for {device_path}: {e}, falling back to v4l2-ctl")
+        
         # Get current value from camera
         success, output = self._run_v4l2_command([
             "v4l2-ctl", "--device", device_path, "--get-ctrl", param_name
@@ -556,30 +1116,107 @@ class CameraController:
         
         return camera.parameters[param_name].value
     
+    def get_parameters(self, device_path: str, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Read current values of several parameters in one round-trip
+        
+        Uses a single VIDIOC_G_EXT_CTRLS (ioctl backend) or a single
+        ``v4l2-ctl --get-ctrl a,b,c`` call and updates the cached
+        V4L2Parameter values in place.
+        
+        Args:
+            device_path: Camera device path
+            names: Parameters to read, or None for all known parameters
+        
+        Returns:
+            Mapping of parameter name to current value (only values actually read)
+        """
+        camera = self.cameras.get(device_path)
+        if not camera:
+            return {}
+        
+        if names is None:
+            names = list(camera.parameters)
+        names = [name for name in names if name in camera.parameters]
+        if not names:
+            return {}
+        
+        if not IS_LINUX:
+            return {name: camera.parameters[name].value for name in names}
+        
+        values = None
+        backend = self._get_ioctl_backend(device_path)
+        if backend:
+            try:
+                values = backend.get_controls(device_path, names)
+            except OSError as e:
+                logger.warning(f"ioctl bulk get failed for {device_path}: {e}, falling back to v4l2-ctl")
+        
+        if values is None:
+            success, output = self._run_v4l2_command(self.get_ctrl_command(device_path, names))
+            values = self._parse_get_ctrl(camera, output)
+            if not success:
+                logger.debug(f"--get-ctrl reported an error for {device_path}, read {len(values)}/{len(names)} values")
+        
+        for name, value in values.items():
+            camera.parameters[name].value = value
+        
+        return values
+    
+    @staticmethod
+    def get_ctrl_command(device_path: str, names: List[str]) -> List[str]:
+        """v4l2-ctl command reading all named controls in one --get-ctrl call"""
+        return ["v4l2-ctl", "--device", device_path, "--get-ctrl", ",".join(names)]
+    
+    def _parse_get_ctrl(self, camera: CameraDevice, output: str) -> Dict[str, int]:
+        """Values of the camera's known parameters in --get-ctrl output"""
+        # v4l2-ctl still prints the readable controls if one of them fails
+        values = {}
+        for match in self._GET_CTRL_PATTERN.finditer(output or ""):
+            if match.group(1) in camera.parameters:
+                values[match.group(1)] = int(match.group(2))
+        return values
+    
     def backup_parameters(self, device_path: str) -> bool:
         """Backup all current parameter values as original values"""
         camera = self.cameras.get(device_path)
         if not camera:
             return False
         
+        current_values = self.get_parameters(device_path)
         for param in camera.parameters.values():
-            current_value = self.get_parameter(device_path, param.name)
-            if current_value is not None:
-                param.original_value = current_value
+            # Parameters that could not be read keep their last known value
+            param.original_value = current_values.get(param.name, param.value)
         
         logger.info(f"Backed up parameters for {camera.name}")
         return True
     
     def restore_parameters(self, device_path: str) -> bool:
-        """Restore all parameters to their original values"""
+        """Restore all parameters to their original values
+        
+        Only parameters whose current value differs from the original are
+        written (see camera.profile.apply_profile).
+        """
         camera = self.cameras.get(device_path)
         if not camera:
             return False
         
-        success_count = 0
-        for param in camera.parameters.values():
-            if self.set_parameter(device_path, param.name, param.original_value):
-                success_count += 1
+        targets = {param.name: param.original_value for param in camera.parameters.values()}
+        report = apply_profile(self, device_path, targets)
+        
+        # Verify the written values with one bulk read
+        readback = self.get_parameters(device_path, report.written)
+        return self._verify_restore(camera, targets, report, readback)
+    
+    def _verify_restore(self, camera: CameraDevice, targets: Dict[str, Any],
+                        report: ApplyReport, readback: Dict[str, Any]) -> bool:
+        """Check read-back values against the restore targets"""
+        results = {name: True for name in report.unchanged + report.written}
+        results.update({name: False for name in report.failed})
+        for name, value in readback.items():
+            if value != targets[name]:
+                logger.warning(f"Restore verification failed for {name}: expected {targets[name]}, got {value}")
+                results[name] = False
+        success_count = sum(1 for ok in results.values() if ok)
         
         logger.info(f"Restored {success_count}/{len(camera.parameters)} parameters for {camera.name}")
         return success_count == len(camera.parameters)
@@ -588,7 +1225,136 @@ class CameraController:
         """Refresh camera parameters"""
         camera = self.cameras.get(device_path)
         if camera:
+            if not camera.parameters_loaded:
+                camera.load_parameters()  # First load, nothing to refresh yet
+                return
             self._load_camera_parameters(camera)
+            self._save_detection_cache()
+    
+    def refresh_parameter_state(self, device_path: str, names: List[str]) -> List[str]:
+        """Re-read value, flags and range of only the given parameters
+        
+        Fallback for devices without control events. With the ioctl backend
+        only the named controls are queried; v4l2-ctl cannot report flags of
+        single controls, so its listing is read once and applied to the named
+        parameters only.
+        
+        Returns:
+            Names whose state changed (also reported to parameter listeners)
+        """
+        camera = self.cameras.get(device_path)
+        if not camera:
+            return []
+        names = [name for name in names if name in camera.parameters]
+        if not names:
+            return []
+        
+        states: Dict[str, Dict] = {}
+        backend = self._get_ioctl_backend(device_path)
+        if backend:
+            try:
+                states = backend.query_controls(device_path, names)
+            except OSError as e:
+                logger.warning(f"ioctl control query failed for {device_path}: {e}, falling back to v4l2-ctl")
+                backend = None
+        
+        if not backend:
+            success, output = self._run_v4l2_command([
+                "v4l2-ctl", "--device", device_path, "--list-ctrls"
+            ])
+            if not success:
+                logger.warning(f"Failed to re-query controls of {device_path}")
+                return []
+            for param in parse_control_list(output):
+                if param.name in names:
+                    states[param.name] = {
+                        'value': param.value, 'flags': param.flags, 'min': param.min_val,
+                        'max': param.max_val, 'step': param.step, 'default': param.default_value,
+                    }
+        
+        changed = [name for name, state in states.items()
+                   if self._update_parameter(camera.parameters[name], state)]
+        if changed:
+            self._notify_parameters_changed(device_path, changed)
+        return changed
+    
+    def _update_parameter(self, param: V4L2Parameter, state: Dict,
+                          changes: Tuple[str, ...] = ("value", "flags", "range")) -> bool:
+        """Apply a control state dict (ioctl backend / event format) to a parameter
+        
+        Returns:
+            True if anything changed
+        """
+        before = (param.value, param.flags, param.min_val, param.max_val, param.step, param.default_value)
+        if "value" in changes and state['value'] is not None:
+            param.value = state['value']
+        if "flags" in changes:
+            param.update_flags(state['flags'])
+        if "range" in changes:
+            param.min_val = state['min']
+            param.max_val = state['max']
+            param.step = state['step']
+            param.default_value = state['default']
+        return before != (param.value, param.flags, param.min_val, param.max_val, param.step, param.default_value)
+    
+    def add_parameter_listener(self, listener: Callable[[str, List[str]], None]):
+        """Register ``listener(device_path, names)`` for parameter state changes
+        
+        Called when values, flags (lock state) or ranges of parameters
+        change, either from the control event thread or from the thread that
+        triggered a re-query. GUI code must hand the call over to its own
+        thread.
+        """
+        self._parameter_listeners.append(listener)
+    
+    def remove_parameter_listener(self, listener: Callable[[str, List[str]], None]):
+        if listener in self._parameter_listeners:
+            self._parameter_listeners.remove(listener)
+    
+    def _notify_parameters_changed(self, device_path: str, names: List[str]):
+        for listener in list(self._parameter_listeners):
+            try:
+                listener(device_path, names)
+            except Exception as e:
+                logger.error(f"Parameter listener failed for {device_path}: {e}")
+    
+    def enable_control_events(self, device_path: str) -> bool:
+        """Track parameter changes of a camera through V4L2 control events
+        
+        Changes made by the driver (e.g. controls becoming inactive when an
+        auto mode is switched on) or by other applications are applied to
+        the camera's parameters and reported to parameter listeners.
+        
+        Returns:
+            False if the device does not support control events
+        """
+        if device_path not in self.cameras or not self._get_ioctl_backend(device_path):
+            return False
+        if self._control_events is None:
+            self._control_events = ControlEventMonitor(self._ioctl_backend, self._on_control_events)
+        return self._control_events.watch(device_path)
+    
+    def _on_control_events(self, device_path: str, events: List[Dict]):
+        camera = self.cameras.get(device_path)
+        if not camera or not camera.parameters_loaded:
+            return
+        
+        changed = []
+        for event in events:
+            param = camera.parameters.get(event['name'])
+            if param and self._update_parameter(param, event, tuple(event['changes'])):
+                if param.name not in changed:
+                    changed.append(param.name)
+        
+        if changed:
+            logger.debug(f"Control events on {device_path}: {', '.join(changed)} changed")
+            self._notify_parameters_changed(device_path, changed)
+    
+    def close(self):
+        """Stop background work (control event tracking) of this controller"""
+        if self._control_events:
+            self._control_events.stop()
+            self._control_events = None
     
     def try_unlock_parameter(self, device_path: str, param_name: str) -> bool:
         """Try to unlock a parameter by disabling related auto modes"""
@@ -600,56 +1366,41 @@ class CameraController:
         if not param.is_locked:
             return True  # Already unlocked
         
-        # Define parameter unlock strategies
-        unlock_strategies = {
-            'exposure_absolute': ['exposure_auto'],
-            'focus_absolute': ['focus_auto'],
-            'white_balance_temperature': ['white_balance_temperature_auto'],
-            'gain': ['gain_automatic'],
-            'brightness': ['auto_exposure'],
-            'contrast': ['auto_exposure'],
-            'saturation': ['auto_exposure'],
-        }
-        
         # Try to disable auto modes that might lock this parameter
-        auto_params = unlock_strategies.get(param_name, [])
+        auto_params = locking_controls(param_name, camera.parameters)
         success = False
         
+        disabled = []
+        
         for auto_param in auto_params:
-            if auto_param in camera.parameters:
-                # Try to set auto parameter to manual mode (usually 0)
-                if self.set_parameter(device_path, auto_param, 0):
-                    logger.info(f"Disabled {auto_param} to unlock {param_name}")
-                    success = True
+            # Switch the auto parameter to manual mode (0 for most, 1 for exposure menus)
+            if self.set_parameter(device_path, auto_param, manual_value(auto_param)):
+                logger.info(f"Disabled {auto_param} to unlock {param_name}")
+                disabled.append(auto_param)
+                success = True
         
         # Also try some common auto parameters that might affect this one
         common_auto_params = ['exposure_auto', 'white_balance_temperature_auto', 'focus_auto', 'gain_automatic']
         for auto_param in common_auto_params:
             if auto_param in camera.parameters and auto_param not in auto_params:
                 current_value = camera.parameters[auto_param].value
-                if current_value != 0:  # If it's in auto mode
-                    if self.set_parameter(device_path, auto_param, 0):
+                if current_value != manual_value(auto_param):  # If it's in auto mode
+                    if self.set_parameter(device_path, auto_param, manual_value(auto_param)):
                         logger.info(f"Disabled {auto_param} (common auto) to unlock {param_name}")
+                        disabled.append(auto_param)
                         success = True
         
-        # Refresh parameters to check if unlock was successful
+        # Pick up the new lock state: control events if subscribed,
+        # otherwise re-query only the controls involved
         if success:
-            self._load_camera_parameters(camera)
+            if not self._control_events or self._control_events.drain(device_path) is None:
+                self.refresh_parameter_state(device_path, [param_name] + disabled)
             param = camera.parameters.get(param_name)
-            return param and not param.is_locked
+            return bool(param) and not param.is_locked
         
         return False
     
     def get_locking_parameters(self, device_path: str, param_name: str) -> List[str]:
         """Get list of parameters that might be locking the given parameter"""
-        unlock_strategies = {
-            'exposure_absolute': ['exposure_auto'],
-            'focus_absolute': ['focus_auto'],
-            'white_balance_temperature': ['white_balance_temperature_auto'],
-            'gain': ['gain_automatic'],
-            'brightness': ['auto_exposure'],
-            'contrast': ['auto_exposure'],
-            'saturation': ['auto_exposure'],
-        }
-        
-        return unlock_strategies.get(param_name, [])
\ No newline at end of file
+        camera = self.cameras.get(device_path)
+        return locking_controls(param_name, camera.parameters if camera else None)
\ No newline at end of file
@@ -0,0 +1,350 @@
+"""
+Camera Daemon
+Serves a warm CameraController to other processes over a Unix socket (JSON lines)
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import logging
+import os
+import signal
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from camera.async_controller import AsyncCameraController
+from camera.controller import CameraDevice, IS_LINUX
+from camera.dependencies import locking_controls
+from camera.enforcer import ConfigEnforcer
+from camera.watcher import DeviceWatcher
+from config.startup import EnabledProfileCache, profiles_by_device
+
+logger = logging.getLogger(__name__)
+
+def default_socket_path() -> Path:
+    """$XDG_RUNTIME_DIR/camloader.sock, or ~/.camloader/camloader.sock"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "camloader.sock"
+    return Path.home() / ".camloader" / "camloader.sock"
+
+def encode_message(message: Dict) -> bytes:
+    return (json.dumps(message, separators=(',', ':')) + "\n").encode()
+
+def parameter_state(param) -> Dict:
+    """Parameter fields sent to clients (original_value stays client-side)"""
+    state = param.to_dict()
+    state.pop('original_value', None)
+    return state
+
+class DaemonClient:
+    """One connected client of the daemon"""
+    
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.subscribed = False
+        self._write_lock = asyncio.Lock()
+    
+    async def send(self, message: Dict):
+        async with self._write_lock:
+            self.writer.write(encode_message(message))
+            await self.writer.drain()
+
+class CameraDaemon:
+    """JSON-lines server in front of an AsyncCameraController
+    
+    Every request is one line ``{"id": ..., "op": ..., ...}`` and gets one
+    response ``{"id": ..., "ok": true, "result": ...}`` or ``{"id": ...,
+    "ok": false, "error": "..."}``. Requests are handled concurrently,
+    also those of one client, so responses may arrive out of order;
+    operations on one device are serialized by the controller's
+    per-device lock.
+    
+    Operations:
+        list                              cameras (device_path, name, stable_id, is_available, formats)
+        describe  device                  all parameters of a camera
+        get       device [names]          current values
+        set       device values           write a batch of values
+        apply     device values [dry_run] diff-based profile apply (see camera.profile)
+        backup    device                  remember current values as originals
+        restore   device                  write the originals back
+        unlock    device name             disable auto modes locking a parameter
+        subscribe                         start receiving events
+        stats                             external command statistics
+    
+    ``device`` is a device path or stable ID.
+    
+    Subscribed clients receive ``{"event": "parameters", "device": ...,
+    "parameters": {name: state}}`` when controls change (writes by any
+    client, control events from the driver) and ``{"event": "added" |
+    "removed", "device": ...}`` on hotplug.
+    
+    With enforce_interval the enabled startup profiles are applied at
+    start and enforced by a ConfigEnforcer; controls written by clients
+    are exempt from it until their camera reconnects.
+    """
+    
+    def __init__(self, controller: AsyncCameraController, socket_path: Optional[str] = None,
+                 enforce_interval: Optional[float] = None):
+        self.controller = controller
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.enforce_interval = enforce_interval
+        self._enforcer: Optional[ConfigEnforcer] = None
+        self._clients: Set[DaemonClient] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._watcher: Optional[DeviceWatcher] = None
+        self._operations: Dict[str, Callable[[DaemonClient, Dict], Awaitable[Any]]] = {
+            'list': self._op_list,
+            'describe': self._op_describe,
+            'get': self._op_get,
+            'set': self._op_set,
+            'apply': self._op_apply,
+            'backup': self._op_backup,
+            'restore': self._op_restore,
+            'unlock': self._op_unlock,
+            'subscribe': self._op_subscribe,
+            'stats': self._op_stats,
+        }
+    
+    async def start(self):
+        """Listen on the socket and start forwarding device events"""
+        self._loop = asyncio.get_running_loop()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if await self._socket_in_use():
+                raise RuntimeError(f"Another daemon is listening on {self.socket_path}")
+            self.socket_path.unlink()
+        
+        self._server = await asyncio.start_unix_server(self._handle_client, path=str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        
+        controller = self.controller.controller
+        controller.add_parameter_listener(self._on_parameters_changed)
+        for camera in controller.get_cameras():
+            await self.controller.enable_control_events(camera.device_path)
+        
+        if self.enforce_interval is not None:
+            startup_profiles = EnabledProfileCache()
+            self._enforcer = ConfigEnforcer(
+                controller,
+                lambda: profiles_by_device(startup_profiles.get(), controller.get_camera),
+                interval=self.enforce_interval,
+                callback=self._on_profile_enforced,
+                submit=self._submit_locked
+            )
+            await self._loop.run_in_executor(None, self._enforcer.check)
+            self._enforcer.start()
+        
+        if IS_LINUX:
+            self._watcher = DeviceWatcher(controller)
+            self._watcher.add_listener(self._on_device_event)
+            if self._enforcer:
+                self._watcher.add_listener(self._enforcer.on_device_event)
+            self._watcher.start()
+        
+        logger.info(f"Serving {len(controller.get_cameras())} camera(s) on {self.socket_path}")
+    
+    async def _socket_in_use(self) -> bool:
+        try:
+            _, writer = await asyncio.open_unix_connection(str(self.socket_path))
+        except OSError:
+            return False
+        writer.close()
+        return True
+    
+    async def stop(self):
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+        if self._enforcer:
+            self._enforcer.stop()
+            self._enforcer = None
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for client in list(self._clients):
+            client.writer.close()
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+        self.controller.controller.remove_parameter_listener(self._on_parameters_changed)
+        await self.controller.close()
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = DaemonClient(writer)
+        self._clients.add(client)
+        tasks: Set[asyncio.Task] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self._respond(client, line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            # End of input: still answer what was asked before it
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            for task in tasks:
+                task.cancel()
+        finally:
+            self._clients.discard(client)
+            writer.close()
+    
+    async def _respond(self, client: DaemonClient, line: bytes):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            operation = self._operations.get(request.get('op'))
+            if operation is None:
+                raise ValueError(f"Unknown operation: {request.get('op')}")
+            response = {'id': request_id, 'ok': True, 'result': await operation(client, request)}
+        except Exception as e:
+            response = {'id': request_id, 'ok': False, 'error': str(e)}
+        try:
+            await client.send(response)
+        except ConnectionError:
+            pass
+    
+    def _camera(self, request: Dict) -> CameraDevice:
+        device_path = request.get('device')
+        if not device_path:
+            raise ValueError("Missing 'device'")
+        camera = self.controller.get_camera(device_path)
+        if camera is None:
+            raise LookupError(f"Camera not found: {device_path}")
+        return camera
+    
+    async def _op_list(self, client: DaemonClient, request: Dict) -> List[Dict]:
+        return [
+            {
+                'device_path': camera.device_path,
+                'name': camera.name,
+                'stable_id': camera.stable_id,
+                'is_available': camera.is_available,
+                'formats': camera.formats,
+            }
+            for camera in self.controller.get_cameras()
+        ]
+    
+    async def _op_describe(self, client: DaemonClient, request: Dict) -> Dict[str, Dict]:
+        camera = self._camera(request)
+        await self.controller.load_parameters(camera.device_path)
+        return {name: parameter_state(param) for name, param in camera.parameters.items()}
+    
+    async def _op_get(self, client: DaemonClient, request: Dict) -> Dict[str, Any]:
+        camera = self._camera(request)
+        return await self.controller.get_parameters(camera.device_path, request.get('names'))
+    
+    async def _op_set(self, client: DaemonClient, request: Dict) -> Dict[str, bool]:
+        camera = self._camera(request)
+        results = await self.controller.set_parameters(camera.device_path, request.get('values') or {})
+        written = [name for name, ok in results.items() if ok]
+        self._exempt(camera.device_path, written)
+        self._broadcast_parameters(camera.device_path, written)
+        return results
+    
+    async def _op_apply(self, client: DaemonClient, request: Dict) -> Dict:
+        camera = self._camera(request)
+        report = await self.controller.apply_profile(camera.device_path, request.get('values') or {},
+                                                     bool(request.get('dry_run')))
+        self._exempt(camera.device_path, report.written)
+        self._broadcast_parameters(camera.device_path, report.written)
+        return report.to_dict()
+    
+    async def _op_backup(self, client: DaemonClient, request: Dict) -> bool:
+        return await self.controller.backup_parameters(self._camera(request).device_path)
+    
+    async def _op_restore(self, client: DaemonClient, request: Dict) -> bool:
+        camera = self._camera(request)
+        restored = await self.controller.restore_parameters(camera.device_path)
+        self._exempt(camera.device_path, None)
+        self._broadcast_parameters(camera.device_path, list(camera.parameters))
+        return restored
+    
+    async def _op_unlock(self, client: DaemonClient, request: Dict) -> bool:
+        camera = self._camera(request)
+        name = request.get('name')
+        unlocked = await self.controller.try_unlock_parameter(camera.device_path, name)
+        if unlocked:
+            self._exempt(camera.device_path, [name] + locking_controls(name, camera.parameters))
+        self._broadcast_parameters(camera.device_path, list(camera.parameters))
+        return unlocked
+    
+    async def _op_subscribe(self, client: DaemonClient, request: Dict) -> bool:
+        client.subscribed = True
+        return True
+    
+    async def _op_stats(self, client: DaemonClient, request: Dict) -> Dict[str, Dict]:
+        stats = self.controller.controller.executor.stats()
+        if self._enforcer:
+            stats['reapply after reconnect'] = self._enforcer.stats()
+        return stats
+    
+    def _exempt(self, device_path: str, names: Optional[List[str]]):
+        """Written by a client: not enforced until the camera reconnects"""
+        if self._enforcer and (names is None or names):
+            self._enforcer.ignore(device_path, names)
+    
+    def _broadcast(self, message: Dict):
+        for client in list(self._clients):
+            if client.subscribed:
+                asyncio.ensure_future(self._send_event(client, message))
+    
+    async def _send_event(self, client: DaemonClient, message: Dict):
+        try:
+            await client.send(message)
+        except ConnectionError:
+            self._clients.discard(client)
+    
+    def _broadcast_parameters(self, device_path: str, names: List[str]):
+        camera = self.controller.get_camera(device_path)
+        if not camera or not names or not camera.parameters_loaded:
+            return
+        states = {name: parameter_state(camera.parameters[name]) for name in names if name in camera.parameters}
+        self._broadcast({'event': "parameters", 'device': device_path, 'parameters': states})
+    
+    def _on_parameters_changed(self, device_path: str, names: List[str]):
+        """Parameter listener (control event thread)"""
+        self._loop.call_soon_threadsafe(self._broadcast_parameters, device_path, names)
+    
+    def _submit_locked(self, device_path: str, func: Callable, *args) -> concurrent.futures.Future:
+        """Run func from another thread, serialized with the clients' operations on the device"""
+        return asyncio.run_coroutine_threadsafe(self.controller.run_locked(device_path, func, *args), self._loop)
+    
+    def _on_profile_enforced(self, device_path: str, report):
+        """Enforcer callback (enforcer thread)"""
+        self._loop.call_soon_threadsafe(self._broadcast_parameters, device_path, report.written)
+    
+    def _on_device_event(self, event: str, device_path: str, camera):
+        """Device watcher listener (watcher thread)"""
+        self._loop.call_soon_threadsafe(self._handle_device_event, event, device_path)
+    
+    def _handle_device_event(self, event: str, device_path: str):
+        if event == "added":
+            asyncio.ensure_future(self.controller.enable_control_events(device_path))
+        self._broadcast({'event': event, 'device': device_path})
+
+async def serve(socket_path: Optional[str] = None, enforce_interval: Optional[float] = None,
+                **controller_options):
+    """Detect cameras and serve them until SIGINT/SIGTERM"""
+    controller = await AsyncCameraController.detect(**controller_options)
+    daemon = CameraDaemon(controller, socket_path, enforce_interval)
+    await daemon.start()
+    
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    try:
+        await stop.wait()
+    finally:
+        logger.info("Stopping camera daemon")
+        await daemon.stop()
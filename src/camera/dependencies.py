@@ -0,0 +1,91 @@
+"""
+Control Dependencies
+Which V4L2 controls lock others, and in what order to write them
+"""
+
+from typing import Any, Dict, List, Optional
+
+# Control -> mode controls that can make it inactive while in auto mode.
+# Both the classic uvcvideo names and the ones used by newer kernels are
+# listed; only the names a camera actually has matter.
+LOCKED_BY: Dict[str, List[str]] = {
+    'exposure_absolute': ['exposure_auto', 'auto_exposure'],
+    'exposure_time_absolute': ['exposure_auto', 'auto_exposure'],
+    'exposure_auto_priority': ['exposure_auto', 'auto_exposure'],
+    'exposure_dynamic_framerate': ['exposure_auto', 'auto_exposure'],
+    'iris_absolute': ['exposure_auto', 'auto_exposure'],
+    'brightness': ['auto_exposure'],
+    'contrast': ['auto_exposure'],
+    'saturation': ['auto_exposure'],
+    'focus_absolute': ['focus_auto', 'focus_automatic_continuous'],
+    'focus_relative': ['focus_auto', 'focus_automatic_continuous'],
+    'white_balance_temperature': ['white_balance_temperature_auto', 'white_balance_automatic'],
+    'red_balance': ['white_balance_temperature_auto', 'white_balance_automatic'],
+    'blue_balance': ['white_balance_temperature_auto', 'white_balance_automatic'],
+    'gain': ['gain_automatic', 'gain_auto'],
+    'hue': ['hue_auto', 'hue_automatic'],
+}
+
+# Value that puts a mode control into manual mode; everything else is 0.
+# V4L2 exposure modes are a menu: 0 auto, 1 manual, 2 shutter priority,
+# 3 aperture priority.
+MANUAL_VALUES: Dict[str, int] = {
+    'exposure_auto': 1,
+    'auto_exposure': 1,
+}
+
+def locking_controls(param_name: str, available: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Mode controls that may lock a parameter
+    
+    Args:
+        param_name: Parameter to look up
+        available: Parameters of the camera; if given, only names it has are returned
+    """
+    modes = LOCKED_BY.get(param_name, [])
+    if available is None:
+        return list(modes)
+    return [mode for mode in modes if mode in available]
+
+def manual_value(mode_name: str) -> int:
+    """Value that switches a mode control to manual"""
+    return MANUAL_VALUES.get(mode_name, 0)
+
+def write_batches(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Split values into batches that can be written one after the other
+    
+    A mode switched to manual is written in a batch before the controls it
+    locks, so their writes land while they are active. A mode switched to
+    auto goes after them: the manual values are stored while the camera
+    still accepts them. Controls without a dependency inside ``values`` share
+    the first batch. Order within a batch follows ``values``.
+    """
+    depth: Dict[str, int] = {}
+    
+    def resolve(name: str, visiting: frozenset) -> int:
+        if name in depth:
+            return depth[name]
+        level = 0
+        for other in values:
+            if other in visiting or not _must_precede(other, name, values):
+                continue
+            level = max(level, resolve(other, visiting | {name}) + 1)
+        depth[name] = level
+        return level
+    
+    batches: List[Dict[str, Any]] = []
+    for name, value in values.items():
+        level = resolve(name, frozenset())
+        while len(batches) <= level:
+            batches.append({})
+        batches[level][name] = value
+    return [batch for batch in batches if batch]
+
+def _must_precede(first: str, second: str, values: Dict[str, Any]) -> bool:
+    """Whether writing ``first`` has to happen before writing ``second``"""
+    if first in LOCKED_BY.get(second, []):
+        # Mode before the control it locks, when switching to manual
+        return values[first] == manual_value(first)
+    if second in LOCKED_BY.get(first, []):
+        # Control before its mode, when switching to auto
+        return values[second] != manual_value(second)
+    return False
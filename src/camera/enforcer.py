@@ -0,0 +1,262 @@
+"""
+Config Enforcer
+Keeps cameras at their enabled startup profile after resets, reconnects and suspend
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from camera.executor import CommandStats
+from camera.profile import ApplyReport, plan_profile, write_plan
+
+logger = logging.getLogger(__name__)
+
+class ConfigEnforcer:
+    """Watchdog re-applying startup profiles when the hardware drifts from them
+    
+    A background thread compares the values of every camera with an
+    enabled profile against it (one bulk read per camera) and writes only
+    the controls that drifted, in dependency-ordered batches. The check
+    interval doubles after every pass without drift, up to max_interval,
+    and drops back to interval when something drifted, so an idle system
+    costs one bulk read per camera and minute.
+    
+    A reconnect (device_added(), or on_device_event() as DeviceWatcher
+    listener) or resume from suspend checks the affected cameras right
+    away; the time until their profile is enforced again is recorded in
+    reapply_stats.
+    
+    With submit, each camera is checked and written where the application
+    serializes that device's other operations (e.g. the device worker of a
+    BackgroundController), so enforcement never interleaves with them;
+    cameras are then checked concurrently. A camera whose check is still
+    queued or running is skipped by later passes.
+    
+    Controls the application writes on purpose (see ignore()) and controls
+    whose write failed are left alone until the camera reconnects. The
+    callback is called as ``callback(device_path, report)`` after drifted
+    controls were written (from the enforcer thread, or from submit's
+    worker).
+    """
+    
+    DEFAULT_INTERVAL = 5.0
+    DEFAULT_MAX_INTERVAL = 60.0
+    
+    # Longest wait of a pass for submitted checks; later ones count in a later pass
+    CHECK_TIMEOUT = 30.0
+    
+    # Wall clock running ahead of the monotonic clock by more than this means suspend
+    SUSPEND_THRESHOLD = 5.0
+    
+    def __init__(self, controller, load_profiles: Callable[[], Dict[str, Dict[str, Any]]],
+                 interval: float = DEFAULT_INTERVAL, max_interval: float = DEFAULT_MAX_INTERVAL,
+                 callback: Optional[Callable[[str, ApplyReport], None]] = None,
+                 submit: Optional[Callable[..., Future]] = None):
+        """
+        Args:
+            controller: CameraController owning the cameras
+            load_profiles: Returns the enabled profiles by device path (see
+                config.startup.profiles_by_device); called once per pass
+            interval: Seconds between checks after drift or a reconnect
+            max_interval: Longest interval reached by backing off
+            callback: Called after drifted controls were re-applied
+            submit: Runs ``func(*args)`` for a device as ``submit(device_path,
+                func, *args)`` and returns a Future (e.g.
+                BackgroundController.submit_settled); default: run on the
+                enforcer thread
+        """
+        self.controller = controller
+        self.load_profiles = load_profiles
+        self.interval = interval
+        self.max_interval = max(interval, max_interval)
+        self.callback = callback
+        self.submit = submit
+        self.reapply_stats = CommandStats()  # Reconnect -> profile enforced again
+        self._ignored: Dict[str, Optional[Set[str]]] = {}  # None = whole camera
+        self._triggers: Dict[str, float] = {}
+        self._running: Dict[str, Future] = {}  # Submitted checks by device path
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def set_controller(self, controller):
+        """Switch to another controller (e.g. after a full refresh)"""
+        self.controller = controller
+    
+    def start(self):
+        """Start checking in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="camloader-enforcer", daemon=True)
+        self._thread.start()
+        logger.info(f"Enforcing startup profiles every {self.interval:g}-{self.max_interval:g} s")
+    
+    def stop(self, timeout: float = 2.0):
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def device_added(self, device_path: str):
+        """A camera (re)appeared: forget its exemptions and enforce its profile now"""
+        with self._lock:
+            self._ignored.pop(device_path, None)
+            self._triggers.setdefault(device_path, time.monotonic())
+        self._wake.set()
+    
+    def on_device_event(self, event: str, device_path: str, camera):
+        """DeviceWatcher listener"""
+        if event == "added":
+            self.device_added(device_path)
+        elif event == "removed":
+            with self._lock:
+                self._ignored.pop(device_path, None)
+    
+    def ignore(self, device_path: str, names: Optional[List[str]] = None):
+        """Stop enforcing controls (all if names is None) until the camera reconnects"""
+        with self._lock:
+            if names is None:
+                self._ignored[device_path] = None
+                return
+            ignored = self._ignored.setdefault(device_path, set())
+            if ignored is not None:
+                ignored.update(names)
+    
+    def stats(self) -> Dict:
+        """Re-apply latency after reconnects (see CommandStats.to_dict)"""
+        with self._lock:
+            return self.reapply_stats.to_dict()
+    
+    def _run(self):
+        wait = self.interval
+        while not self._stop_event.is_set():
+            wall, monotonic = time.time(), time.monotonic()
+            self._wake.wait(wait)
+            self._wake.clear()
+            if self._stop_event.is_set():
+                break
+            
+            with self._lock:
+                triggers, self._triggers = self._triggers, {}
+            if (time.time() - wall) - (time.monotonic() - monotonic) > self.SUSPEND_THRESHOLD:
+                logger.info("Resume from suspend detected, checking all cameras")
+                resumed = time.monotonic()
+                for device_path in self._load_profiles():
+                    triggers.setdefault(device_path, resumed)
+            
+            # Reconnects only need their own cameras checked
+            drifted = self.check(list(triggers) if triggers else None, triggers)
+            if drifted or triggers:
+                wait = self.interval
+            else:
+                wait = min(wait * 2, self.max_interval)
+    
+    def _load_profiles(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return self.load_profiles()
+        except Exception as e:
+            logger.warning(f"Config enforcement: failed to load startup profiles: {e}")
+            return {}
+    
+    def check(self, device_paths: Optional[List[str]] = None,
+              triggers: Optional[Dict[str, float]] = None) -> int:
+        """Re-apply drifted controls now
+        
+        Args:
+            device_paths: Cameras to check (default: every camera with an enabled profile)
+            triggers: Device path -> time.monotonic() of the reconnect that
+                caused the check; the re-apply latency is recorded for these
+        
+        Returns:
+            Number of cameras that had drifted
+        """
+        triggers = triggers or {}
+        submitted: Dict[str, Future] = {}
+        for device_path, values in self._load_profiles().items():
+            if device_paths is not None and device_path not in device_paths:
+                continue
+            if self._stop_event.is_set():
+                break
+            with self._lock:
+                previous = self._running.get(device_path)
+                if previous is not None and not previous.done():
+                    # Still queued behind other work on the device: check it again next pass
+                    if device_path in triggers:
+                        self._triggers.setdefault(device_path, triggers[device_path])
+                    continue
+            submitted[device_path] = self._submit(device_path, values, triggers.get(device_path))
+        
+        drifted = 0
+        deadline = time.monotonic() + self.CHECK_TIMEOUT
+        for device_path, future in submitted.items():
+            try:
+                if future.result(max(0.0, deadline - time.monotonic())):
+                    drifted += 1
+            except FutureTimeoutError:
+                logger.warning(f"Config enforcement for {device_path} is still waiting for the device")
+            except Exception as e:
+                logger.error(f"Config enforcement failed for {device_path}: {e}")
+        return drifted
+    
+    def _submit(self, device_path: str, values: Dict[str, Any], trigger: Optional[float]) -> Future:
+        """Start the check of one camera (through submit, if set)"""
+        if self.submit is None:
+            future = Future()
+            try:
+                future.set_result(self._enforce(device_path, values, trigger))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        
+        future = self.submit(device_path, self._enforce, device_path, values, trigger)
+        with self._lock:
+            self._running[device_path] = future
+        future.add_done_callback(lambda done: self._check_done(device_path, done))
+        return future
+    
+    def _check_done(self, device_path: str, future: Future):
+        with self._lock:
+            if self._running.get(device_path) is future:
+                del self._running[device_path]
+    
+    def _enforce(self, device_path: str, values: Dict[str, Any], trigger: Optional[float]) -> bool:
+        controller = self.controller
+        if not values or not controller.get_camera(device_path):
+            return False
+        with self._lock:
+            ignored = self._ignored.get(device_path, set())
+            if ignored is None:
+                return False
+            targets = {name: value for name, value in values.items() if name not in ignored}
+        
+        plan = plan_profile(controller, device_path, targets)
+        if trigger is None:
+            # Controls that could not be read are only written after a reconnect
+            for name in [name for name, (current, _) in plan.changes.items() if current is None]:
+                del plan.changes[name]
+        
+        failed = []
+        if plan.changes:
+            report = write_plan(controller, plan)
+            failed = [name for name in report.failed if name in plan.changes]
+            logger.info(f"Re-applied drifted controls on {device_path}: {', '.join(report.written) or 'none'}")
+            if failed:
+                # Not retried every pass (e.g. inactive controls), a reconnect tries again
+                logger.warning(f"Failed to re-apply {', '.join(failed)} on {device_path}, not enforcing them")
+                self.ignore(device_path, failed)
+            if self.callback:
+                self.callback(device_path, report)
+        
+        if trigger is not None:
+            elapsed_ms = (time.monotonic() - trigger) * 1000
+            with self._lock:
+                self.reapply_stats.record(elapsed_ms, "failed" if failed else "ok")
+            logger.info(f"Startup profile of {device_path} enforced {elapsed_ms:.0f} ms after reconnect "
+                        f"({len(plan.changes)} control(s) written)")
+        return bool(plan.changes)
@@ -0,0 +1,119 @@
+"""
+Control Events
+Background delivery of V4L2 control change events (value, flags, range)
+"""
+
+import logging
+import select
+import threading
+from typing import Callable, Dict, List, Optional
+
+from camera.v4l2_ioctl import ControlEventSubscription, V4L2IoctlBackend
+
+logger = logging.getLogger(__name__)
+
+class ControlEventMonitor:
+    """Watches control events of several devices in one thread
+    
+    ``callback(device_path, events)`` receives the event dicts returned by
+    ControlEventSubscription.read(). It is called from the monitor thread,
+    or from the caller's thread for ``drain()``.
+    """
+    
+    POLL_TIMEOUT = 0.5
+    
+    def __init__(self, backend: V4L2IoctlBackend, callback: Callable[[str, List[Dict]], None]):
+        self.backend = backend
+        self.callback = callback
+        self._subscriptions: Dict[str, ControlEventSubscription] = {}
+        self._lock = threading.Lock()  # Guards subscriptions and DQEVENT
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+    
+    def watch(self, device_path: str) -> bool:
+        """Subscribe to all controls of a device; False if events are unsupported"""
+        with self._lock:
+            if device_path in self._subscriptions:
+                return True
+        try:
+            subscription = self.backend.subscribe_control_events(device_path)
+        except OSError as e:
+            logger.info(f"Control events unavailable on {device_path}: {e}")
+            return False
+        
+        with self._lock:
+            if device_path in self._subscriptions:
+                subscription.close()  # Lost a race with another watch()
+            else:
+                self._subscriptions[device_path] = subscription
+        self.start()
+        return True
+    
+    def unwatch(self, device_path: str):
+        with self._lock:
+            subscription = self._subscriptions.pop(device_path, None)
+            if subscription:
+                subscription.close()
+    
+    def is_watching(self, device_path: str) -> bool:
+        with self._lock:
+            return device_path in self._subscriptions
+    
+    def drain(self, device_path: str) -> Optional[List[Dict]]:
+        """Deliver pending events of one device right away
+        
+        The kernel queues control events before the ioctl that caused them
+        returns, so draining after a write observes its side effects.
+        Returns the delivered events, or None if the device is not watched.
+        """
+        with self._lock:
+            subscription = self._subscriptions.get(device_path)
+            if subscription is None:
+                return None
+            events = subscription.read()
+        if events:
+            self.callback(device_path, events)
+        return events
+    
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="camloader-ctrl-events", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 2.0):
+        """Stop the monitor thread and close all subscriptions"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            for subscription in self._subscriptions.values():
+                subscription.close()
+            self._subscriptions.clear()
+    
+    def _run(self):
+        while not self._stop_event.is_set():
+            with self._lock:
+                subscriptions = list(self._subscriptions.values())
+            if not subscriptions:
+                self._stop_event.wait(self.POLL_TIMEOUT)
+                continue
+            
+            try:
+                # Pending V4L2 events are signalled as an exceptional condition
+                _, _, ready = select.select([], [], subscriptions, self.POLL_TIMEOUT)
+            except (OSError, ValueError):
+                continue  # A subscription was closed while waiting
+            
+            for subscription in ready:
+                with self._lock:
+                    if subscription.closed:
+                        continue
+                    events = subscription.read()
+                if events:
+                    try:
+                        self.callback(subscription.device_path, events)
+                    except Exception as e:
+                        logger.error(f"Control event handler failed for {subscription.device_path}: {e}")
@@ -0,0 +1,242 @@
+"""
+Command Executor
+Runs external tools (v4l2-ctl) and keeps per-command latency statistics
+"""
+
+import asyncio
+import bisect
+import logging
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from utils.profiler import profile_begin, profile_end
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+def clean_environment() -> Dict[str, str]:
+    """Get environment with LD_LIBRARY_PATH cleaned for external commands.
+    
+    PyInstaller sets LD_LIBRARY_PATH to its temp directory, which contains
+    bundled libraries (e.g. libstdc++.so.6) that may be older than what
+    system tools like v4l2-ctl require. We restore the original
+    LD_LIBRARY_PATH so external commands use system libraries.
+    """
+    env = os.environ.copy()
+    # PyInstaller saves the original value in *_ORIG
+    orig = env.get('LD_LIBRARY_PATH_ORIG')
+    if orig is not None:
+        env['LD_LIBRARY_PATH'] = orig
+    elif 'LD_LIBRARY_PATH' in env:
+        del env['LD_LIBRARY_PATH']
+    return env
+
+def command_type(command: List[str]) -> str:
+    """Statistics key for a command, e.g. "v4l2-ctl --set-ctrl"
+    
+    The program name plus its first option, skipping the device selector.
+    """
+    if not command:
+        return "<empty>"
+    program = os.path.basename(command[0])
+    args = iter(command[1:])
+    for arg in args:
+        if arg in ("--device", "-d"):
+            next(args, None)
+        elif arg.startswith("-") and not arg.startswith("--device="):
+            return f"{program} {arg.split('=', 1)[0]}"
+    return program
+
+class CommandStats:
+    """Counters and latency distribution for one command type"""
+    
+    # Recent samples kept for percentiles
+    SAMPLE_WINDOW = 1024
+    
+    def __init__(self):
+        self.count = 0
+        self.failures = 0  # Non-zero exit status
+        self.timeouts = 0
+        self.errors = 0  # Could not be started
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._samples = deque(maxlen=self.SAMPLE_WINDOW)
+    
+    def record(self, elapsed_ms: float, outcome: str):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self._samples.append(elapsed_ms)
+        if outcome == "failed":
+            self.failures += 1
+        elif outcome == "timeout":
+            self.timeouts += 1
+        elif outcome == "error":
+            self.errors += 1
+    
+    def percentile(self, percent: float) -> float:
+        """Latency percentile in ms over the recent sample window"""
+        if not self._samples:
+            return 0.0
+        samples = sorted(self._samples)
+        index = min(len(samples) - 1, int(round(percent / 100.0 * (len(samples) - 1))))
+        return samples[index]
+    
+    def to_dict(self) -> Dict:
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            'count': self.count,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(self.percentile(50), 3),
+            'p99_ms': round(self.percentile(99), 3),
+            'max_ms': round(self.max_ms, 3),
+            'histogram': {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+class CommandExecutor:
+    """Runs external commands with a precomputed environment
+    
+    Every call is timed and recorded per command type (see command_type).
+    Thread-safe; detection probes several devices concurrently.
+    """
+    
+    DEFAULT_TIMEOUT = 10
+    
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, env: Optional[Dict[str, str]] = None):
+        self.timeout = timeout
+        self.env = env if env is not None else clean_environment()
+        self._stats: Dict[str, CommandStats] = {}
+        self._lock = threading.Lock()
+    
+    def run(self, command: List[str], timeout: Optional[float] = None) -> Tuple[bool, str]:
+        """Run a command and return success status and stdout"""
+        outcome = "ok"
+        output = ""
+        span = profile_begin(command_type(command), "command", command=" ".join(command))
+        start = time.perf_counter()
+        try:
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                timeout=timeout or self.timeout,
+                env=self.env
+            )
+            output = result.stdout
+            if result.returncode != 0:
+                outcome = "failed"
+                if result.stderr:
+                    logger.debug(f"Command stderr: {' '.join(command)}: {result.stderr.strip()}")
+        except subprocess.TimeoutExpired:
+            outcome = "timeout"
+            logger.error(f"Command timeout: {' '.join(command)}")
+        except FileNotFoundError:
+            outcome = "error"
+            logger.error(f"Command not found: {command[0]}")
+        except Exception as e:
+            outcome = "error"
+            logger.error(f"Command failed: {' '.join(command)}, Error: {e}")
+        self._record(command, (time.perf_counter() - start) * 1000.0, outcome)
+        profile_end(span, outcome=outcome)
+        return outcome == "ok", output
+    
+    async def run_async(self, command: List[str], timeout: Optional[float] = None) -> Tuple[bool, str]:
+        """Like run(), but awaits the command via asyncio.create_subprocess_exec"""
+        outcome = "ok"
+        output = ""
+        span = profile_begin(command_type(command), "command", command=" ".join(command))
+        start = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=self.env
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout or self.timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise
+            output = stdout.decode(errors="replace")
+            if process.returncode != 0:
+                outcome = "failed"
+                if stderr:
+                    logger.debug(f"Command stderr: {' '.join(command)}: {stderr.decode(errors='replace').strip()}")
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            logger.error(f"Command timeout: {' '.join(command)}")
+        except FileNotFoundError:
+            outcome = "error"
+            logger.error(f"Command not found: {command[0]}")
+        except Exception as e:
+            outcome = "error"
+            logger.error(f"Command failed: {' '.join(command)}, Error: {e}")
+        self._record(command, (time.perf_counter() - start) * 1000.0, outcome)
+        profile_end(span, outcome=outcome)
+        return outcome == "ok", output
+    
+    def _record(self, command: List[str], elapsed_ms: float, outcome: str):
+        key = command_type(command)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = CommandStats()
+            stats.record(elapsed_ms, outcome)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{key} took {elapsed_ms:.1f} ms ({outcome})")
+    
+    def stats(self) -> Dict[str, Dict]:
+        """Snapshot of the statistics, keyed by command type"""
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in sorted(self._stats.items())}
+    
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+    
+    def format_stats(self) -> str:
+        """Human-readable statistics table"""
+        stats = self.stats()
+        if not stats:
+            return "No external commands run"
+        
+        width = max(len(key) for key in stats)
+        lines = [f"{'command':<{width}}  {'count':>6} {'fail':>5} {'tmo':>4} "
+                 f"{'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'total ms':>9}"]
+        for key, entry in stats.items():
+            lines.append(
+                f"{key:<{width}}  {entry['count']:>6} {entry['failures'] + entry['errors']:>5} "
+                f"{entry['timeouts']:>4} {entry['p50_ms']:>8.1f} {entry['p99_ms']:>8.1f} "
+                f"{entry['max_ms']:>8.1f} {entry['total_ms']:>9.1f}"
+            )
+        return "\n".join(lines)
+
+_default_executor: Optional[CommandExecutor] = None
+_default_lock = threading.Lock()
+
+def get_executor() -> CommandExecutor:
+    """Process-wide executor shared by all controllers
+    
+    Sharing one instance keeps the statistics across camera list refreshes.
+    """
+    global _default_executor
+    with _default_lock:
+        if _default_executor is None:
+            _default_executor = CommandExecutor()
+        return _default_executor
@@ -0,0 +1,229 @@
+"""
+Device Identity
+Stable identification of V4L2 device nodes from sysfs
+"""
+
+import logging
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SYSFS_VIDEO4LINUX = "/sys/class/video4linux"
+V4L_BY_ID = "/dev/v4l/by-id"
+
+def _read_attr(directory: Path, name: str) -> Optional[str]:
+    """Read a sysfs attribute, returning None if it does not exist"""
+    try:
+        return (directory / name).read_text().strip()
+    except OSError:
+        return None
+
+def _find_usb_device_dir(device_dir: Path) -> Optional[Path]:
+    """Walk up from a video interface to the USB device carrying idVendor"""
+    for candidate in [device_dir] + list(device_dir.parents):
+        if (candidate / "idVendor").exists():
+            return candidate
+        if candidate.name in ("devices", "sys", ""):
+            break
+    return None
+
+def read_device_info(device_path: str, sysfs_root: str = SYSFS_VIDEO4LINUX) -> Dict[str, Optional[str]]:
+    """Collect identity attributes of a /dev/videoN node from sysfs
+    
+    Returns a dict with ``node`` (videoN), ``index`` (node index within the
+    physical device), ``bus_path`` (e.g. USB port path ``1-1.2``),
+    ``vendor_id``, ``product_id`` and ``serial``. Missing values are None.
+    """
+    node = os.path.basename(device_path)
+    node_dir = Path(sysfs_root) / node
+    info = {
+        'node': node,
+        'index': _read_attr(node_dir, "index"),
+        'bus_path': None,
+        'vendor_id': None,
+        'product_id': None,
+        'serial': None,
+    }
+    
+    try:
+        device_dir = (node_dir / "device").resolve(strict=True)
+    except (OSError, RuntimeError):
+        return info
+    
+    usb_dir = _find_usb_device_dir(device_dir)
+    if usb_dir:
+        info['bus_path'] = usb_dir.name
+        info['vendor_id'] = _read_attr(usb_dir, "idVendor")
+        info['product_id'] = _read_attr(usb_dir, "idProduct")
+        info['serial'] = _read_attr(usb_dir, "serial")
+    else:
+        # Platform / PCI devices: the resolved device path is stable per slot
+        info['bus_path'] = device_dir.name
+    
+    return info
+
+def read_device_identity(device_path: str, sysfs_root: str = SYSFS_VIDEO4LINUX) -> Optional[str]:
+    """Build a stable identity string for a device node
+    
+    The identity combines USB VID:PID, serial number, bus path and node index
+    (``046d:0825:ABC123@1-1.2#0``), so it survives /dev/videoN renumbering but
+    changes when a different camera is plugged into the same port.
+    Returns None when the node has no sysfs entry.
+    """
+    info = read_device_info(device_path, sysfs_root)
+    if not info['bus_path']:
+        return None
+    
+    identity = info['bus_path']
+    if info['vendor_id'] and info['product_id']:
+        identity = f"{info['vendor_id']}:{info['product_id']}:{info['serial'] or ''}@{identity}"
+    return f"{identity}#{info['index'] or '0'}"
+
+def _by_id_link(device_path: str, by_id_dir: str) -> Optional[str]:
+    """Name of the udev by-id link pointing at a device node, if any"""
+    try:
+        target = os.path.realpath(device_path)
+        for name in sorted(os.listdir(by_id_dir)):
+            if os.path.realpath(os.path.join(by_id_dir, name)) == target:
+                return name
+    except OSError:
+        pass
+    return None
+
+def read_stable_id(device_path: str, sysfs_root: str = SYSFS_VIDEO4LINUX,
+                   by_id_dir: str = V4L_BY_ID, qualify: bool = False) -> Optional[str]:
+    """Stable key of the camera behind a device node, used to key its configurations
+    
+    Unlike read_device_identity, a camera with a serial number keeps its
+    key on any USB port. In order of preference:
+    
+    - ``usb/046d:0825:ABC123#0``: VID:PID, serial number and node index
+      (the attributes udev builds the /dev/v4l/by-id link from)
+    - ``usb/046d:0825@1-1.2#0``: cameras without serial number are told
+      apart by their USB port
+    - ``bus/0000:00:14.0#0``: platform / PCI devices by their slot
+    - ``by-id/<link name>``: the udev by-id link, where sysfs is not readable
+    
+    With qualify, cameras with serial number get their USB port added
+    (``usb/046d:0825:ABC123@1-1.2#0``); stable_ids uses this for identical
+    cameras sharing a serial number. Returns None if none of them is
+    available.
+    """
+    info = read_device_info(device_path, sysfs_root)
+    index = info['index'] or '0'
+    if info['vendor_id'] and info['product_id']:
+        usb_id = f"{info['vendor_id']}:{info['product_id']}"
+        if info['serial'] and qualify:
+            return f"usb/{usb_id}:{info['serial']}@{info['bus_path']}#{index}"
+        if info['serial']:
+            return f"usb/{usb_id}:{info['serial']}#{index}"
+        return f"usb/{usb_id}@{info['bus_path']}#{index}"
+    if info['bus_path']:
+        return f"bus/{info['bus_path']}#{index}"
+    
+    link = _by_id_link(device_path, by_id_dir)
+    return f"by-id/{link}" if link else None
+
+def _colliding(ids: Dict[str, Optional[str]]) -> List[str]:
+    """Device paths whose stable ID is shared with another device path"""
+    counts = Counter(stable_id for stable_id in ids.values() if stable_id)
+    return [path for path, stable_id in ids.items() if stable_id and counts[stable_id] > 1]
+
+def stable_ids(device_paths: Iterable[str] = (), dev_root: str = "/dev", sysfs_root: str = SYSFS_VIDEO4LINUX,
+               by_id_dir: str = V4L_BY_ID) -> Dict[str, Optional[str]]:
+    """Stable IDs of the present video nodes (and device_paths), unique among them
+    
+    Identical cameras, e.g. of a model reporting one fixed serial number,
+    would share a read_stable_id key; they get port-qualified IDs instead.
+    Collisions are checked against every present node, so the result for
+    a device does not depend on which other devices were asked for. Nodes
+    whose ID is still ambiguous map to None (keyed by device path).
+    """
+    paths = list(dict.fromkeys(list(device_paths) + list_video_nodes(dev_root)))
+    ids = {path: read_stable_id(path, sysfs_root, by_id_dir) for path in paths}
+    for path in _colliding(ids):
+        ids[path] = read_stable_id(path, sysfs_root, by_id_dir, qualify=True)
+    for path in _colliding(ids):
+        logger.warning(f"Stable ID {ids[path]} of {path} is not unique, keying it by device path")
+        ids[path] = None
+    return ids
+
+def find_device_paths(keys: Iterable[str], dev_root: str = "/dev",
+                      sysfs_root: str = SYSFS_VIDEO4LINUX, by_id_dir: str = V4L_BY_ID) -> Dict[str, str]:
+    """Current device node of each camera key (stable ID or device path)
+    
+    Device paths map to themselves; stable IDs are looked up among the
+    present video nodes (sysfs only, no device is opened). Keys of cameras
+    that are not connected are left out.
+    """
+    paths = {}
+    wanted = set()
+    for key in keys:
+        if key.startswith("/"):
+            paths[key] = key
+        else:
+            wanted.add(key)
+    
+    if wanted:
+        for node, stable_id in stable_ids((), dev_root, sysfs_root, by_id_dir).items():
+            if stable_id in wanted:
+                paths[stable_id] = node
+    return paths
+
+def camera_label(camera) -> str:
+    """Text shown for a camera in camera lists"""
+    label = str(camera)
+    if not camera.is_available:
+        label += " [No Preview]"
+    return label
+
+class CameraIndex:
+    """Looks up cameras by stable ID, device path or display label
+    
+    Built from a camera list whenever it changes. The labels are the
+    ones shown in the camera list, so a selected entry maps straight back
+    to its camera.
+    """
+    
+    def __init__(self, cameras: Iterable = (), label: Callable[[object], str] = camera_label):
+        self.cameras = list(cameras)
+        self._label = label
+        self._by_key: Dict[str, object] = {}
+        self._by_label: Dict[str, object] = {}
+        for camera in self.cameras:
+            self._by_key[camera.device_path] = camera
+            if camera.stable_id:
+                self._by_key.setdefault(camera.stable_id, camera)
+            self._by_label[label(camera)] = camera
+    
+    def get(self, key: str):
+        """Camera by stable ID or device path, or None"""
+        return self._by_key.get(key)
+    
+    def by_label(self, label: str):
+        """Camera shown with a label, or None"""
+        return self._by_label.get(label)
+    
+    def label(self, camera) -> str:
+        return self._label(camera)
+    
+    def labels(self) -> List[str]:
+        """Labels in camera list order"""
+        return [self._label(camera) for camera in self.cameras]
+    
+    def __len__(self) -> int:
+        return len(self.cameras)
+
+def list_video_nodes(dev_root: str = "/dev") -> List[str]:
+    """List /dev/videoN nodes sorted by their number"""
+    nodes = []
+    try:
+        for entry in os.listdir(dev_root):
+            if entry.startswith("video") and entry[5:].isdigit():
+                nodes.append(entry)
+    except OSError as e:
+        logger.debug(f"Cannot list {dev_root}: {e}")
+    return [os.path.join(dev_root, entry) for entry in sorted(nodes, key=lambda n: int(n[5:]))]
@@ -0,0 +1,221 @@
+"""
+Profile Apply
+Diff-based application of stored parameter values (profiles) to a camera
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from camera.dependencies import write_batches
+
+logger = logging.getLogger(__name__)
+
+# Multi-camera apply (startup configurations): cameras at once, seconds per camera
+DEFAULT_APPLY_WORKERS = 8
+DEFAULT_APPLY_TIMEOUT = 10.0
+
+class ApplyPlan:
+    """Changes needed to bring a camera to a profile
+    
+    Attributes:
+        device_path: Camera device path
+        unchanged: Parameters already at their target value
+        changes: Parameter name -> (current value, or None if unreadable, target value)
+        unknown: Profile entries the camera does not have
+    """
+    
+    def __init__(self, device_path: str):
+        self.device_path = device_path
+        self.unchanged: List[str] = []
+        self.changes: Dict[str, Tuple[Any, Any]] = {}
+        self.unknown: List[str] = []
+    
+    @classmethod
+    def for_missing_camera(cls, device_path: str, values: Dict[str, Any]) -> 'ApplyPlan':
+        """Plan for a camera that is not connected: every entry is unknown"""
+        plan = cls(device_path)
+        plan.unknown = list(values)
+        return plan
+    
+    @property
+    def targets(self) -> Dict[str, Any]:
+        """Values that have to be written"""
+        return {name: target for name, (current, target) in self.changes.items()}
+    
+    @property
+    def batches(self) -> List[Dict[str, Any]]:
+        """Targets split into write batches, mode switches ordered around the controls they lock"""
+        return write_batches(self.targets)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'device_path': self.device_path,
+            'unchanged': self.unchanged,
+            'changes': {name: {'current': current, 'target': target}
+                        for name, (current, target) in self.changes.items()},
+            'unknown': self.unknown,
+            'batches': [list(batch) for batch in self.batches],
+        }
+
+class ApplyReport:
+    """Outcome of applying a profile (or of a dry run, which writes nothing)"""
+    
+    def __init__(self, plan: ApplyPlan, results: Optional[Dict[str, bool]] = None):
+        self.plan = plan
+        self.dry_run = results is None
+        self.unchanged = list(plan.unchanged)
+        self.written = [name for name, ok in (results or {}).items() if ok]
+        self.failed = list(plan.unknown) + [name for name, ok in (results or {}).items() if not ok]
+    
+    @property
+    def device_path(self) -> str:
+        return self.plan.device_path
+    
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+    
+    def summary(self) -> str:
+        if self.dry_run:
+            return (f"{len(self.unchanged)} unchanged / {len(self.plan.changes)} to write / "
+                    f"{len(self.plan.unknown)} unknown")
+        return f"{len(self.unchanged)} unchanged / {len(self.written)} written / {len(self.failed)} failed"
+    
+    def to_dict(self) -> Dict:
+        report = {
+            'device_path': self.device_path,
+            'dry_run': self.dry_run,
+            'unchanged': self.unchanged,
+            'written': self.written,
+            'failed': self.failed,
+        }
+        if self.dry_run:
+            report['plan'] = self.plan.to_dict()
+        return report
+
+class ApplySummary:
+    """Aggregated outcome of applying profiles to several cameras at once
+    
+    Attributes:
+        reports: Device path -> report of each camera that finished
+        errors: Device path -> error of each camera that failed or timed out
+        elapsed_ms: Wall time of the whole apply (set by finish())
+    """
+    
+    def __init__(self):
+        self.reports: Dict[str, ApplyReport] = {}
+        self.errors: Dict[str, str] = {}
+        self.elapsed_ms = 0.0
+        self._started = time.perf_counter()
+    
+    def add(self, device_path: str, outcome: Union[ApplyReport, BaseException]):
+        if isinstance(outcome, ApplyReport):
+            self.reports[device_path] = outcome
+        else:
+            self.errors[device_path] = str(outcome) or type(outcome).__name__
+    
+    def finish(self) -> 'ApplySummary':
+        self.elapsed_ms = (time.perf_counter() - self._started) * 1000
+        return self
+    
+    @property
+    def device_paths(self) -> List[str]:
+        return list(self.reports) + list(self.errors)
+    
+    @property
+    def ok(self) -> bool:
+        return not self.errors and all(report.ok for report in self.reports.values())
+    
+    def counts(self, device_path: str) -> Dict[str, int]:
+        """Controls applied (or to apply, in a dry run), skipped as unchanged and failed"""
+        report = self.reports.get(device_path)
+        if report is None:
+            return {'applied': 0, 'skipped': 0, 'failed': 0}
+        applied = len(report.plan.changes) if report.dry_run else len(report.written)
+        return {'applied': applied, 'skipped': len(report.unchanged), 'failed': len(report.failed)}
+    
+    def summary(self) -> str:
+        totals = {'applied': 0, 'skipped': 0, 'failed': 0}
+        for device_path in self.reports:
+            for key, count in self.counts(device_path).items():
+                totals[key] += count
+        text = (f"{len(self.reports) + len(self.errors)} camera(s): {totals['applied']} applied / "
+                f"{totals['skipped']} skipped / {totals['failed']} failed")
+        if self.errors:
+            text += f", {len(self.errors)} camera(s) without result"
+        return f"{text} in {self.elapsed_ms:.0f} ms"
+    
+    def camera_dict(self, device_path: str) -> Dict:
+        report = self.reports.get(device_path)
+        if report is not None:
+            entry = report.to_dict()
+        else:
+            entry = {'device_path': device_path, 'error': self.errors[device_path]}
+        entry['counts'] = self.counts(device_path)
+        return entry
+    
+    def to_dict(self) -> Dict:
+        return {
+            'ok': self.ok,
+            'elapsed_ms': round(self.elapsed_ms, 1),
+            'summary': self.summary(),
+            'cameras': {device_path: self.camera_dict(device_path) for device_path in self.device_paths},
+        }
+
+def build_plan(camera, values: Dict[str, Any], current: Dict[str, Any]) -> ApplyPlan:
+    """Diff profile values against the current values of a camera
+    
+    Args:
+        camera: CameraDevice the profile is meant for
+        values: Target values by parameter name
+        current: Values read from the device; missing entries count as changed
+    """
+    plan = ApplyPlan(camera.device_path)
+    for name, value in values.items():
+        if name not in camera.parameters:
+            plan.unknown.append(name)
+            continue
+        target = int(value) if isinstance(value, bool) else value
+        if name in current and current[name] == target:
+            plan.unchanged.append(name)
+        else:
+            plan.changes[name] = (current.get(name), target)
+    return plan
+
+def plan_profile(controller, device_path: str, values: Dict[str, Any]) -> ApplyPlan:
+    """Read the current values in bulk and diff them against the profile"""
+    camera = controller.get_camera(device_path)
+    if not camera:
+        return ApplyPlan.for_missing_camera(device_path, values)
+    
+    known = [name for name in values if name in camera.parameters]
+    current = controller.get_parameters(device_path, known) if known else {}
+    return build_plan(camera, values, current)
+
+def apply_profile(controller, device_path: str, values: Dict[str, Any], dry_run: bool = False) -> ApplyReport:
+    """Write only the profile values that differ from the device's current values
+    
+    Changes are written in dependency order (see camera.dependencies), one
+    round-trip per batch: usually one, two when a mode switch is involved.
+    
+    Args:
+        controller: CameraController owning the camera
+        device_path: Camera device path
+        values: Target values by parameter name
+        dry_run: Only read and diff; return the plan without writing anything
+    """
+    plan = plan_profile(controller, device_path, values)
+    if dry_run:
+        return ApplyReport(plan)
+    
+    report = write_plan(controller, plan)
+    logger.info(f"Applied profile to {device_path}: {report.summary()}")
+    return report
+
+def write_plan(controller, plan: ApplyPlan) -> ApplyReport:
+    """Write a plan's changes batch by batch (see apply_profile)"""
+    results = {}
+    for batch in plan.batches:
+        results.update(controller.set_parameters(plan.device_path, batch))
+    return ApplyReport(plan, results)
@@ -0,0 +1,301 @@
+"""
+Remote Camera Controller
+CameraController-compatible client of a camloader daemon (see camera.daemon)
+"""
+
+import itertools
+import json
+import logging
+import socket
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from camera.controller import CameraDevice, V4L2Parameter
+from camera.daemon import default_socket_path, encode_message
+from camera.dependencies import locking_controls
+from camera.executor import CommandExecutor, get_executor
+
+logger = logging.getLogger(__name__)
+
+class DaemonError(Exception):
+    """A request was rejected by the daemon"""
+
+class RemoteCameraController:
+    """Drives cameras through a camloader daemon instead of opening them itself
+    
+    Offers the part of the CameraController interface the GUI uses.
+    Cameras are CameraDevice objects whose parameters are fetched from the
+    daemon on first access. Changes pushed by the daemon (writes of other
+    clients, driver control events) update them and are passed on to
+    parameter listeners; hotplug events go to device listeners, which are
+    called like DeviceWatcher listeners. Both are called from the reader
+    thread.
+    
+    Backup values (``original_value``) are kept in this process, so
+    several clients can each restore their own backup.
+    """
+    
+    # Longest wait for a daemon response (seconds)
+    REQUEST_TIMEOUT = 15.0
+    
+    def __init__(self, socket_path: Optional[str] = None,
+                 on_camera_found: Optional[Callable[['RemoteCameraController', CameraDevice], None]] = None,
+                 executor: Optional[CommandExecutor] = None):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.cameras: Dict[str, CameraDevice] = {}
+        self.executor = executor or get_executor()  # Local commands only; see daemon "stats"
+        self.probe_workers = None
+        
+        self._parameter_listeners: List[Callable[[str, List[str]], None]] = []
+        self._device_listeners: List[Callable[[str, str, object], None]] = []
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._closed = False
+        
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(str(self.socket_path))
+        self._reader = threading.Thread(target=self._read_loop, name="camloader-remote", daemon=True)
+        self._reader.start()
+        logger.info(f"Connected to camloader daemon at {self.socket_path}")
+        
+        self.request('subscribe')
+        for info in self.request('list'):
+            camera = self._camera_from_info(info)
+            self.cameras[camera.device_path] = camera
+            if on_camera_found:
+                on_camera_found(self, camera)
+    
+    def request(self, op: str, **fields) -> Any:
+        """Send one request and wait for its result
+        
+        Raises:
+            DaemonError: The daemon answered with an error
+            ConnectionError: The connection is closed or was lost
+            concurrent.futures.TimeoutError: No answer within REQUEST_TIMEOUT
+        """
+        if self._closed:
+            raise ConnectionError("Not connected to the camloader daemon")
+        request_id = next(self._ids)
+        future: Future = Future()
+        self._pending[request_id] = future
+        try:
+            with self._send_lock:
+                self._sock.sendall(encode_message(dict(fields, id=request_id, op=op)))
+            response = future.result(self.REQUEST_TIMEOUT)
+        finally:
+            self._pending.pop(request_id, None)
+        if not response.get('ok'):
+            raise DaemonError(response.get('error', "Unknown error"))
+        return response.get('result')
+    
+    def _read_loop(self):
+        try:
+            with self._sock.makefile('rb') as stream:
+                for line in stream:
+                    message = json.loads(line)
+                    if 'event' in message:
+                        self._handle_event(message)
+                        continue
+                    future = self._pending.get(message.get('id'))
+                    if future:
+                        future.set_result(message)
+        except (OSError, ValueError) as e:
+            if not self._closed:
+                logger.warning(f"Connection to camloader daemon failed: {e}")
+        finally:
+            if not self._closed:
+                logger.warning("Connection to camloader daemon closed")
+            self._closed = True
+            for future in list(self._pending.values()):
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection to the camloader daemon lost"))
+    
+    def _handle_event(self, message: Dict):
+        device_path = message.get('device')
+        event = message['event']
+        if event == "parameters":
+            camera = self.cameras.get(device_path)
+            if not camera or not camera.parameters_loaded:
+                return
+            changed = []
+            for name, state in message.get('parameters', {}).items():
+                param = camera.parameters.get(name)
+                if param:
+                    param.value = state['value']
+                    param.min_val = state.get('min_val', param.min_val)
+                    param.max_val = state.get('max_val', param.max_val)
+                    param.update_flags(state.get('flags', []))
+                    changed.append(name)
+            if changed:
+                self._notify_parameters_changed(device_path, changed)
+        elif event == "added":
+            # Requests wait for this thread, so ask for the camera elsewhere
+            threading.Thread(target=self._add_remote_camera, args=(device_path,),
+                             name="camloader-remote-add", daemon=True).start()
+        elif event == "removed":
+            camera = self.cameras.pop(device_path, None)
+            if camera:
+                self._notify_device_listeners("removed", device_path, camera)
+    
+    def _add_remote_camera(self, device_path: str):
+        try:
+            infos = self.request('list')
+        except Exception as e:
+            logger.warning(f"Failed to fetch new camera {device_path} from daemon: {e}")
+            return
+        for info in infos:
+            if info['device_path'] == device_path and device_path not in self.cameras:
+                camera = self._camera_from_info(info)
+                self.cameras[device_path] = camera
+                self._notify_device_listeners("added", device_path, camera)
+    
+    def _camera_from_info(self, info: Dict) -> CameraDevice:
+        camera = CameraDevice(info['device_path'], info['name'])
+        camera.is_available = info.get('is_available', True)
+        camera.formats = info.get('formats', [])
+        camera.stable_id = info.get('stable_id')
+        camera.set_parameter_loader(self._load_parameters)
+        return camera
+    
+    def _load_parameters(self, camera: CameraDevice):
+        """Parameter loader: fetch control metadata and values from the daemon"""
+        try:
+            states = self.request('describe', device=camera.device_path)
+        except Exception as e:
+            logger.error(f"Failed to load parameters of {camera.device_path} from daemon: {e}")
+            return
+        for name, state in states.items():
+            camera.parameters[name] = V4L2Parameter.from_dict(state)
+    
+    def get_cameras(self) -> List[CameraDevice]:
+        return list(self.cameras.values())
+    
+    def get_camera(self, device_path: str) -> Optional[CameraDevice]:
+        """Get camera by device path or stable ID"""
+        camera = self.cameras.get(device_path)
+        if camera is None and not device_path.startswith("/"):
+            camera = next((c for c in self.cameras.values() if c.stable_id == device_path), None)
+        return camera
+    
+    def set_parameter(self, device_path: str, param_name: str, value: Any) -> bool:
+        return self.set_parameters(device_path, {param_name: value}).get(param_name, False)
+    
+    def set_parameters(self, device_path: str, values: Dict[str, Any]) -> Dict[str, bool]:
+        """Write a batch of values through the daemon (see CameraController.set_parameters)"""
+        camera = self.cameras.get(device_path)
+        values = {name: int(value) if isinstance(value, bool) else value for name, value in values.items()}
+        if not camera:
+            logger.error(f"Camera not found: {device_path}")
+            return {name: False for name in values}
+        try:
+            results = self.request('set', device=device_path, values=values)
+        except Exception as e:
+            logger.error(f"Failed to set parameters of {device_path} via daemon: {e}")
+            return {name: False for name in values}
+        for name, ok in results.items():
+            if ok and name in camera.parameters:
+                camera.parameters[name].value = values[name]
+        return results
+    
+    def get_parameter(self, device_path: str, param_name: str) -> Optional[Any]:
+        return self.get_parameters(device_path, [param_name]).get(param_name)
+    
+    def get_parameters(self, device_path: str, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Read current values through the daemon (see CameraController.get_parameters)"""
+        camera = self.cameras.get(device_path)
+        if not camera:
+            return {}
+        try:
+            values = self.request('get', device=device_path, names=names)
+        except Exception as e:
+            logger.error(f"Failed to read parameters of {device_path} via daemon: {e}")
+            return {}
+        for name, value in values.items():
+            if name in camera.parameters:
+                camera.parameters[name].value = value
+        return values
+    
+    def backup_parameters(self, device_path: str) -> bool:
+        """Remember the current values as original values (in this process)"""
+        camera = self.cameras.get(device_path)
+        if not camera or not self.get_parameters(device_path):
+            return False
+        for param in camera.parameters.values():
+            param.original_value = param.value
+        logger.info(f"Backed up parameters for {camera.name}")
+        return True
+    
+    def restore_parameters(self, device_path: str) -> bool:
+        """Write this process's original values back through the daemon"""
+        camera = self.cameras.get(device_path)
+        if not camera:
+            return False
+        targets = {param.name: param.original_value for param in camera.parameters.values()}
+        try:
+            report = self.request('apply', device=device_path, values=targets)
+        except Exception as e:
+            logger.error(f"Failed to restore parameters of {device_path} via daemon: {e}")
+            return False
+        for name in report['written']:
+            camera.parameters[name].value = targets[name]
+        logger.info(f"Restored parameters for {camera.name}: {len(report['failed'])} failed")
+        return not report['failed']
+    
+    def try_unlock_parameter(self, device_path: str, param_name: str) -> bool:
+        """Let the daemon disable the auto modes locking a parameter"""
+        try:
+            return bool(self.request('unlock', device=device_path, name=param_name))
+        except Exception as e:
+            logger.error(f"Failed to unlock {param_name} on {device_path} via daemon: {e}")
+            return False
+    
+    def get_locking_parameters(self, device_path: str, param_name: str) -> List[str]:
+        camera = self.cameras.get(device_path)
+        return locking_controls(param_name, camera.parameters if camera else None)
+    
+    def enable_control_events(self, device_path: str) -> bool:
+        """The daemon tracks control events of all cameras and forwards them"""
+        return True
+    
+    def prefetch_parameters(self, exclude: Optional[List[str]] = None) -> Optional[threading.Thread]:
+        """Parameters are fetched from the daemon when a camera is shown"""
+        return None
+    
+    def add_parameter_listener(self, listener: Callable[[str, List[str]], None]):
+        self._parameter_listeners.append(listener)
+    
+    def remove_parameter_listener(self, listener: Callable[[str, List[str]], None]):
+        if listener in self._parameter_listeners:
+            self._parameter_listeners.remove(listener)
+    
+    def _notify_parameters_changed(self, device_path: str, names: List[str]):
+        for listener in list(self._parameter_listeners):
+            try:
+                listener(device_path, names)
+            except Exception as e:
+                logger.error(f"Parameter listener failed for {device_path}: {e}")
+    
+    def add_device_listener(self, listener: Callable[[str, str, object], None]):
+        """Register listener(event, device_path, camera) for cameras added/removed on the daemon"""
+        self._device_listeners.append(listener)
+    
+    def _notify_device_listeners(self, event: str, device_path: str, camera: CameraDevice):
+        for listener in list(self._device_listeners):
+            try:
+                listener(event, device_path, camera)
+            except Exception as e:
+                logger.error(f"Device listener failed for {event} {device_path}: {e}")
+    
+    def close(self):
+        """Disconnect from the daemon"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
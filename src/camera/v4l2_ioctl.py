@@ -0,0 +1,679 @@
+"""
+V4L2 ioctl Backend
+Direct control access to /dev/videoN via fcntl.ioctl, without spawning v4l2-ctl
+"""
+
+import ctypes
+import errno
+import logging
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# ioctl request encoding (asm-generic/ioctl.h)
+_IOC_WRITE = 1
+_IOC_READ = 2
+
+def _IOC(direction: int, type_char: str, nr: int, size: int) -> int:
+    return (direction << 30) | (size << 16) | (ord(type_char) << 8) | nr
+
+def _IOR(type_char: str, nr: int, struct_type) -> int:
+    return _IOC(_IOC_READ, type_char, nr, ctypes.sizeof(struct_type))
+
+def _IOW(type_char: str, nr: int, struct_type) -> int:
+    return _IOC(_IOC_WRITE, type_char, nr, ctypes.sizeof(struct_type))
+
+def _IOWR(type_char: str, nr: int, struct_type) -> int:
+    return _IOC(_IOC_READ | _IOC_WRITE, type_char, nr, ctypes.sizeof(struct_type))
+
+# Control types (videodev2.h)
+V4L2_CTRL_TYPE_INTEGER = 1
+V4L2_CTRL_TYPE_BOOLEAN = 2
+V4L2_CTRL_TYPE_MENU = 3
+V4L2_CTRL_TYPE_BUTTON = 4
+V4L2_CTRL_TYPE_INTEGER64 = 5
+V4L2_CTRL_TYPE_CTRL_CLASS = 6
+V4L2_CTRL_TYPE_STRING = 7
+V4L2_CTRL_TYPE_BITMASK = 8
+V4L2_CTRL_TYPE_INTEGER_MENU = 9
+
+# Type names as printed by v4l2-ctl --list-ctrls
+CTRL_TYPE_NAMES = {
+    V4L2_CTRL_TYPE_INTEGER: "int",
+    V4L2_CTRL_TYPE_BOOLEAN: "bool",
+    V4L2_CTRL_TYPE_MENU: "menu",
+    V4L2_CTRL_TYPE_BUTTON: "button",
+    V4L2_CTRL_TYPE_INTEGER64: "int64",
+    V4L2_CTRL_TYPE_CTRL_CLASS: "ctrl_class",
+    V4L2_CTRL_TYPE_STRING: "str",
+    V4L2_CTRL_TYPE_BITMASK: "bitmask",
+    V4L2_CTRL_TYPE_INTEGER_MENU: "intmenu",
+}
+
+# Control flags, named as printed by v4l2-ctl
+V4L2_CTRL_FLAG_DISABLED = 0x0001
+V4L2_CTRL_FLAG_GRABBED = 0x0002
+V4L2_CTRL_FLAG_READ_ONLY = 0x0004
+V4L2_CTRL_FLAG_UPDATE = 0x0008
+V4L2_CTRL_FLAG_INACTIVE = 0x0010
+V4L2_CTRL_FLAG_SLIDER = 0x0020
+V4L2_CTRL_FLAG_WRITE_ONLY = 0x0040
+V4L2_CTRL_FLAG_VOLATILE = 0x0080
+V4L2_CTRL_FLAG_NEXT_CTRL = 0x80000000
+
+CTRL_FLAG_NAMES = [
+    (V4L2_CTRL_FLAG_DISABLED, "disabled"),
+    (V4L2_CTRL_FLAG_GRABBED, "grabbed"),
+    (V4L2_CTRL_FLAG_READ_ONLY, "read-only"),
+    (V4L2_CTRL_FLAG_UPDATE, "update"),
+    (V4L2_CTRL_FLAG_INACTIVE, "inactive"),
+    (V4L2_CTRL_FLAG_SLIDER, "slider"),
+    (V4L2_CTRL_FLAG_WRITE_ONLY, "write-only"),
+    (V4L2_CTRL_FLAG_VOLATILE, "volatile"),
+]
+
+V4L2_CTRL_WHICH_CUR_VAL = 0
+
+# Control events (VIDIOC_SUBSCRIBE_EVENT / VIDIOC_DQEVENT)
+V4L2_EVENT_CTRL = 3
+V4L2_EVENT_SUB_FL_SEND_INITIAL = 0x0001
+V4L2_EVENT_CTRL_CH_VALUE = 0x0001
+V4L2_EVENT_CTRL_CH_FLAGS = 0x0002
+V4L2_EVENT_CTRL_CH_RANGE = 0x0004
+
+EVENT_CHANGE_NAMES = [
+    (V4L2_EVENT_CTRL_CH_VALUE, "value"),
+    (V4L2_EVENT_CTRL_CH_FLAGS, "flags"),
+    (V4L2_EVENT_CTRL_CH_RANGE, "range"),
+]
+
+# Capability bits (v4l2_capability.capabilities / device_caps)
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_VIDEO_CAPTURE_MPLANE = 0x00001000
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+
+# Types whose value fits in v4l2_control / v4l2_ext_control.value(64)
+NUMERIC_CTRL_TYPES = (
+    V4L2_CTRL_TYPE_INTEGER,
+    V4L2_CTRL_TYPE_BOOLEAN,
+    V4L2_CTRL_TYPE_MENU,
+    V4L2_CTRL_TYPE_INTEGER64,
+    V4L2_CTRL_TYPE_BITMASK,
+    V4L2_CTRL_TYPE_INTEGER_MENU,
+)
+
+class v4l2_queryctrl(ctypes.Structure):
+    _fields_ = [
+        ('id', ctypes.c_uint32),
+        ('type', ctypes.c_uint32),
+        ('name', ctypes.c_char * 32),
+        ('minimum', ctypes.c_int32),
+        ('maximum', ctypes.c_int32),
+        ('step', ctypes.c_int32),
+        ('default_value', ctypes.c_int32),
+        ('flags', ctypes.c_uint32),
+        ('reserved', ctypes.c_uint32 * 2),
+    ]
+
+class v4l2_control(ctypes.Structure):
+    _fields_ = [
+        ('id', ctypes.c_uint32),
+        ('value', ctypes.c_int32),
+    ]
+
+class _v4l2_ext_control_value(ctypes.Union):
+    _pack_ = 1
+    _fields_ = [
+        ('value', ctypes.c_int32),
+        ('value64', ctypes.c_int64),
+        ('ptr', ctypes.c_void_p),
+    ]
+
+class v4l2_ext_control(ctypes.Structure):
+    _pack_ = 1
+    _anonymous_ = ('u',)
+    _fields_ = [
+        ('id', ctypes.c_uint32),
+        ('size', ctypes.c_uint32),
+        ('reserved2', ctypes.c_uint32 * 1),
+        ('u', _v4l2_ext_control_value),
+    ]
+
+class v4l2_ext_controls(ctypes.Structure):
+    _fields_ = [
+        ('which', ctypes.c_uint32),
+        ('count', ctypes.c_uint32),
+        ('error_idx', ctypes.c_uint32),
+        ('request_fd', ctypes.c_int32),
+        ('reserved', ctypes.c_uint32 * 1),
+        ('controls', ctypes.POINTER(v4l2_ext_control)),
+    ]
+
+class _v4l2_querymenu_item(ctypes.Union):
+    _pack_ = 1
+    _fields_ = [
+        ('name', ctypes.c_char * 32),
+        ('value', ctypes.c_int64),
+    ]
+
+class v4l2_querymenu(ctypes.Structure):
+    _pack_ = 1
+    _anonymous_ = ('u',)
+    _fields_ = [
+        ('id', ctypes.c_uint32),
+        ('index', ctypes.c_uint32),
+        ('u', _v4l2_querymenu_item),
+        ('reserved', ctypes.c_uint32),
+    ]
+
+class v4l2_event_subscription(ctypes.Structure):
+    _fields_ = [
+        ('type', ctypes.c_uint32),
+        ('id', ctypes.c_uint32),
+        ('flags', ctypes.c_uint32),
+        ('reserved', ctypes.c_uint32 * 5),
+    ]
+
+class _v4l2_event_ctrl_value(ctypes.Union):
+    _fields_ = [
+        ('value', ctypes.c_int32),
+        ('value64', ctypes.c_int64),
+    ]
+
+class v4l2_event_ctrl(ctypes.Structure):
+    _anonymous_ = ('u',)
+    _fields_ = [
+        ('changes', ctypes.c_uint32),
+        ('type', ctypes.c_uint32),
+        ('u', _v4l2_event_ctrl_value),
+        ('flags', ctypes.c_uint32),
+        ('minimum', ctypes.c_int32),
+        ('maximum', ctypes.c_int32),
+        ('step', ctypes.c_int32),
+        ('default_value', ctypes.c_int32),
+    ]
+
+class _v4l2_event_data(ctypes.Union):
+    _fields_ = [
+        ('ctrl', v4l2_event_ctrl),
+        ('data', ctypes.c_uint8 * 64),
+    ]
+
+class _timespec(ctypes.Structure):
+    _fields_ = [
+        ('tv_sec', ctypes.c_long),
+        ('tv_nsec', ctypes.c_long),
+    ]
+
+class v4l2_event(ctypes.Structure):
+    _fields_ = [
+        ('type', ctypes.c_uint32),
+        ('u', _v4l2_event_data),
+        ('pending', ctypes.c_uint32),
+        ('sequence', ctypes.c_uint32),
+        ('timestamp', _timespec),
+        ('id', ctypes.c_uint32),
+        ('reserved', ctypes.c_uint32 * 8),
+    ]
+
+class v4l2_capability(ctypes.Structure):
+    _fields_ = [
+        ('driver', ctypes.c_char * 16),
+        ('card', ctypes.c_char * 32),
+        ('bus_info', ctypes.c_char * 32),
+        ('version', ctypes.c_uint32),
+        ('capabilities', ctypes.c_uint32),
+        ('device_caps', ctypes.c_uint32),
+        ('reserved', ctypes.c_uint32 * 3),
+    ]
+
+VIDIOC_QUERYCAP = _IOR('V', 0, v4l2_capability)
+VIDIOC_G_CTRL = _IOWR('V', 27, v4l2_control)
+VIDIOC_S_CTRL = _IOWR('V', 28, v4l2_control)
+VIDIOC_QUERYCTRL = _IOWR('V', 36, v4l2_queryctrl)
+VIDIOC_QUERYMENU = _IOWR('V', 37, v4l2_querymenu)
+VIDIOC_G_EXT_CTRLS = _IOWR('V', 71, v4l2_ext_controls)
+VIDIOC_S_EXT_CTRLS = _IOWR('V', 72, v4l2_ext_controls)
+VIDIOC_DQEVENT = _IOR('V', 89, v4l2_event)
+VIDIOC_SUBSCRIBE_EVENT = _IOW('V', 90, v4l2_event_subscription)
+VIDIOC_UNSUBSCRIBE_EVENT = _IOW('V', 91, v4l2_event_subscription)
+
+def control_name_to_var(name: str) -> str:
+    """Convert a driver control name to the v4l2-ctl identifier.
+    
+    Mirrors v4l2-ctl's name2var(): alphanumerics are lowercased, every run of
+    other characters becomes a single underscore, and leading/trailing
+    separators are dropped ("Exposure, Auto" -> "exposure_auto").
+    """
+    result = []
+    add_underscore = False
+    for char in name:
+        if char.isalnum():
+            if add_underscore:
+                result.append('_')
+            add_underscore = False
+            result.append(char.lower())
+        elif result:
+            add_underscore = True
+    return ''.join(result)
+
+def flags_to_names(flags: int) -> List[str]:
+    """Convert a control flag bitmask to v4l2-ctl flag names"""
+    return [name for bit, name in CTRL_FLAG_NAMES if flags & bit]
+
+def control_value(value: Any) -> Optional[int]:
+    """Integer to write for a control value, or None if it is not one
+    
+    Accepts what v4l2-ctl --set-ctrl accepts: integers (bools as 0/1),
+    integral floats and decimal or 0x-prefixed strings (e.g. from a
+    hand-edited configuration).
+    """
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str):
+        try:
+            return int(value.strip(), 0)
+        except ValueError:
+            return None
+    return None
+
+class V4L2IoctlBackend:
+    """Control backend talking to V4L2 devices directly through ioctls.
+    
+    The ``ioctl``, ``opener`` and ``closer`` callables default to
+    ``fcntl.ioctl``, ``os.open`` and ``os.close``; they can be replaced by a
+    fake layer to exercise the backend without real hardware.
+    """
+    
+    def __init__(self, ioctl: Callable = None, opener: Callable = None, closer: Callable = None):
+        self._ioctl = ioctl or (fcntl.ioctl if FCNTL_AVAILABLE else None)
+        self._open = opener or (lambda path: os.open(path, os.O_RDWR | os.O_NONBLOCK))
+        self._close = closer or os.close
+        # device_path -> {control name -> control info}
+        self._controls: Dict[str, Dict[str, Dict]] = {}
+    
+    @property
+    def available(self) -> bool:
+        """Whether ioctls can be issued on this platform"""
+        return self._ioctl is not None
+    
+    def _call(self, fd: int, request: int, arg):
+        self._ioctl(fd, request, arg, True)
+    
+    def is_supported(self, device_path: str) -> bool:
+        """Check whether the device accepts V4L2 ioctls"""
+        if not self.available:
+            return False
+        try:
+            fd = self._open(device_path)
+        except OSError as e:
+            logger.debug(f"ioctl backend: cannot open {device_path}: {e}")
+            return False
+        try:
+            cap = v4l2_capability()
+            self._call(fd, VIDIOC_QUERYCAP, cap)
+            return True
+        except OSError as e:
+            logger.debug(f"ioctl backend: VIDIOC_QUERYCAP failed on {device_path}: {e}")
+            return False
+        finally:
+            self._close(fd)
+    
+    def query_capability(self, device_path: str) -> Dict:
+        """Return driver, card, bus info and capability bits of a device"""
+        fd = self._open(device_path)
+        try:
+            cap = v4l2_capability()
+            self._call(fd, VIDIOC_QUERYCAP, cap)
+            return {
+                'driver': cap.driver.decode(errors='replace'),
+                'card': cap.card.decode(errors='replace'),
+                'bus_info': cap.bus_info.decode(errors='replace'),
+                'capabilities': cap.capabilities,
+                'device_caps': cap.device_caps,
+            }
+        finally:
+            self._close(fd)
+    
+    def _enumerate(self, fd: int) -> List[v4l2_queryctrl]:
+        """Enumerate every control with VIDIOC_QUERYCTRL | NEXT_CTRL"""
+        controls = []
+        query = v4l2_queryctrl()
+        query.id = V4L2_CTRL_FLAG_NEXT_CTRL
+        while True:
+            try:
+                self._call(fd, VIDIOC_QUERYCTRL, query)
+            except OSError as e:
+                if e.errno == errno.EINVAL:
+                    break  # End of enumeration
+                raise
+            controls.append(v4l2_queryctrl.from_buffer_copy(query))
+            query.id |= V4L2_CTRL_FLAG_NEXT_CTRL
+        return controls
+    
+    def list_controls(self, device_path: str) -> List[Dict]:
+        """Enumerate controls and their current values.
+        
+        Returns one dict per control with the keys ``id``, ``name``, ``type``
+        (v4l2-ctl type name), ``type_id``, ``min``, ``max``, ``step``,
+        ``default``, ``value``, ``flags`` and ``menu_items`` (index -> label
+        for menu controls, index -> integer for intmenu controls).
+        Control class headers and disabled controls are skipped, like
+        v4l2-ctl does.
+        """
+        fd = self._open(device_path)
+        try:
+            controls = []
+            for query in self._enumerate(fd):
+                if query.type == V4L2_CTRL_TYPE_CTRL_CLASS or query.flags & V4L2_CTRL_FLAG_DISABLED:
+                    continue
+                controls.append(self._describe(query, self._menu_items(fd, query)))
+            
+            self._read_values(fd, controls)
+            self._controls[device_path] = {c['name']: c for c in controls}
+            return controls
+        finally:
+            self._close(fd)
+    
+    def query_controls(self, device_path: str, names: Iterable[str]) -> Dict[str, Dict]:
+        """Re-read flags, range and value of a few known controls
+        
+        Cheaper than list_controls when only some controls may have changed
+        (e.g. the controls an auto mode locks). Unknown names are ignored.
+        """
+        control_map = self._control_map(device_path)
+        known = [control_map[name] for name in names if name in control_map]
+        if not known:
+            return {}
+        
+        fd = self._open(device_path)
+        try:
+            controls = []
+            for cached in known:
+                query = v4l2_queryctrl(id=cached['id'])
+                try:
+                    self._call(fd, VIDIOC_QUERYCTRL, query)
+                except OSError as e:
+                    logger.debug(f"VIDIOC_QUERYCTRL failed for {cached['name']}: {e}")
+                    continue
+                controls.append(self._describe(query, cached.get('menu_items', {})))
+            
+            self._read_values(fd, controls)
+            for control in controls:
+                control_map[control['name']] = control
+            return {c['name']: c for c in controls}
+        finally:
+            self._close(fd)
+    
+    def _describe(self, query: v4l2_queryctrl, menu_items: Dict[int, Any]) -> Dict:
+        """Control description dict for a VIDIOC_QUERYCTRL result (value unset)"""
+        return {
+            'id': query.id,
+            'name': control_name_to_var(query.name.decode(errors='replace')),
+            'type': CTRL_TYPE_NAMES.get(query.type, str(query.type)),
+            'type_id': query.type,
+            'min': query.minimum,
+            'max': query.maximum,
+            'step': query.step,
+            'default': query.default_value,
+            'value': None,
+            'flags': flags_to_names(query.flags),
+            'menu_items': menu_items,
+        }
+    
+    def _read_values(self, fd: int, controls: List[Dict]):
+        """Fill in 'value' for every readable control"""
+        readable = [c for c in controls
+                    if c['type_id'] in NUMERIC_CTRL_TYPES and 'write-only' not in c['flags']]
+        values = self._get_values(fd, readable)
+        for control in controls:
+            control['value'] = values.get(control['id'])
+    
+    def _menu_items(self, fd: int, query: v4l2_queryctrl) -> Dict[int, Any]:
+        """Read the entries of a menu control with VIDIOC_QUERYMENU"""
+        if query.type not in (V4L2_CTRL_TYPE_MENU, V4L2_CTRL_TYPE_INTEGER_MENU):
+            return {}
+        
+        items = {}
+        menu = v4l2_querymenu()
+        for index in range(max(query.minimum, 0), query.maximum + 1):
+            menu.id = query.id
+            menu.index = index
+            try:
+                self._call(fd, VIDIOC_QUERYMENU, menu)
+            except OSError:
+                continue  # Drivers may leave gaps in the menu
+            if query.type == V4L2_CTRL_TYPE_MENU:
+                items[index] = menu.name.decode(errors='replace')
+            else:
+                items[index] = menu.value
+        return items
+    
+    def _control_map(self, device_path: str) -> Dict[str, Dict]:
+        if device_path not in self._controls:
+            self.list_controls(device_path)
+        return self._controls[device_path]
+    
+    def _get_values(self, fd: int, controls: List[Dict]) -> Dict[int, int]:
+        """Read values with one VIDIOC_G_EXT_CTRLS, falling back to G_CTRL"""
+        if not controls:
+            return {}
+        
+        array = (v4l2_ext_control * len(controls))()
+        for i, control in enumerate(controls):
+            array[i].id = control['id']
+        
+        ext = v4l2_ext_controls()
+        ext.which = V4L2_CTRL_WHICH_CUR_VAL
+        ext.count = len(controls)
+        ext.controls = array
+        
+        try:
+            self._call(fd, VIDIOC_G_EXT_CTRLS, ext)
+            return {
+                control['id']: (array[i].value64 if control['type_id'] == V4L2_CTRL_TYPE_INTEGER64
+                                else array[i].value)
+                for i, control in enumerate(controls)
+            }
+        except OSError as e:
+            logger.debug(f"VIDIOC_G_EXT_CTRLS failed ({e}), falling back to VIDIOC_G_CTRL")
+        
+        values = {}
+        for control in controls:
+            ctrl = v4l2_control(id=control['id'])
+            try:
+                self._call(fd, VIDIOC_G_CTRL, ctrl)
+                values[control['id']] = ctrl.value
+            except OSError as e:
+                logger.debug(f"VIDIOC_G_CTRL failed for {control['name']}: {e}")
+        return values
+    
+    def get_controls(self, device_path: str, names: Iterable[str]) -> Dict[str, int]:
+        """Read current values of the named controls in one round-trip"""
+        control_map = self._control_map(device_path)
+        controls = [control_map[name] for name in names if name in control_map]
+        fd = self._open(device_path)
+        try:
+            values = self._get_values(fd, controls)
+        finally:
+            self._close(fd)
+        return {c['name']: values[c['id']] for c in controls if c['id'] in values}
+    
+    def get_control(self, device_path: str, name: str) -> Optional[int]:
+        """Read the current value of a single control"""
+        return self.get_controls(device_path, [name]).get(name)
+    
+    def set_controls(self, device_path: str, values: Dict[str, Any]) -> Dict[str, bool]:
+        """Write several controls with one VIDIOC_S_EXT_CTRLS.
+        
+        If the batch is rejected, every control is retried individually with
+        VIDIOC_S_CTRL so the result reports success per control. Unknown
+        controls and values that are not integers (see control_value) fail
+        without being written.
+        """
+        control_map = self._control_map(device_path)
+        results = {name: False for name in values if name not in control_map}
+        controls = []
+        for name, value in values.items():
+            if name not in control_map:
+                continue
+            converted = control_value(value)
+            if converted is None:
+                logger.warning(f"Invalid value {value!r} for {name} on {device_path}")
+                results[name] = False
+                continue
+            controls.append((control_map[name], converted))
+        if not controls:
+            return results
+        
+        fd = self._open(device_path)
+        try:
+            array = (v4l2_ext_control * len(controls))()
+            for i, (control, value) in enumerate(controls):
+                array[i].id = control['id']
+                if control['type_id'] == V4L2_CTRL_TYPE_INTEGER64:
+                    array[i].value64 = value
+                else:
+                    array[i].value = value
+            
+            ext = v4l2_ext_controls()
+            ext.which = V4L2_CTRL_WHICH_CUR_VAL
+            ext.count = len(controls)
+            ext.controls = array
+            
+            try:
+                self._call(fd, VIDIOC_S_EXT_CTRLS, ext)
+                results.update({control['name']: True for control, _ in controls})
+                return results
+            except OSError as e:
+                logger.debug(f"VIDIOC_S_EXT_CTRLS failed on {device_path} "
+                             f"(error_idx={ext.error_idx}): {e}, retrying per control")
+            
+            for control, value in controls:
+                ctrl = v4l2_control(id=control['id'], value=value)
+                try:
+                    self._call(fd, VIDIOC_S_CTRL, ctrl)
+                    results[control['name']] = True
+                except OSError as e:
+                    logger.debug(f"VIDIOC_S_CTRL failed for {control['name']}={value}: {e}")
+                    results[control['name']] = False
+            return results
+        finally:
+            self._close(fd)
+    
+    def set_control(self, device_path: str, name: str, value: Any) -> bool:
+        """Write a single control"""
+        return self.set_controls(device_path, {name: value}).get(name, False)
+    
+    def forget(self, device_path: str):
+        """Drop cached control metadata for a device"""
+        self._controls.pop(device_path, None)
+    
+    def subscribe_control_events(self, device_path: str,
+                                 names: Optional[Iterable[str]] = None) -> 'ControlEventSubscription':
+        """Subscribe to V4L2_EVENT_CTRL for the named (default: all) controls
+        
+        Raises:
+            OSError: if the device does not support control events
+        """
+        control_map = self._control_map(device_path)
+        controls = [control_map[name] for name in (names if names is not None else control_map)
+                    if name in control_map]
+        
+        fd = self._open(device_path)
+        subscribed = {}
+        try:
+            for control in controls:
+                sub = v4l2_event_subscription(type=V4L2_EVENT_CTRL, id=control['id'])
+                try:
+                    self._call(fd, VIDIOC_SUBSCRIBE_EVENT, sub)
+                except OSError as e:
+                    if e.errno == errno.ENOTTY:
+                        raise  # Events not supported by the driver
+                    logger.debug(f"Cannot subscribe to events of {control['name']}: {e}")
+                    continue
+                subscribed[control['id']] = control
+        except OSError:
+            self._close(fd)
+            raise
+        
+        if controls and not subscribed:
+            self._close(fd)
+            raise OSError(errno.ENOTTY, f"No control events available on {device_path}")
+        
+        logger.debug(f"Subscribed to events of {len(subscribed)} controls on {device_path}")
+        return ControlEventSubscription(self, device_path, fd, subscribed)
+
+class ControlEventSubscription:
+    """Open device handle with V4L2 control event subscriptions
+    
+    Changes to subscribed controls are queued by the driver, including
+    changes made through other handles or by other applications. The handle
+    signals pending events as an exceptional condition (POLLPRI), so
+    ``fileno()`` can be passed to select() in the except list.
+    """
+    
+    def __init__(self, backend: V4L2IoctlBackend, device_path: str, fd: int, controls: Dict[int, Dict]):
+        self.backend = backend
+        self.device_path = device_path
+        self._fd = fd
+        self._controls = controls  # control id -> control info
+    
+    def fileno(self) -> int:
+        return self._fd
+    
+    @property
+    def closed(self) -> bool:
+        return self._fd < 0
+    
+    def read(self) -> List[Dict]:
+        """Dequeue all pending control events without blocking
+        
+        Returns one dict per event with ``id``, ``name``, ``changes`` (list of
+        "value", "flags", "range"), ``value``, ``flags``, ``min``, ``max``,
+        ``step`` and ``default``.
+        """
+        events = []
+        event = v4l2_event()
+        while self._fd >= 0:
+            try:
+                self.backend._call(self._fd, VIDIOC_DQEVENT, event)
+            except OSError as e:
+                if e.errno not in (errno.ENOENT, errno.EAGAIN):
+                    logger.debug(f"VIDIOC_DQEVENT failed on {self.device_path}: {e}")
+                break
+            if event.type != V4L2_EVENT_CTRL or event.id not in self._controls:
+                continue
+            
+            ctrl = event.u.ctrl
+            control = self._controls[event.id]
+            events.append({
+                'id': event.id,
+                'name': control['name'],
+                'changes': [name for bit, name in EVENT_CHANGE_NAMES if ctrl.changes & bit],
+                'value': ctrl.value64 if ctrl.type == V4L2_CTRL_TYPE_INTEGER64 else ctrl.value,
+                'flags': flags_to_names(ctrl.flags),
+                'min': ctrl.minimum,
+                'max': ctrl.maximum,
+                'step': ctrl.step,
+                'default': ctrl.default_value,
+            })
+        return events
+    
+    def close(self):
+        """Close the handle; the kernel drops its subscriptions with it"""
+        if self._fd >= 0:
+            self.backend._close(self._fd)
+            self._fd = -1
@@ -0,0 +1,210 @@
+"""
+Device Watcher
+Incremental tracking of /dev/videoN hotplug events
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from camera.identity import list_video_nodes
+
+logger = logging.getLogger(__name__)
+
+# inotify constants (sys/inotify.h)
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+# Device events: ("added" | "removed", device_path)
+DeviceEvent = Tuple[str, str]
+
+def _is_video_node(name: str) -> bool:
+    return name.startswith("video") and name[5:].isdigit()
+
+class InotifyEventSource:
+    """Reports video node creation/removal in a directory using inotify"""
+    
+    def __init__(self, directory: str = "/dev"):
+        self.directory = directory
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+        if self._libc.inotify_add_watch(self._fd, directory.encode(), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"inotify_add_watch failed for {directory}")
+    
+    def read(self, timeout: float) -> List[DeviceEvent]:
+        """Wait up to timeout seconds and return pending device events"""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 4096)
+        except BlockingIOError:
+            return []
+        
+        events = []
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            _, mask, _, name_len = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset:offset + name_len].rstrip(b"\0").decode(errors="replace")
+            offset += name_len
+            if not _is_video_node(name):
+                continue
+            path = os.path.join(self.directory, name)
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                events.append(("added", path))
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                events.append(("removed", path))
+        return events
+    
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+class PollingEventSource:
+    """Reports video node changes by periodically listing a directory
+    
+    Used where inotify is unavailable.
+    """
+    
+    def __init__(self, directory: str = "/dev", interval: float = 1.0):
+        self.directory = directory
+        self.interval = interval
+        self._known = set(list_video_nodes(directory))
+    
+    def read(self, timeout: float) -> List[DeviceEvent]:
+        time.sleep(min(timeout, self.interval))
+        current = set(list_video_nodes(self.directory))
+        events = [("removed", path) for path in sorted(self._known - current)]
+        events += [("added", path) for path in sorted(current - self._known)]
+        self._known = current
+        return events
+    
+    def close(self):
+        pass
+
+class DeviceWatcher:
+    """Keeps a CameraController in sync with device hotplug events
+    
+    New nodes are probed individually via ``controller.add_device`` and
+    vanished nodes are dropped via ``controller.remove_device``; events for
+    nodes the controller already knows (or never knew) are ignored. Listeners
+    are called from the watcher thread as ``listener(event, device_path,
+    camera)`` with event "added" or "removed"; GUI code must hand the call
+    over to its own thread.
+    """
+    
+    # udev may still be adjusting permissions right after the node appears
+    PROBE_ATTEMPTS = 3
+    PROBE_RETRY_DELAY = 0.5
+    
+    def __init__(self, controller, dev_root: str = "/dev", event_source=None):
+        self.controller = controller
+        self.dev_root = dev_root
+        self._event_source = event_source
+        self._listeners: List[Callable] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+    
+    def add_listener(self, listener: Callable[[str, str, object], None]):
+        """Register a callback for camera add/remove events"""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def set_controller(self, controller):
+        """Switch to another controller (e.g. after a full refresh)"""
+        self.controller = controller
+    
+    def _create_event_source(self):
+        try:
+            return InotifyEventSource(self.dev_root)
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify unavailable ({e}), polling {self.dev_root} for devices")
+            return PollingEventSource(self.dev_root)
+    
+    def start(self):
+        """Start watching in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        if self._event_source is None:
+            self._event_source = self._create_event_source()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="camloader-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.dev_root} for camera hotplug")
+    
+    def stop(self, timeout: float = 2.0):
+        """Stop the watcher thread and release the event source"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._event_source:
+            self._event_source.close()
+            self._event_source = None
+    
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                events = self._event_source.read(0.5)
+            except Exception as e:
+                logger.error(f"Device watcher failed to read events: {e}")
+                self._stop_event.wait(1.0)
+                continue
+            for event, device_path in events:
+                if self._stop_event.is_set():
+                    break
+                self.handle_event(event, device_path)
+    
+    def handle_event(self, event: str, device_path: str):
+        """Apply a single device event to the controller and notify listeners"""
+        controller = self.controller
+        if event == "added":
+            if controller.get_camera(device_path):
+                # Repeated event (e.g. inotify and a rescan): not a reconnect
+                logger.debug(f"Ignoring added event of known camera {device_path}")
+                return
+            camera = None
+            for _ in range(self.PROBE_ATTEMPTS):
+                if not os.path.exists(device_path):
+                    return  # Gone again before we could probe it
+                camera = controller.add_device(device_path)
+                if camera or os.access(device_path, os.R_OK | os.W_OK):
+                    break
+                # Permissions not applied yet, wait for udev
+                self._stop_event.wait(self.PROBE_RETRY_DELAY)
+            if camera:
+                self._notify("added", device_path, camera)
+        elif event == "removed":
+            camera = controller.remove_device(device_path)
+            if camera:
+                self._notify("removed", device_path, camera)
+    
+    def _notify(self, event: str, device_path: str, camera):
+        for listener in list(self._listeners):
+            try:
+                listener(event, device_path, camera)
+            except Exception as e:
+                logger.error(f"Device listener failed for {event} {device_path}: {e}")
@@ -0,0 +1,180 @@
+"""
+Parameter Write Queue
+Coalesces rapid parameter changes (e.g. slider drags) into rate-limited device writes
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ParameterWriteQueue:
+    """Background parameter writer where the latest value wins
+    
+    ``submit()`` returns immediately. One worker thread per device applies
+    pending values through ``controller.set_parameter``; while a write is
+    in flight or a control is rate limited, newer values replace older
+    pending ones. Writes equal to the value last applied to the device
+    (the parameter's current value) are skipped.
+    
+    With ``set_submit()`` (see BackgroundController) the writes run as jobs
+    on the device's operation worker, one after the other with everything
+    else done to that device; the queue's thread only picks the next value.
+    ``hand_over()`` moves a device's queued values onto that worker at once.
+    
+    ``callback(device_path, name, value, success)`` is called from the
+    thread that wrote the value after each write that reached the device.
+    """
+    
+    # Default cap on writes per second for a single control
+    DEFAULT_MAX_RATE = 20.0
+    
+    def __init__(self, controller, max_rate: float = DEFAULT_MAX_RATE,
+                 callback: Optional[Callable[[str, str, Any, bool], None]] = None):
+        self.controller = controller
+        self.min_interval = 1.0 / max_rate if max_rate and max_rate > 0 else 0.0
+        self.callback = callback
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Dict[str, Any]] = {}  # device -> {name: value}
+        self._in_flight: Dict[str, int] = {}
+        self._last_write: Dict[Tuple[str, str], float] = {}
+        self._workers: Dict[str, threading.Thread] = {}
+        self._submit: Optional[Callable[..., Future]] = None
+        self._closed = False
+    
+    def set_controller(self, controller):
+        """Switch to another controller (e.g. after a full refresh)"""
+        self.controller = controller
+    
+    def set_submit(self, submit: Optional[Callable[..., Future]]):
+        """Run writes through submit(device_path, func, *args) -> Future"""
+        self._submit = submit
+    
+    def submit(self, device_path: str, name: str, value: Any):
+        """Queue a write, replacing any pending value of the same control"""
+        with self._cond:
+            if self._closed:
+                return
+            self._pending.setdefault(device_path, {})[name] = value
+            if device_path not in self._workers:
+                worker = threading.Thread(target=self._run, args=(device_path,),
+                                          name=f"camloader-writer-{device_path}", daemon=True)
+                self._workers[device_path] = worker
+                worker.start()
+            self._cond.notify_all()
+    
+    def is_pending(self, device_path: str, name: str) -> bool:
+        """Whether a newer value of the control is still waiting to be written"""
+        with self._cond:
+            return name in self._pending.get(device_path, {})
+    
+    def hand_over(self, device_path: str):
+        """Submit the device's queued values now, ahead of whatever is submitted next
+        
+        Without set_submit() the values stay queued; use flush() instead.
+        """
+        submit = self._submit
+        if submit is None:
+            return
+        with self._cond:
+            pending = self._pending.pop(device_path, {})
+            self._in_flight[device_path] = self._in_flight.get(device_path, 0) + len(pending)
+        for name, value in pending.items():
+            self._dispatch(submit, device_path, name, value)
+    
+    def flush(self, timeout: Optional[float] = None, device_path: Optional[str] = None) -> bool:
+        """Wait until every queued value (of one device, if given) has been written
+        
+        Returns:
+            False if the timeout expired first
+        """
+        def settled():
+            if device_path is not None:
+                return not self._pending.get(device_path) and not self._in_flight.get(device_path)
+            return not any(self._pending.values()) and not any(self._in_flight.values())
+        
+        with self._cond:
+            return self._cond.wait_for(settled, timeout)
+    
+    def close(self, timeout: float = 2.0):
+        """Write what is still queued (up to timeout), then stop the workers"""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+    
+    def _next_write(self, device_path: str) -> Optional[Tuple[str, Any]]:
+        """Wait for a control that may be written now (called with the lock held)"""
+        while not self._closed:
+            pending = self._pending.get(device_path)
+            if not pending:
+                self._cond.wait()
+                continue
+            
+            now = time.monotonic()
+            wait = None
+            for name in pending:
+                allowed_at = self._last_write.get((device_path, name), 0.0) + self.min_interval
+                if allowed_at <= now:
+                    self._in_flight[device_path] = self._in_flight.get(device_path, 0) + 1
+                    return name, pending.pop(name)
+                wait = allowed_at - now if wait is None else min(wait, allowed_at - now)
+            self._cond.wait(wait)
+        return None
+    
+    def _run(self, device_path: str):
+        while True:
+            with self._cond:
+                item = self._next_write(device_path)
+            if item is None:
+                return
+            
+            name, value = item
+            submit = self._submit
+            if submit is None:
+                self._write_queued(device_path, name, value)
+                continue
+            
+            # Newer values coalesce while the device worker is busy
+            future = self._dispatch(submit, device_path, name, value)
+            if future is not None:
+                future.exception()
+    
+    def _dispatch(self, submit: Callable[..., Future], device_path: str, name: str, value: Any) -> Optional[Future]:
+        """Submit one counted in-flight write to the device worker"""
+        try:
+            return submit(device_path, self._write_queued, device_path, name, value)
+        except RuntimeError as e:  # The worker is shut down
+            logger.error(f"Queued write {name}={value} on {device_path} dropped: {e}")
+            self._write_done(device_path)
+            return None
+    
+    def _write_queued(self, device_path: str, name: str, value: Any):
+        try:
+            self._write(device_path, name, value)
+        except Exception as e:
+            logger.error(f"Queued write {name}={value} on {device_path} failed: {e}")
+        finally:
+            self._write_done(device_path)
+    
+    def _write_done(self, device_path: str):
+        with self._cond:
+            self._in_flight[device_path] -= 1
+            self._cond.notify_all()
+    
+    def _write(self, device_path: str, name: str, value: Any):
+        controller = self.controller
+        camera = controller.get_camera(device_path)
+        param = camera.parameters.get(name) if camera else None
+        if param is not None and param.value == value:
+            return  # Device already has this value
+        
+        with self._cond:
+            self._last_write[(device_path, name)] = time.monotonic()
+        success = controller.set_parameter(device_path, name, value)
+        if self.callback:
+            self.callback(device_path, name, value, success)
@@ -10,45 +10,77 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 
 from camera.controller import CameraDevice, V4L2Parameter
+from camera.identity import stable_ids
+from config.store import KIND_BACKUP, KIND_CONFIG, LEGACY_CONFIG_DIR, ConfigStore, get_store
+from config.writer import ConfigWriter, write_json_atomic
 
 logger = logging.getLogger(__name__)
 
 class ConfigManager:
-    """Manager for camera configuration persistence"""
+    """Manager for camera configuration persistence
     
-    def __init__(self, config_dir: str = None):
+    Configurations and parameter backups live in a ConfigStore (by default
+    the process-wide one from config.store.get_store, which also holds the
+    startup configurations). The JSON files of earlier versions in
+    config_dir are imported on first use.
+    
+    Configurations are keyed by CameraDevice.key, the camera's stable ID
+    (see camera.identity.read_stable_id), so they follow a camera to
+    another /dev/videoN node. Entries saved by older versions under the
+    device path are migrated by load_all_configs().
+    
+    Configurations and backups are saved write-behind: save_camera_config()
+    only snapshots the values and hands them to a ConfigWriter, which
+    coalesces repeated saves and writes each batch in one transaction.
+    Call close() (or flush()) before exiting; the writer also flushes at
+    interpreter exit.
+    """
+    
+    def __init__(self, config_dir: str = None, writer: Optional[ConfigWriter] = None,
+                 store: Optional[ConfigStore] = None):
         if config_dir:
+            # Custom directory: keeps its own store
             self.config_dir = Path(config_dir)
+            self.store = store or ConfigStore(self.config_dir / "camloader.db")
         else:
-            # Default to data directory in project
-            self.config_dir = Path(__file__).parent.parent.parent / "data" / "configs"
-        
-        self.config_dir.mkdir(parents=True, exist_ok=True)
+            # Default to data directory in project (configs of earlier versions)
+            self.config_dir = LEGACY_CONFIG_DIR
+            self.store = store or get_store()
+        self.store.import_files(self.config_dir)
         
         # Cache for loaded configurations
         self.configs: Dict[str, Dict] = {}
         
-        logger.info(f"ConfigManager initialized with directory: {self.config_dir}")
+        # Background writer for saves
+        self.writer = writer or ConfigWriter(write_batch=self.store.put_many)
+        
+        logger.info(f"ConfigManager initialized with store: {self.store.path}")
+    
+    def _read(self, camera_key: str, kind: str) -> Optional[Dict]:
+        """Read a store entry, preferring data still waiting to be written"""
+        data = self.writer.pending((camera_key, kind))
+        if data is not None:
+            return data
+        return self.store.get(camera_key, kind)
     
-    def _get_config_file_path(self, device_path: str) -> Path:
-        """Get configuration file path for a device"""
-        # Sanitize device path for filename
-        filename = device_path.replace("/", "_").replace(" ", "_") + ".json"
-        return self.config_dir / filename
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every save has been written to the store"""
+        return self.writer.flush(timeout)
     
-    def _get_backup_file_path(self, device_path: str) -> Path:
-        """Get backup file path for a device"""
-        # Sanitize device path for filename
-        filename = device_path.replace("/", "_").replace(" ", "_") + "_backup.json"
-        return self.config_dir / filename
+    def close(self) -> bool:
+        """Write pending saves and stop the background writer
+        
+        Returns:
+            False if saves could not be written
+        """
+        return self.writer.close()
     
     def save_camera_config(self, camera: CameraDevice, include_backup: bool = True) -> bool:
-        """Save camera configuration to file"""
+        """Save camera configuration (written to the store in the background)"""
         try:
-            config_file = self._get_config_file_path(camera.device_path)
-            
             # Build configuration data
             config_data = {
+                "camera_id": camera.key,
                 "device_path": camera.device_path,
                 "device_name": camera.name,
                 "saved_at": datetime.now().isoformat(),
@@ -59,14 +91,13 @@ class ConfigManager:
             for param_name, param in camera.parameters.items():
                 config_data["parameters"][param_name] = param.to_dict()
             
-            # Save to file
-            with open(config_file, 'w') as f:
-                json.dump(config_data, f, indent=2)
+            # Queue for writing
+            self.writer.submit((camera.key, KIND_CONFIG), config_data)
             
             # Update cache
-            self.configs[camera.device_path] = config_data
+            self.configs[camera.key] = config_data
             
-            logger.info(f"Saved configuration for {camera.name} to {config_file}")
+            logger.info(f"Saved configuration for {camera.name} ({camera.key})")
             
             # Save backup if requested
             if include_backup:
@@ -78,42 +109,37 @@ class ConfigManager:
             logger.error(f"Failed to save configuration for {camera.name}: {e}")
             return False
     
-    def load_camera_config(self, device_path: str) -> Optional[Dict]:
-        """Load camera configuration from file"""
+    def load_camera_config(self, camera_key: str) -> Optional[Dict]:
+        """Load camera configuration from the store"""
         try:
-            config_file = self._get_config_file_path(device_path)
-            
-            if not config_file.exists():
-                logger.info(f"No configuration file found for {device_path}")
+            config_data = self._read(camera_key, KIND_CONFIG)
+            if config_data is None:
+                logger.info(f"No configuration found for {camera_key}")
                 return None
             
-            with open(config_file, 'r') as f:
-                config_data = json.load(f)
-            
             # Update cache
-            self.configs[device_path] = config_data
+            self.configs[camera_key] = config_data
             
-            logger.info(f"Loaded configuration for {device_path}")
+            logger.info(f"Loaded configuration for {camera_key}")
             return config_data
             
         except Exception as e:
-            logger.error(f"Failed to load configuration for {device_path}: {e}")
+            logger.error(f"Failed to load configuration for {camera_key}: {e}")
             return None
     
-    def get_camera_config(self, device_path: str) -> Optional[Dict]:
-        """Get camera configuration from cache or load from file"""
-        if device_path in self.configs:
-            return self.configs[device_path]
+    def get_camera_config(self, camera_key: str) -> Optional[Dict]:
+        """Get camera configuration (by CameraDevice.key) from cache or load from the store"""
+        if camera_key in self.configs:
+            return self.configs[camera_key]
         
-        return self.load_camera_config(device_path)
+        return self.load_camera_config(camera_key)
     
     def save_parameter_backup(self, camera: CameraDevice) -> bool:
-        """Save original parameter values as backup"""
+        """Save original parameter values as backup (written to the store in the background)"""
         try:
-            backup_file = self._get_backup_file_path(camera.device_path)
-            
             # Build backup data
             backup_data = {
+                "camera_id": camera.key,
                 "device_path": camera.device_path,
                 "device_name": camera.name,
                 "backed_up_at": datetime.now().isoformat(),
@@ -128,128 +154,120 @@ class ConfigManager:
                     "param_type": param.param_type
                 }
             
-            # Save to file
-            with open(backup_file, 'w') as f:
-                json.dump(backup_data, f, indent=2)
+            # Queue for writing
+            self.writer.submit((camera.key, KIND_BACKUP), backup_data)
             
-            logger.info(f"Saved parameter backup for {camera.name} to {backup_file}")
+            logger.info(f"Saved parameter backup for {camera.name} ({camera.key})")
             return True
             
         except Exception as e:
             logger.error(f"Failed to save parameter backup for {camera.name}: {e}")
             return False
     
-    def load_parameter_backup(self, device_path: str) -> Optional[Dict]:
-        """Load parameter backup from file"""
+    def load_parameter_backup(self, camera_key: str) -> Optional[Dict]:
+        """Load parameter backup from the store"""
         try:
-            backup_file = self._get_backup_file_path(device_path)
-            
-            if not backup_file.exists():
-                logger.info(f"No backup file found for {device_path}")
+            backup_data = self._read(camera_key, KIND_BACKUP)
+            if backup_data is None:
+                logger.info(f"No backup found for {camera_key}")
                 return None
             
-            with open(backup_file, 'r') as f:
-                backup_data = json.load(f)
-            
-            logger.info(f"Loaded parameter backup for {device_path}")
+            logger.info(f"Loaded parameter backup for {camera_key}")
             return backup_data
             
         except Exception as e:
-            logger.error(f"Failed to load parameter backup for {device_path}: {e}")
+            logger.error(f"Failed to load parameter backup for {camera_key}: {e}")
             return None
     
     def list_saved_configs(self) -> List[Dict]:
-        """List all saved configurations"""
-        configs = []
+        """List all saved configurations (camera_id, device_path, device_name, saved_at)
         
+        Answered from the store's index; no configuration is parsed.
+        """
         try:
-            for config_file in self.config_dir.glob("*.json"):
-                if config_file.name.endswith("_backup.json"):
-                    continue  # Skip backup files
-                
-                try:
-                    with open(config_file, 'r') as f:
-                        config_data = json.load(f)
-                    
-                    configs.append({
-                        "file_path": str(config_file),
-                        "device_path": config_data.get("device_path"),
-                        "device_name": config_data.get("device_name"),
-                        "saved_at": config_data.get("saved_at")
-                    })
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to read config file {config_file}: {e}")
-            
+            self.flush()
+            return self.store.list(KIND_CONFIG)
         except Exception as e:
             logger.error(f"Failed to list configurations: {e}")
-        
-        return configs
+            return []
     
-    def delete_camera_config(self, device_path: str) -> bool:
-        """Delete configuration for a camera"""
+    def delete_camera_config(self, camera_key: str) -> bool:
+        """Delete configuration and backup of a camera"""
         try:
-            config_file = self._get_config_file_path(device_path)
-            backup_file = self._get_backup_file_path(device_path)
-            
-            deleted = False
-            
-            if config_file.exists():
-                config_file.unlink()
-                deleted = True
-                logger.info(f"Deleted configuration file: {config_file}")
+            # Saves not written yet must not bring the entries back
+            keys = [(camera_key, KIND_CONFIG), (camera_key, KIND_BACKUP)]
+            pending = any(self.writer.pending(key) is not None for key in keys)
+            for key in keys:
+                self.writer.discard(key)
+            self.flush()
             
-            if backup_file.exists():
-                backup_file.unlink()
-                deleted = True
-                logger.info(f"Deleted backup file: {backup_file}")
+            deleted = self.store.delete(camera_key) or pending
+            if deleted:
+                logger.info(f"Deleted configuration of {camera_key}")
             
             # Remove from cache
-            if device_path in self.configs:
-                del self.configs[device_path]
+            if camera_key in self.configs:
+                del self.configs[camera_key]
             
             return deleted
             
         except Exception as e:
-            logger.error(f"Failed to delete configuration for {device_path}: {e}")
+            logger.error(f"Failed to delete configuration for {camera_key}: {e}")
             return False
     
+    def migrate_legacy_configs(self) -> int:
+        """Move configurations and backups saved under a device path to the camera's stable ID
+        
+        The camera currently at the saved /dev/videoN path is taken to be the
+        one the entry was saved for. Entries of cameras that are not
+        connected are left for a later run.
+        
+        Returns:
+            Number of migrated entries
+        """
+        migrated = 0
+        self.flush()
+        device_paths = {entry["camera_id"] for kind in (KIND_CONFIG, KIND_BACKUP) for entry in self.store.list(kind)
+                        if entry["camera_id"].startswith("/dev/")}
+        ids = stable_ids(device_paths) if device_paths else {}
+        for device_path in sorted(device_paths):
+            try:
+                stable_id = ids.get(device_path)
+                if not stable_id:
+                    continue
+                moved = self.store.rename(device_path, stable_id)
+                if moved:
+                    self.configs.pop(device_path, None)
+                    migrated += moved
+                    logger.info(f"Migrated configuration of {device_path} to {stable_id}")
+            
+            except Exception as e:
+                logger.warning(f"Failed to migrate configuration of {device_path}: {e}")
+        
+        return migrated
+    
     def load_all_configs(self):
-        """Load all available configurations into cache"""
+        """Load all available configurations into cache (migrating device path keyed entries first)"""
         try:
-            for config_file in self.config_dir.glob("*.json"):
-                if config_file.name.endswith("_backup.json"):
-                    continue  # Skip backup files
-                
-                try:
-                    with open(config_file, 'r') as f:
-                        config_data = json.load(f)
-                    
-                    device_path = config_data.get("device_path")
-                    if device_path:
-                        self.configs[device_path] = config_data
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to load config file {config_file}: {e}")
-            
+            self.migrate_legacy_configs()
+            self.configs.update(self.store.load_all(KIND_CONFIG))
             logger.info(f"Loaded {len(self.configs)} configurations into cache")
             
         except Exception as e:
             logger.error(f"Failed to load all configurations: {e}")
     
-    def export_config(self, device_path: str, export_path: str) -> bool:
+    def export_config(self, camera_key: str, export_path: str) -> bool:
         """Export configuration to specified path"""
         try:
-            config = self.get_camera_config(device_path)
+            config = self.get_camera_config(camera_key)
             if not config:
-                logger.error(f"No configuration found for {device_path}")
+                logger.error(f"No configuration found for {camera_key}")
                 return False
             
             export_file = Path(export_path)
             export_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(export_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            write_json_atomic(export_file, config, indent=2)
             
             logger.info(f"Exported configuration to {export_file}")
             return True
@@ -258,7 +276,7 @@ class ConfigManager:
             logger.error(f"Failed to export configuration: {e}")
             return False
     
-    def import_config(self, import_path: str, device_path: str = None) -> bool:
+    def import_config(self, import_path: str, camera_key: str = None) -> bool:
         """Import configuration from specified path"""
         try:
             import_file = Path(import_path)
@@ -270,25 +288,24 @@ class ConfigManager:
             with open(import_file, 'r') as f:
                 config_data = json.load(f)
             
-            # Use provided device path or the one from config
-            target_device = device_path or config_data.get("device_path")
-            if not target_device:
-                logger.error("No device path specified for import")
+            # Use provided camera key or the one from config
+            target_key = camera_key or config_data.get("camera_id", config_data.get("device_path"))
+            if not target_key:
+                logger.error("No camera specified for import")
                 return False
             
-            # Update device path in config
-            config_data["device_path"] = target_device
+            # Update camera key in config
+            config_data["camera_id"] = target_key
             config_data["imported_at"] = datetime.now().isoformat()
             
-            # Save to configuration directory
-            config_file = self._get_config_file_path(target_device)
-            with open(config_file, 'w') as f:
-                json.dump(config_data, f, indent=2)
+            # Save to the store
+            self.writer.discard((target_key, KIND_CONFIG))
+            self.store.put(target_key, KIND_CONFIG, config_data)
             
             # Update cache
-            self.configs[target_device] = config_data
+            self.configs[target_key] = config_data
             
-            logger.info(f"Imported configuration from {import_file} for {target_device}")
+            logger.info(f"Imported configuration from {import_file} for {target_key}")
             return True
             
         except Exception as e:
@@ -0,0 +1,136 @@
+"""
+Startup Configuration
+Reading and writing the startup configurations (per-camera values applied at start)
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from camera.identity import stable_ids
+from config.store import get_store
+from config.writer import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+def load_startup_configs(config_file: Optional[Path] = None) -> Dict[str, Dict]:
+    """Read the startup configurations from the config store, or from a JSON file
+    
+    Entries still keyed by device path are migrated to the camera's
+    stable ID (see migrate_startup_configs) and written back.
+    
+    Args:
+        config_file: JSON file to use instead of the store (e.g.
+            ``--startup-config``); empty dict if it does not exist
+    
+    Returns:
+        Mapping of camera key (stable ID, or device path for cameras
+        without one) to ``{"enabled": bool, "parameters": {...}}``
+    """
+    if config_file is None:
+        configs = get_store().startup_configs()
+    elif not Path(config_file).exists():
+        return {}
+    else:
+        with open(config_file, 'r') as f:
+            configs = json.load(f)
+    
+    migrated = migrate_startup_configs(configs)
+    if migrated != configs:
+        try:
+            save_startup_configs(migrated, config_file)
+        except Exception as e:
+            logger.warning(f"Failed to save migrated startup configurations: {e}")
+    return migrated
+
+def save_startup_configs(configs: Dict[str, Dict], config_file: Optional[Path] = None):
+    """Replace the startup configurations in the config store, or write a JSON file (atomically)"""
+    if config_file is None:
+        get_store().replace_startup_configs(configs)
+        return
+    config_file = Path(config_file)
+    config_file.parent.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(config_file, configs, indent=2)
+
+def migrate_startup_configs(configs: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Re-key entries saved under a device path (/dev/videoN) to the camera's stable ID
+    
+    The camera currently at that path is taken to be the one the entry was
+    saved for. Entries of cameras that are not connected, or whose stable
+    ID already has an entry, keep their key.
+    """
+    migrated = {}
+    device_paths = [key for key in configs if key.startswith("/dev/")]
+    ids = stable_ids(device_paths) if device_paths else {}
+    for key, config in configs.items():
+        stable_id = ids.get(key)
+        if stable_id and stable_id not in configs and stable_id not in migrated:
+            logger.info(f"Startup configuration of {key} migrated to {stable_id}")
+            key = stable_id
+        migrated[key] = config
+    return migrated
+
+def profiles_by_device(profiles: Dict[str, Dict], lookup: Callable[[str], object]) -> Dict[str, Dict]:
+    """Re-key profiles from camera keys to the cameras' current device paths
+    
+    Args:
+        profiles: Profiles by camera key, e.g. from enabled_profiles()
+        lookup: Returns the camera for a key or None (e.g. controller.get_camera)
+    
+    Keys without a camera are kept as they are.
+    """
+    by_device = {}
+    for key, values in profiles.items():
+        camera = lookup(key)
+        by_device[camera.device_path if camera else key] = values
+    return by_device
+
+def enabled_profiles(configs: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Parameter values of the enabled configurations, by camera key"""
+    return {
+        key: config.get("parameters", {})
+        for key, config in configs.items()
+        if config.get("enabled", False)
+    }
+
+class EnabledProfileCache:
+    """Enabled startup profiles, re-read only after the startup configurations changed
+    
+    Changes are noticed through the store's startup revision (increased by
+    every save, also from other processes), or the modification time of
+    config_file, so a check costs one small query instead of reading and
+    migrating every configuration.
+    """
+    
+    def __init__(self, config_file: Optional[Path] = None):
+        self.config_file = config_file
+        self._loaded = False
+        self._revision = None
+        self._profiles: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    
+    def _current_revision(self):
+        if self.config_file is None:
+            return get_store().startup_revision()
+        try:
+            return os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return None
+    
+    def get(self) -> Dict[str, Dict]:
+        """Parameter values of the enabled configurations, by camera key (see enabled_profiles)"""
+        with self._lock:
+            revision = self._current_revision()
+            if not self._loaded or revision != self._revision:
+                self._profiles = enabled_profiles(load_startup_configs(self.config_file))
+                self._revision = revision
+                self._loaded = True
+            return self._profiles
+    
+    def invalidate(self):
+        """Re-read the configurations on the next get()"""
+        with self._lock:
+            self._loaded = False
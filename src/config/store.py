@@ -0,0 +1,293 @@
+"""
+Config Store
+SQLite database (WAL mode) holding camera configurations, backups and startup profiles
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_FILE = Path.home() / ".camloader" / "camloader.db"
+
+# Per-device JSON files of earlier versions, imported on first run
+LEGACY_CONFIG_DIR = Path(__file__).parent.parent.parent / "data" / "configs"
+LEGACY_STARTUP_FILE = Path.home() / ".camloader" / "startup_config.json"
+
+KIND_CONFIG = "config"
+KIND_BACKUP = "backup"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    camera_id   TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    device_path TEXT,
+    device_name TEXT,
+    saved_at    TEXT,
+    data        TEXT NOT NULL,
+    PRIMARY KEY (camera_id, kind)
+);
+CREATE INDEX IF NOT EXISTS configs_listing ON configs (kind, camera_id, device_path, device_name, saved_at);
+CREATE TABLE IF NOT EXISTS startup_profiles (
+    camera_id TEXT PRIMARY KEY,
+    enabled   INTEGER NOT NULL,
+    data      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class ConfigStore:
+    """Configurations, parameter backups and startup profiles in one database
+    
+    Configurations and backups are rows keyed by (camera key, kind) whose
+    header fields (device path, name, save time) are columns next to the
+    JSON payload; a covering index answers listings without reading any
+    payload. WAL mode lets the GUI, the daemon and ``--apply-startup``
+    read while another process writes.
+    
+    One connection is shared by all threads of a process, serialized by a
+    lock; batches are written in a single transaction.
+    """
+    
+    # Seconds to wait for another process's write transaction
+    BUSY_TIMEOUT = 5.0
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else DEFAULT_STORE_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), timeout=self.BUSY_TIMEOUT,
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # Durable per checkpoint, never corrupt
+        self._conn.executescript(SCHEMA)
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+    
+    # Camera configurations and backups
+    
+    @staticmethod
+    def _row(camera_id: str, kind: str, data: Dict) -> Tuple:
+        saved_at = data.get("saved_at") or data.get("backed_up_at") or data.get("imported_at")
+        return (camera_id, kind, data.get("device_path"), data.get("device_name"), saved_at,
+                json.dumps(data, separators=(',', ':')))
+    
+    def put(self, camera_id: str, kind: str, data: Dict):
+        """Insert or replace the configuration (or backup) of a camera"""
+        self.put_many({(camera_id, kind): data})
+    
+    def put_many(self, items: Dict[Tuple[str, str], Dict]):
+        """Insert or replace several entries, keyed by (camera key, kind), in one transaction"""
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO configs (camera_id, kind, device_path, device_name, saved_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [self._row(camera_id, kind, data) for (camera_id, kind), data in items.items()]
+            )
+    
+    def get(self, camera_id: str, kind: str = KIND_CONFIG) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM configs WHERE camera_id = ? AND kind = ?", (camera_id, kind)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def delete(self, camera_id: str) -> bool:
+        """Delete configuration and backup of a camera"""
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM configs WHERE camera_id = ?", (camera_id,)).rowcount > 0
+    
+    def list(self, kind: str = KIND_CONFIG) -> List[Dict[str, Optional[str]]]:
+        """Header fields of all entries of a kind (from the index, payloads are not read)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT camera_id, device_path, device_name, saved_at FROM configs "
+                "WHERE kind = ? ORDER BY camera_id", (kind,)
+            ).fetchall()
+        return [
+            {"camera_id": camera_id, "device_path": device_path, "device_name": device_name, "saved_at": saved_at}
+            for camera_id, device_path, device_name, saved_at in rows
+        ]
+    
+    def load_all(self, kind: str = KIND_CONFIG) -> Dict[str, Dict]:
+        """All entries of a kind by camera key"""
+        with self._lock:
+            rows = self._conn.execute("SELECT camera_id, data FROM configs WHERE kind = ?", (kind,)).fetchall()
+        return {camera_id: json.loads(data) for camera_id, data in rows}
+    
+    def rename(self, old_id: str, new_id: str) -> int:
+        """Move the entries of a camera key to another key (skipping kinds new_id already has)
+        
+        Returns:
+            Number of moved entries
+        """
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT kind, data FROM configs WHERE camera_id = ? AND kind NOT IN "
+                "(SELECT kind FROM configs WHERE camera_id = ?)", (old_id, new_id)
+            ).fetchall()
+            for kind, data in rows:
+                data = json.loads(data)
+                data["camera_id"] = new_id
+                conn.execute(
+                    "INSERT INTO configs (camera_id, kind, device_path, device_name, saved_at, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", self._row(new_id, kind, data)
+                )
+                conn.execute("DELETE FROM configs WHERE camera_id = ? AND kind = ?", (old_id, kind))
+            return len(rows)
+    
+    # Startup profiles
+    
+    def startup_configs(self) -> Dict[str, Dict]:
+        """Startup configurations by camera key (see config.startup)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT camera_id, data FROM startup_profiles ORDER BY rowid").fetchall()
+        return {camera_id: json.loads(data) for camera_id, data in rows}
+    
+    def replace_startup_configs(self, configs: Dict[str, Dict]):
+        """Replace all startup configurations in one transaction"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM startup_profiles")
+            conn.executemany(
+                "INSERT INTO startup_profiles (camera_id, enabled, data) VALUES (?, ?, ?)",
+                [(camera_id, int(bool(config.get("enabled", False))), json.dumps(config, separators=(',', ':')))
+                 for camera_id, config in configs.items()]
+            )
+            self._bump_startup_revision(conn)
+    
+    def startup_revision(self) -> int:
+        """Counter increased by every change of the startup configurations (by any process)"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'startup_revision'").fetchone()
+        return int(row[0]) if row else 0
+    
+    @staticmethod
+    def _bump_startup_revision(conn: sqlite3.Connection):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('startup_revision', '1') "
+            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+    
+    # Import of earlier per-device files
+    
+    def _imported(self, source: Path) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM meta WHERE key = ?", (f"imported:{source.resolve()}",)
+            ).fetchone() is not None
+    
+    def import_files(self, config_dir: Optional[Path] = None, startup_file: Optional[Path] = None) -> int:
+        """Import the JSON files of earlier versions, once per source
+        
+        Configurations and backups from config_dir (``<key>.json`` /
+        ``<key>_backup.json``) are added unless the store already has an
+        entry for the camera; startup configurations are imported if the
+        store has none. The files are left in place.
+        
+        Returns:
+            Number of imported entries
+        """
+        items: Dict[Tuple[str, str], Dict] = {}
+        startup: Dict[str, Dict] = {}
+        sources = []
+        
+        if config_dir is not None and Path(config_dir).is_dir() and not self._imported(Path(config_dir)):
+            sources.append(Path(config_dir))
+            for config_file in sorted(Path(config_dir).glob("*.json")):
+                try:
+                    with open(config_file, 'r') as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping unreadable config file {config_file}: {e}")
+                    continue
+                camera_id = data.get("camera_id", data.get("device_path"))
+                if camera_id:
+                    kind = KIND_BACKUP if config_file.name.endswith("_backup.json") else KIND_CONFIG
+                    items[(camera_id, kind)] = data
+        
+        if startup_file is not None and Path(startup_file).is_file() and not self._imported(Path(startup_file)):
+            sources.append(Path(startup_file))
+            try:
+                with open(startup_file, 'r') as f:
+                    startup = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable startup configuration {startup_file}: {e}")
+        
+        if not sources:
+            return 0
+        
+        with self._transaction() as conn:
+            imported = 0
+            for (camera_id, kind), data in items.items():
+                imported += conn.execute(
+                    "INSERT OR IGNORE INTO configs (camera_id, kind, device_path, device_name, saved_at, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", self._row(camera_id, kind, data)
+                ).rowcount
+            if startup and conn.execute("SELECT COUNT(*) FROM startup_profiles").fetchone()[0] == 0:
+                conn.executemany(
+                    "INSERT INTO startup_profiles (camera_id, enabled, data) VALUES (?, ?, ?)",
+                    [(camera_id, int(bool(config.get("enabled", False))), json.dumps(config, separators=(',', ':')))
+                     for camera_id, config in startup.items()]
+                )
+                self._bump_startup_revision(conn)
+                imported += len(startup)
+            conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, '1')",
+                             [(f"imported:{source.resolve()}",) for source in sources])
+        
+        if imported:
+            logger.info(f"Imported {imported} configuration(s) from {', '.join(map(str, sources))} into {self.path}")
+        return imported
+
+class _Transaction:
+    """Holds the store lock for a BEGIN IMMEDIATE ... COMMIT / ROLLBACK block"""
+    
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock):
+        self._conn = conn
+        self._lock = lock
+    
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._conn
+    
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        finally:
+            self._lock.release()
+        return False
+
+_default_store: Optional[ConfigStore] = None
+_default_lock = threading.Lock()
+
+def get_store() -> ConfigStore:
+    """Process-wide store at DEFAULT_STORE_FILE
+    
+    Created on first use, which imports the files of earlier versions
+    (LEGACY_CONFIG_DIR, LEGACY_STARTUP_FILE) once.
+    """
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ConfigStore()
+            try:
+                _default_store.import_files(LEGACY_CONFIG_DIR, LEGACY_STARTUP_FILE)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to import existing configuration files: {e}")
+        return _default_store
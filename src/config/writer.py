@@ -0,0 +1,231 @@
+"""
+Config Write-Behind
+Atomic JSON writes and a background writer coalescing repeated saves
+"""
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+def write_json_atomic(path, data: Any, indent: Optional[int] = None):
+    """Write JSON to a temporary file next to path, then rename it over path
+    
+    Readers (and a crash mid-write) see either the old or the new file,
+    never a truncated one. Without indent the JSON is written compactly.
+    """
+    path = Path(path)
+    separators = None if indent is not None else (',', ':')
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent, separators=separators)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+class BatchWriteError(OSError):
+    """Some entries of a batch could not be written
+    
+    Attributes:
+        failed: Key -> error of each entry that was not written
+    """
+    
+    def __init__(self, failed: Dict[Hashable, Exception]):
+        super().__init__(f"{len(failed)} entr{'y' if len(failed) == 1 else 'ies'} not written: "
+                         + "; ".join(f"{key}: {error}" for key, error in failed.items()))
+        self.failed = failed
+
+def write_json_files(batch: Dict[Hashable, Any]):
+    """Default ConfigWriter batch writer: one atomic JSON file per path
+    
+    Raises:
+        BatchWriteError: for the files that could not be written (the others are)
+    """
+    failed = {}
+    for path, data in batch.items():
+        try:
+            write_json_atomic(path, data)
+        except Exception as e:
+            failed[path] = e
+    if failed:
+        raise BatchWriteError(failed)
+
+class ConfigWriter:
+    """Background writer where the latest data of a key wins
+    
+    ``submit()`` only queues the data and returns. A worker thread hands
+    everything pending to ``write_batch`` (by default write_json_files,
+    with file paths as keys; ConfigStore.put_many writes a batch in one
+    transaction) ``delay`` seconds after the first pending save, so a
+    burst of saves of the same key costs one write. ``pending()`` returns
+    data not written yet, so readers never see older data than the last
+    save.
+    
+    If write_batch raises, the entries it did not write (all of them,
+    unless it raises BatchWriteError) are queued again, unless a newer
+    save of the same key arrived meanwhile, and retried after
+    RETRY_DELAY seconds, doubling up to MAX_RETRY_DELAY while writes keep
+    failing. flush() and close() return False while entries are unwritten.
+    
+    Queued data is written by flush(), by close() and at interpreter exit;
+    data submitted after close() is written right away.
+    """
+    
+    # Seconds a save waits for newer saves of the same key
+    DEFAULT_DELAY = 0.25
+    
+    # Backoff after a failed write (e.g. disk full, permissions)
+    RETRY_DELAY = 1.0
+    MAX_RETRY_DELAY = 30.0
+    
+    def __init__(self, delay: float = DEFAULT_DELAY,
+                 write_batch: Optional[Callable[[Dict[Hashable, Any]], None]] = None):
+        self.delay = delay
+        self.write_batch = write_batch or write_json_files
+        self._cond = threading.Condition()
+        self._pending: Dict[Hashable, Any] = {}  # key -> data
+        self._writing: Dict[Hashable, Any] = {}  # batch being written
+        self._first_pending: Optional[float] = None
+        self._flushing = 0
+        self._failures = 0  # Consecutive failed writes
+        self._failed_writes = 0  # Failed writes so far (flush() watches for new ones)
+        self._retry_at: Optional[float] = None
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        atexit.register(self.close)
+    
+    def submit(self, key: Hashable, data: Any):
+        """Queue data for key, replacing data still pending for it"""
+        with self._cond:
+            if not self._closed:
+                if not self._pending:
+                    self._first_pending = time.monotonic()
+                self._pending[key] = data
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="camloader-config-writer", daemon=True)
+                    self._worker.start()
+                self._cond.notify_all()
+                return
+        self.write_batch({key: data})
+    
+    def pending(self, key: Hashable) -> Optional[Any]:
+        """Data queued or being written for key, or None"""
+        with self._cond:
+            return self._pending.get(key, self._writing.get(key))
+    
+    def discard(self, key: Hashable):
+        """Drop data still queued for key (e.g. before deleting it)"""
+        with self._cond:
+            self._pending.pop(key, None)
+            self._cond.notify_all()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued now and wait until it is on disk
+        
+        A write failing during the flush ends it (its entries stay queued
+        for a retry).
+        
+        Returns:
+            False if the timeout expired or a write failed first
+        """
+        with self._cond:
+            failed_writes = self._failed_writes
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                self._cond.wait_for(
+                    lambda: not self._writing and (not self._pending or self._failed_writes > failed_writes),
+                    timeout
+                )
+                return not self._pending and not self._writing
+            finally:
+                self._flushing -= 1
+    
+    def close(self, timeout: float = 5.0) -> bool:
+        """Write what is still queued (up to timeout), then stop the worker
+        
+        Returns:
+            False if entries could not be written (they are lost)
+        """
+        written = self.flush(timeout) if self._worker is not None else True
+        with self._cond:
+            self._closed = True
+            if not written:
+                logger.error(f"{len(self._pending) + len(self._writing)} queued save(s) could not be written")
+                self._pending.clear()
+            self._cond.notify_all()
+        atexit.unregister(self.close)
+        return written
+    
+    def _next_batch(self) -> Optional[Dict[Hashable, Any]]:
+        """Wait until queued data is due (called with the lock held)"""
+        while True:
+            if not self._pending:
+                if self._closed:
+                    return None
+                self._cond.wait()
+                continue
+            
+            due = self._first_pending + self.delay
+            if self._retry_at is not None:
+                due = max(due, self._retry_at)
+            wait = due - time.monotonic()
+            if wait <= 0 or self._flushing or self._closed:
+                batch, self._pending = self._pending, {}
+                self._writing = batch
+                return batch
+            self._cond.wait(wait)
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                batch = self._next_batch()
+            if batch is None:
+                return
+            
+            try:
+                self.write_batch(batch)
+                failed = {}
+            except BatchWriteError as e:
+                failed = {key: batch[key] for key in e.failed if key in batch}
+                error = e
+            except Exception as e:
+                failed = batch
+                error = e
+            
+            with self._cond:
+                self._writing = {}
+                if failed and self._closed:
+                    logger.error(f"Failed to write {len(failed)} save(s) after close, giving up: {error}")
+                elif failed:
+                    self._requeue(failed, error)
+                else:
+                    self._failures = 0
+                    self._retry_at = None
+                self._cond.notify_all()
+    
+    def _requeue(self, failed: Dict[Hashable, Any], error: Exception):
+        """Queue entries of a failed write again, keeping newer saves (called with the lock held)"""
+        self._failures += 1
+        self._failed_writes += 1
+        retry_in = min(self.RETRY_DELAY * 2 ** (self._failures - 1), self.MAX_RETRY_DELAY)
+        self._retry_at = time.monotonic() + retry_in
+        if not self._pending:
+            self._first_pending = time.monotonic()
+        for key, data in failed.items():
+            self._pending.setdefault(key, data)
+        logger.error(f"Failed to write {len(failed)} queued save(s), retrying in {retry_in:g} s: {error}")
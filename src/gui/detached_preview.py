@@ -10,18 +10,7 @@ import logging
 import time
 from typing import Optional
 
-# Optional imports for different platforms
-try:
-    import cv2
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
-
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+from gui.imaging import load_cv2, load_pil
 
 logger = logging.getLogger(__name__)
 
@@ -143,7 +132,9 @@ class DetachedPreviewWindow:
     
     def start_preview(self):
         """Start the camera preview in detached window"""
-        if not CV2_AVAILABLE:
+        # OpenCV is imported on first use (see gui.imaging)
+        cv2 = load_cv2()
+        if cv2 is None:
             self.preview_label.config(
                 text="Preview not available\\nOpenCV (cv2) not installed\\nInstall with: pip install opencv-python"
             )
@@ -231,9 +222,11 @@ class DetachedPreviewWindow:
     
     def _preview_loop(self):
         """Main preview loop running in separate thread"""
-        if not CV2_AVAILABLE:
+        cv2 = load_cv2()
+        if cv2 is None:
             return
-            
+        pil = load_pil()
+        
         while self.preview_running and self.cap:
             try:
                 ret, frame = self.cap.read()
@@ -271,7 +264,8 @@ class DetachedPreviewWindow:
                 frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
                 
                 # Convert to PIL Image and then to PhotoImage
-                if PIL_AVAILABLE:
+                if pil:
+                    Image, ImageTk = pil
                     pil_image = Image.fromarray(frame_rgb)
                     photo = ImageTk.PhotoImage(pil_image)
                     
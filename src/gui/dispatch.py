@@ -0,0 +1,76 @@
+"""
+UI Dispatcher
+Hands results from background threads over to the Tk main thread
+"""
+
+import logging
+import queue
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class UiDispatcher:
+    """Single completion queue drained by a Tk ``after`` loop
+    
+    Tk widgets may only be touched from the thread running mainloop.
+    Background threads (device watcher, control events, parameter writer,
+    BackgroundController futures) queue callables here and the Tk thread
+    runs them in order.
+    """
+    
+    # How often the queue is drained (ms)
+    POLL_MS = 50
+    
+    def __init__(self, root, poll_ms: int = POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._queue: "queue.Queue" = queue.Queue()
+        self._after_id: Optional[str] = None
+    
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+    
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def call_soon(self, func: Callable, *args):
+        """Run func(*args) on the Tk thread (safe to call from any thread)"""
+        self._queue.put((func, args))
+    
+    def when_done(self, future: Future, on_result: Optional[Callable[[Any], None]] = None,
+                  on_error: Optional[Callable[[BaseException], None]] = None) -> Future:
+        """Call on_result(result) or on_error(exception) on the Tk thread
+        
+        Without on_error, failures are logged.
+        """
+        def done(f: Future):
+            error = f.exception()
+            if error is None:
+                if on_result:
+                    self.call_soon(on_result, f.result())
+            elif on_error:
+                self.call_soon(on_error, error)
+            else:
+                logger.error(f"Background operation failed: {error}")
+        
+        future.add_done_callback(done)
+        return future
+    
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    func, args = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    func(*args)
+                except Exception as e:
+                    logger.error(f"UI callback {getattr(func, '__name__', func)} failed: {e}", exc_info=True)
+        finally:
+            if self._after_id is not None:  # Not stopped by a callback
+                self._after_id = self.root.after(self.poll_ms, self._poll)
@@ -0,0 +1,45 @@
+"""
+Imaging Modules
+OpenCV and Pillow, imported on first use instead of at startup
+"""
+
+import importlib
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Module name -> imported module, or None if it is not installed
+_modules: Dict[str, Optional[Any]] = {}
+_lock = threading.Lock()
+
+def _import(name: str) -> Optional[Any]:
+    with _lock:
+        if name not in _modules:
+            try:
+                _modules[name] = importlib.import_module(name)
+                logger.debug(f"Imported {name}")
+            except ImportError as e:
+                logger.warning(f"{name} not available: {e}")
+                _modules[name] = None
+        return _modules[name]
+
+def load_cv2() -> Optional[Any]:
+    """The cv2 module, or None if OpenCV is not installed"""
+    return _import("cv2")
+
+def load_pil() -> Optional[Tuple[Any, Any]]:
+    """The (PIL.Image, PIL.ImageTk) modules, or None if Pillow is not installed"""
+    image_tk = _import("PIL.ImageTk")
+    if image_tk is None:
+        return None
+    return _import("PIL.Image"), image_tk
+
+def __getattr__(name: str) -> bool:
+    # CV2_AVAILABLE / PIL_AVAILABLE are resolved (and the modules imported) on first access
+    if name == "CV2_AVAILABLE":
+        return load_cv2() is not None
+    if name == "PIL_AVAILABLE":
+        return load_pil() is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
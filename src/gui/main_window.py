@@ -9,26 +9,21 @@ import threading
 import logging
 from typing import Optional
 
-# Optional imports for different platforms
-try:
-    import cv2
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
-    print("Warning: OpenCV (cv2) not available. Preview functionality will be limited.")
-
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-    print("Warning: PIL not available. Image processing will be limited.")
-
-from camera.controller import CameraController, CameraDevice
+from camera.background import BackgroundController
+from camera.controller import CameraController, CameraDevice, IS_LINUX
+from camera.enforcer import ConfigEnforcer
+from camera.identity import CameraIndex
+from camera.profile import DEFAULT_APPLY_TIMEOUT, DEFAULT_APPLY_WORKERS, apply_profile
+from camera.remote import RemoteCameraController
+from camera.watcher import DeviceWatcher
+from camera.writer import ParameterWriteQueue
 from config.manager import ConfigManager
+from config.startup import EnabledProfileCache, load_startup_configs, profiles_by_device
+from gui.dispatch import UiDispatcher
 from gui.parameter_frame import ParameterFrame
 from gui.preview_frame import PreviewFrame
 from gui.startup_config import StartupConfigWindow
+from utils.profiler import profile_begin, profile_end, profile_milestone, profile_span
 
 logger = logging.getLogger(__name__)
 
@@ -44,13 +39,27 @@ def show_messagebox(func, *args, **kwargs):
     return result
 
 class CamLoaderMainWindow:
-    """Main application window"""
+    """Main application window
+    
+    Camera I/O never runs on the Tk thread: detection and device
+    operations go through a BackgroundController, parameter writes through
+    a ParameterWriteQueue, and their results (like hotplug and control
+    events) come back through a single UiDispatcher queue.
+    """
     
-    def __init__(self, start_minimized=False, version="0.0.0"):
+    def __init__(self, start_minimized=False, version="0.0.0", probe_workers=None, force_probe=False,
+                 prefetch_parameters=True, write_rate=ParameterWriteQueue.DEFAULT_MAX_RATE, daemon_socket=None,
+                 enforce_interval=None, apply_workers=DEFAULT_APPLY_WORKERS, apply_timeout=DEFAULT_APPLY_TIMEOUT):
         self.version = version
         self.start_minimized = start_minimized  # Store for later use
+        self.probe_workers = probe_workers  # Concurrent device probes during detection
+        self.prefetch_parameters = prefetch_parameters  # Warm other cameras after the window is shown
+        self.enforce_interval = enforce_interval  # Startup profile watchdog (None = off)
+        self.apply_workers = apply_workers  # Cameras configured at once at startup
+        self.apply_timeout = apply_timeout  # Seconds before a camera's startup config is given up
         
-        self.root = tk.Tk()
+        with profile_span("create Tk root"):
+            self.root = tk.Tk()
         self.root.title(f"CamLoader v{version} - V4L2 Camera Controller")
         self.root.geometry("900x1000")  # Taller window for vertical layout
         
@@ -58,28 +67,51 @@ class CamLoaderMainWindow:
         if start_minimized:
             self.root.withdraw()
         
-        # Controllers
-        self.camera_controller = CameraController()
-        self.config_manager = ConfigManager()
+        # Controllers (the camera controller is created by detection, see refresh_cameras)
+        self.camera_controller: Optional[CameraController] = None
+        with profile_span("ConfigManager init"):
+            self.config_manager = ConfigManager()
+        
+        # Parameter writes from the GUI (results arrive on the device workers)
+        self.parameter_writer = ParameterWriteQueue(None, max_rate=write_rate,
+                                                    callback=self._on_parameter_written)
+        
+        # Camera I/O runs in the background (or in a camloader daemon, with
+        # daemon_socket), queued parameter writes included; results are
+        # handed to the Tk thread
+        self.background = BackgroundController(writer=self.parameter_writer, daemon_socket=daemon_socket)
+        self.dispatcher = UiDispatcher(self.root)
+        self._detecting = False
+        self._closing = False
         
-        # Current camera
+        # Current camera, and the cameras listed in the combobox by label
         self.current_camera: Optional[CameraDevice] = None
+        self.camera_index = CameraIndex()
         
         # Application state
         self.startup_complete = False  # Flag to prevent setting parameters during startup
+        self._startup_apply_span = None  # --profile-startup span of the startup config apply
+        
+        # Hotplug tracking (events arrive on the watcher thread)
+        self.device_watcher: Optional[DeviceWatcher] = None
+        self.enforcer: Optional[ConfigEnforcer] = None
+        self.startup_profiles = EnabledProfileCache()  # Re-read when the startup configs change
         
         # GUI Components
-        self.setup_ui()
+        with profile_span("setup_ui"):
+            self.setup_ui()
+        self.dispatcher.start()
         
         # Load saved configurations
-        self.load_saved_configs()
+        with profile_span("load_saved_configs"):
+            self.load_saved_configs()
         
-        # Apply startup configurations
-        self.apply_startup_configurations()
+        # Time to first paint (only recorded with --profile-startup)
+        self._expose_binding = self.root.bind("<Expose>", self._on_first_expose, add="+")
         
-        # Mark startup as complete
-        self.startup_complete = True
-        logger.info("Startup complete - parameter changes will now be applied")
+        # Detect cameras; startup configurations are applied once detection
+        # has finished (see _on_cameras_detected)
+        self.refresh_cameras(force_probe=force_probe)
         
         # Setup window close handler
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -92,8 +124,16 @@ class CamLoaderMainWindow:
             self.root.deiconify()
             self.root.update_idletasks()
             self.root.iconify()
+            profile_milestone("first_paint", minimized=True)
             logger.info("Started in minimized state")
     
+    def _on_first_expose(self, event=None):
+        """The window was drawn for the first time"""
+        if self._expose_binding:
+            self.root.unbind("<Expose>", self._expose_binding)
+            self._expose_binding = None
+            profile_milestone("first_paint")
+    
     def setup_ui(self):
         """Setup the user interface"""
         # Create main menu
@@ -116,14 +156,11 @@ class CamLoaderMainWindow:
         # Control panels
         self.create_control_panels(main_frame)
         
-        # Give parameter frame access to camera controller for unlock functionality
-        self.parameter_frame.set_camera_controller(self.camera_controller)
+        # Give parameter frame background access for refresh and unlock
+        self.parameter_frame.set_background(self.background, self.dispatcher)
         
         # Status bar
         self.create_status_bar()
-        
-        # Load cameras
-        self.refresh_cameras()
     
     def create_menu(self):
         """Create application menu"""
@@ -144,6 +181,7 @@ class CamLoaderMainWindow:
         camera_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Camera", menu=camera_menu)
         camera_menu.add_command(label="Refresh Cameras", command=self.refresh_cameras)
+        camera_menu.add_command(label="Rescan Cameras (ignore cache)", command=lambda: self.refresh_cameras(force_probe=True))
         camera_menu.add_command(label="Backup Parameters", command=self.backup_parameters)
         camera_menu.add_command(label="Restore Parameters", command=self.restore_parameters)
         camera_menu.add_separator()
@@ -189,7 +227,8 @@ class CamLoaderMainWindow:
     def create_control_panels(self, parent):
         """Create main control panels"""
         # Parameters panel - now on top
-        self.parameter_frame = ParameterFrame(parent, self.on_parameter_changed)
+        self.parameter_frame = ParameterFrame(parent, self.on_parameter_changed,
+                                              unlock_callback=self._on_parameter_unlocked)
         self.parameter_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         
         # Preview panel - now below parameters
@@ -207,40 +246,205 @@ class CamLoaderMainWindow:
         )
         status_bar.grid(row=2, column=0, sticky=(tk.W, tk.E))
     
-    def refresh_cameras(self):
-        """Refresh available cameras"""
-        self.status_var.set("Refreshing cameras...")
+    def refresh_cameras(self, force_probe=False):
+        """Refresh available cameras
         
-        try:
-            # Reinitialize camera controller
-            self.camera_controller = CameraController()
-            cameras = self.camera_controller.get_cameras()
-            
-            # Update combo box
-            camera_names = []
-            for camera in cameras:
-                name = str(camera)
-                if not camera.is_available:
-                    name += " [No Preview]"
-                camera_names.append(name)
-            
-            self.camera_combo['values'] = camera_names
-            
-            if cameras:
+        Detection runs in the background. Cameras show up in the list as
+        their probes finish, so the first one can be used before the
+        slowest device has answered.
+        
+        Args:
+            force_probe: Ignore the detection cache and re-probe every device
+        """
+        if self._detecting:
+            return
+        
+        self._detecting = True
+        self.status_var.set("Scanning for cameras...")
+        self.dispatcher.when_done(
+            self.background.detect(probe_workers=self.probe_workers, force_probe=force_probe,
+                                   on_camera_found=self._on_camera_found),
+            self._on_cameras_detected,
+            self._on_detection_failed
+        )
+    
+    def _on_camera_found(self, controller: CameraController, camera: CameraDevice):
+        """Detection callback (probe thread) - hand over to the Tk thread"""
+        self.dispatcher.call_soon(self._show_found_camera, controller, camera)
+    
+    def _show_found_camera(self, controller: CameraController, camera: CameraDevice):
+        """Add a camera to the list while detection is still running"""
+        if self._closing or not self._detecting:
+            return
+        
+        if controller is not self.camera_controller:
+            self._use_controller(controller)
+        
+        cameras = self.update_camera_list()
+        if not self.current_camera and camera in cameras:
+            # The first camera found is usable right away
+            self.camera_combo.current(cameras.index(camera))
+            self.on_camera_selected()
+        self.status_var.set(f"Scanning for cameras... {len(cameras)} found")
+    
+    def _use_controller(self, controller: CameraController):
+        """Replace the previous controller (its cameras are no longer shown)"""
+        if self.camera_controller:
+            self.background.close_controller(self.camera_controller)
+        self.camera_controller = controller
+        self.camera_controller.add_parameter_listener(self._on_parameters_changed)
+        if isinstance(controller, RemoteCameraController):
+            # Hotplug is tracked by the daemon (see start_device_watcher)
+            controller.add_device_listener(self._on_device_event)
+        self.background.set_controller(self.camera_controller)
+        self.parameter_writer.set_controller(self.camera_controller)
+        if self.device_watcher:
+            self.device_watcher.set_controller(self.camera_controller)
+        if self.enforcer:
+            self.enforcer.set_controller(self.camera_controller)
+        self.current_camera = None
+    
+    def _on_cameras_detected(self, controller: CameraController):
+        """Detection finished: show the complete camera list"""
+        self._detecting = False
+        if self._closing:
+            self.background.close_controller(controller)
+            return
+        
+        # No camera was reported while scanning (e.g. none connected)
+        if controller is not self.camera_controller:
+            self._use_controller(controller)
+        
+        # Update combo box (final detection order)
+        cameras = self.update_camera_list()
+        
+        if cameras:
+            if self.current_camera in cameras:
+                # Keep the camera picked while scanning, its index may have changed
+                self.camera_combo.current(cameras.index(self.current_camera))
+            else:
                 self.camera_combo.current(0)
                 self.on_camera_selected()
-                self.status_var.set(f"Found {len(cameras)} cameras")
-            else:
-                self.camera_combo.set("")
-                self.current_camera = None
-                self.parameter_frame.clear_parameters()
-                self.preview_frame.stop_preview()
-                self.status_var.set("No cameras found")
-                
+            self.status_var.set(f"Found {len(cameras)} cameras")
+            
+            # Load the remaining cameras' parameters once the UI is idle
+            if self.prefetch_parameters:
+                self.root.after_idle(self.start_parameter_prefetch)
+        else:
+            self.camera_combo.set("")
+            self.current_camera = None
+            self.parameter_frame.clear_parameters()
+            self.preview_frame.stop_preview()
+            self.status_var.set("No cameras found")
+        
+        if not self.startup_complete:
+            self.apply_startup_configurations()
+    
+    def _on_detection_failed(self, error: BaseException):
+        self._detecting = False
+        logger.error(f"Failed to refresh cameras: {error}")
+        self.status_var.set("Error refreshing cameras")
+        messagebox.showerror("Error", f"Failed to refresh cameras: {error}")
+        if not self.startup_complete:
+            self._finish_startup()
+    
+    def update_camera_list(self):
+        """Fill the camera combobox from the controller's current camera list"""
+        cameras = self.camera_controller.get_cameras()
+        self.camera_index = CameraIndex(cameras)
+        self.camera_combo['values'] = self.camera_index.labels()
+        return cameras
+    
+    def start_device_watcher(self):
+        """Start tracking camera hotplug so reconnects need no manual refresh"""
+        if not IS_LINUX or not self.camera_controller:
+            return
+        if isinstance(self.camera_controller, RemoteCameraController):
+            return
+        
+        try:
+            self.device_watcher = DeviceWatcher(self.camera_controller)
+            self.device_watcher.add_listener(self._on_device_event)
+            self.device_watcher.start()
         except Exception as e:
-            logger.error(f"Failed to refresh cameras: {e}")
-            self.status_var.set("Error refreshing cameras")
-            messagebox.showerror("Error", f"Failed to refresh cameras: {e}")
+            logger.warning(f"Failed to start device watcher: {e}")
+            self.device_watcher = None
+    
+    def _on_device_event(self, event, device_path, camera):
+        """Device watcher callback (watcher thread) - hand over to the Tk thread"""
+        self.dispatcher.call_soon(self._handle_device_event, event, device_path)
+    
+    def _on_parameters_changed(self, device_path, names):
+        """Parameter listener (event thread or caller) - hand over to the Tk thread"""
+        self.dispatcher.call_soon(self._show_parameter_changes, device_path, names)
+    
+    def _on_parameter_written(self, device_path, name, value, success):
+        """Parameter writer callback (device worker) - hand over to the Tk thread"""
+        if success and self.enforcer:
+            # Set by the user, the startup profile no longer applies to it
+            self.enforcer.ignore(device_path, [name])
+        self.dispatcher.call_soon(self._handle_write_result, device_path, name, value, success)
+    
+    def _show_parameter_changes(self, device_path, names):
+        """Redraw the rows of parameters whose state changed on the device"""
+        if self.current_camera and self.current_camera.device_path == device_path:
+            # Rows with a newer value queued would jump back while dragging
+            self.parameter_frame.update_parameters(
+                [name for name in names if not self.parameter_writer.is_pending(device_path, name)]
+            )
+    
+    def _handle_write_result(self, device_path, name, value, success):
+        """Report a completed parameter write once no newer value is queued"""
+        if not self.current_camera or self.current_camera.device_path != device_path:
+            return
+        if self.parameter_writer.is_pending(device_path, name):
+            return  # Superseded, the final write reports
+        
+        if success:
+            self.status_var.set(f"Set {name} = {value}")
+        else:
+            self.status_var.set(f"Failed to set {name}")
+        # Show what the device actually has (the old value if the write failed)
+        self.parameter_frame.update_parameters([name])
+    
+    def _handle_device_event(self, event, device_path):
+        """Update camera list, selection and startup config for one hotplug event"""
+        cameras = self.update_camera_list()
+        
+        if event == "added":
+            camera = self.camera_controller.get_camera(device_path)
+            if not camera:
+                return
+            if not self.enforcer:
+                # Otherwise the enforcer re-applies the drifted controls
+                self.apply_startup_configuration(device_path)
+            if not self.current_camera:
+                self.camera_combo.current(cameras.index(camera))
+                self.on_camera_selected()
+            self.status_var.set(f"Camera connected: {camera}")
+        
+        elif event == "removed":
+            if self.current_camera and self.current_camera.device_path == device_path:
+                if cameras:
+                    self.camera_combo.current(0)
+                    self.on_camera_selected()
+                else:
+                    self.camera_combo.set("")
+                    self.current_camera = None
+                    self.parameter_frame.clear_parameters()
+                    self.preview_frame.stop_preview()
+            elif self.current_camera in cameras:
+                # Indices shifted, re-select the current camera by its label
+                self.camera_combo.set(self.camera_combo['values'][cameras.index(self.current_camera)])
+            self.status_var.set(f"Camera disconnected: {device_path}")
+    
+    def start_parameter_prefetch(self):
+        """Warm parameters of the cameras that are not shown yet"""
+        try:
+            exclude = [self.current_camera.device_path] if self.current_camera else []
+            self.camera_controller.prefetch_parameters(exclude=exclude)
+        except Exception as e:
+            logger.warning(f"Failed to start parameter prefetch: {e}")
     
     def on_camera_selected(self, event=None):
         """Handle camera selection"""
@@ -252,39 +456,35 @@ class CamLoaderMainWindow:
             # Convert to string to handle StringVar or string
             selection = str(selection)
             
-            # Extract device path from selection
-            if "(" not in selection or ")" not in selection:
-                logger.warning(f"Invalid camera selection format: {selection}")
+            self.current_camera = self.camera_index.by_label(selection)
+            if not self.current_camera:
+                logger.warning(f"Unknown camera selection: {selection}")
                 return
+            device_path = self.current_camera.device_path
             
-            # Parse device path safely
-            try:
-                device_path = selection.split("(")[1].split(")")[0]
-            except (IndexError, AttributeError) as parse_error:
-                logger.error(f"Failed to parse device path from: {selection}, error: {parse_error}")
-                return
-                
-            self.current_camera = self.camera_controller.get_camera(device_path)
+            # Update parameter frame (controls may still need to be enumerated)
+            if self.current_camera.parameters_loaded:
+                self._show_camera_parameters(self.current_camera)
+            else:
+                self.parameter_frame.show_message("Loading parameters...")
+                self.dispatcher.when_done(
+                    self.background.load_parameters(device_path),
+                    self._show_camera_parameters,
+                    lambda e: logger.error(f"Failed to load parameters of {device_path}: {e}")
+                )
             
-            if self.current_camera:
-                # Update parameter frame
-                self.parameter_frame.set_camera(self.current_camera)
-                
-                # Update preview frame
-                self.preview_frame.set_camera(device_path)
-                
-                # Update detached preview if it exists
-                if hasattr(self.preview_frame, 'detached_window') and self.preview_frame.detached_window:
-                    try:
-                        self.preview_frame.detached_window.set_camera(device_path)
-                    except Exception as e:
-                        logger.warning(f"Failed to update detached preview: {e}")
-                
-                # Load saved configuration if available
-                self.load_camera_config()
-                
-                self.status_var.set(f"Selected: {self.current_camera.name}")
-                logger.info(f"Selected camera: {self.current_camera}")
+            # Update preview frame
+            self.preview_frame.set_camera(device_path)
+            
+            # Update detached preview if it exists
+            if hasattr(self.preview_frame, 'detached_window') and self.preview_frame.detached_window:
+                try:
+                    self.preview_frame.detached_window.set_camera(device_path)
+                except Exception as e:
+                    logger.warning(f"Failed to update detached preview: {e}")
+            
+            self.status_var.set(f"Selected: {self.current_camera.name}")
+            logger.info(f"Selected camera: {self.current_camera}")
             
         except Exception as e:
             import traceback
@@ -294,23 +494,30 @@ class CamLoaderMainWindow:
             self.root.focus_force()
             messagebox.showerror("Error", f"Failed to select camera: {e}", parent=self.root)
     
+    def _show_camera_parameters(self, camera: Optional[CameraDevice]):
+        """Display the parameters of the selected camera once they are loaded"""
+        if camera is None or camera is not self.current_camera:
+            return  # Another camera was selected meanwhile
+        
+        self.parameter_frame.set_camera(camera)
+        
+        # Keep the displayed lock states current without reloading
+        self.background.enable_control_events(camera.device_path)
+        
+        # Load saved configuration if available
+        self.load_camera_config()
+    
     def on_parameter_changed(self, param_name: str, value):
-        """Handle parameter value change"""
+        """Handle parameter value change
+        
+        The write is queued; while a slider is dragged only the latest value
+        is written, at most ParameterWriteQueue's rate per control.
+        """
         if not self.current_camera:
             return
         
         try:
-            success = self.camera_controller.set_parameter(
-                self.current_camera.device_path, 
-                param_name, 
-                value
-            )
-            
-            if success:
-                self.status_var.set(f"Set {param_name} = {value}")
-            else:
-                self.status_var.set(f"Failed to set {param_name}")
-                
+            self.parameter_writer.submit(self.current_camera.device_path, param_name, value)
         except Exception as e:
             logger.error(f"Failed to set parameter {param_name}: {e}")
             self.status_var.set("Error setting parameter")
@@ -321,17 +528,19 @@ class CamLoaderMainWindow:
             messagebox.showwarning("Warning", "No camera selected")
             return
         
-        try:
-            success = self.camera_controller.backup_parameters(self.current_camera.device_path)
+        def done(success):
             if success:
                 messagebox.showinfo("Success", "Parameters backed up successfully")
                 self.status_var.set("Parameters backed up")
             else:
                 messagebox.showerror("Error", "Failed to backup parameters")
-                
-        except Exception as e:
+        
+        def failed(e):
             logger.error(f"Failed to backup parameters: {e}")
             messagebox.showerror("Error", f"Failed to backup parameters: {e}")
+        
+        self.status_var.set("Backing up parameters...")
+        self.dispatcher.when_done(self.background.backup_parameters(self.current_camera.device_path), done, failed)
     
     def restore_parameters(self):
         """Restore original camera parameters"""
@@ -339,18 +548,24 @@ class CamLoaderMainWindow:
             messagebox.showwarning("Warning", "No camera selected")
             return
         
-        try:
-            success = self.camera_controller.restore_parameters(self.current_camera.device_path)
+        device_path = self.current_camera.device_path
+        
+        def done(success):
+            if self.enforcer:
+                self.enforcer.ignore(device_path)
             if success:
                 messagebox.showinfo("Success", "Parameters restored successfully")
                 self.parameter_frame.refresh_parameters()
                 self.status_var.set("Parameters restored")
             else:
                 messagebox.showerror("Error", "Failed to restore parameters")
-                
-        except Exception as e:
+        
+        def failed(e):
             logger.error(f"Failed to restore parameters: {e}")
             messagebox.showerror("Error", f"Failed to restore parameters: {e}")
+        
+        self.status_var.set("Restoring parameters...")
+        self.dispatcher.when_done(self.background.restore_parameters(device_path), done, failed)
     
     def save_config(self):
         """Save current configuration"""
@@ -358,14 +573,20 @@ class CamLoaderMainWindow:
             messagebox.showwarning("Warning", "No camera selected")
             return
         
-        try:
-            self.config_manager.save_camera_config(self.current_camera)
+        def done(result):
             messagebox.showinfo("Success", "Configuration saved successfully")
             self.status_var.set("Configuration saved")
-            
-        except Exception as e:
+        
+        def failed(e):
             logger.error(f"Failed to save configuration: {e}")
             messagebox.showerror("Error", f"Failed to save configuration: {e}")
+        
+        # Saved once the values still being written have reached the device
+        camera = self.current_camera
+        self.dispatcher.when_done(
+            self.background.submit_settled(camera.device_path, self.config_manager.save_camera_config, camera),
+            done, failed
+        )
     
     def load_config(self):
         """Load configuration from file"""
@@ -386,8 +607,9 @@ class CamLoaderMainWindow:
     def load_saved_configs(self):
         """Load saved configurations for all cameras"""
         try:
-            self.config_manager.load_all_configs()
-            logger.info("Loaded saved configurations")
+            # Configurations are read per camera when shown; only migrate here
+            self.config_manager.migrate_legacy_configs()
+            logger.info(f"{len(self.config_manager.list_saved_configs())} saved configuration(s)")
             
         except Exception as e:
             logger.warning(f"Failed to load saved configurations: {e}")
@@ -403,7 +625,7 @@ class CamLoaderMainWindow:
             return
         
         try:
-            config = self.config_manager.get_camera_config(self.current_camera.device_path)
+            config = self.config_manager.get_camera_config(self.current_camera.key)
             if config and isinstance(config, dict):
                 logger.info(f"Loaded saved config for {self.current_camera.device_path}, refreshing display only")
                 
@@ -526,7 +748,7 @@ class CamLoaderMainWindow:
             font=("Arial", 9, "bold")
         ).pack(anchor="w", pady=(0, 5))
         
-        config_path = str(self.config_manager.config_dir)
+        config_path = str(self.config_manager.store.path.parent)
         config_label = ttk.Label(
             config_dir_frame,
             text=config_path,
@@ -609,7 +831,7 @@ class CamLoaderMainWindow:
         import subprocess
         import platform
         
-        config_path = str(self.config_manager.config_dir)
+        config_path = str(self.config_manager.store.path.parent)
         
         try:
             system = platform.system()
@@ -628,77 +850,200 @@ class CamLoaderMainWindow:
     
     def show_startup_config(self):
         """Show startup configuration window"""
+        if not self.camera_controller:
+            messagebox.showinfo("Info", "Cameras are still being detected")
+            return
+        
         try:
-            StartupConfigWindow(self.root, self.camera_controller, self.config_manager)
+            StartupConfigWindow(self.root, self.camera_controller, self.config_manager,
+                                self.background, self.dispatcher)
         except Exception as e:
             logger.error(f"Failed to open startup configuration: {e}")
             messagebox.showerror("Error", f"Failed to open startup configuration: {e}")
     
+    def _load_startup_configs(self) -> dict:
+        """Read the startup configurations from the config store"""
+        return load_startup_configs()
+    
+    def _apply_startup_config(self, controller: CameraController, device_path: str, config: dict) -> bool:
+        """Apply one camera's startup configuration (runs on the device's worker)
+        
+        Returns:
+            True if the configuration was enabled and had parameters to apply
+        """
+        logger.info(f"Processing startup config for device: {device_path}")
+        
+        if not config.get("enabled", False):
+            logger.info(f"Startup config disabled for {device_path}, skipping")
+            return False
+        
+        camera = controller.get_camera(device_path)
+        if not camera:
+            logger.warning(f"Startup config: Camera {device_path} not found")
+            return False
+        
+        logger.info(f"Applying startup config to {device_path} ({camera.name})")
+        parameters = config.get("parameters", {})
+        
+        # Only controls that differ from the device's current values are written
+        with profile_span(f"apply startup config {device_path}", "apply"):
+            report = apply_profile(controller, device_path, parameters)
+        for param_name in report.failed:
+            logger.warning(f"Failed to set {param_name} on {device_path}")
+        
+        if parameters:
+            logger.info(f"Applied startup config for {device_path} ({camera.name}): {report.summary()}")
+            return True
+        return False
+    
     def apply_startup_configurations(self):
-        """Apply startup configurations on application start"""
+        """Apply startup configurations on application start
+        
+        Cameras are configured concurrently in the background (at most
+        apply_workers at a time, each given up after apply_timeout seconds);
+        startup completes (see _finish_startup) once all have a result.
+        """
         try:
-            from pathlib import Path
-            import json
-            
-            config_path = Path.home() / ".camloader" / "startup_config.json"
-            if not config_path.exists():
-                return
-            
-            with open(config_path, 'r') as f:
-                startup_configs = json.load(f)
-            
-            applied_count = 0
-            for device_path, config in startup_configs.items():
-                logger.info(f"Processing startup config for device: {device_path}")
-                
-                if not config.get("enabled", False):
-                    logger.info(f"Startup config disabled for {device_path}, skipping")
-                    continue
-                
-                camera = self.camera_controller.get_camera(device_path)
-                if not camera:
-                    logger.warning(f"Startup config: Camera {device_path} not found")
-                    continue
-                
-                logger.info(f"Applying startup config to {device_path} ({camera.name})")
-                success_count = 0
-                total_count = 0
-                
-                for param_name, param_value in config.get("parameters", {}).items():
-                    total_count += 1
-                    logger.debug(f"Setting {param_name}={param_value} on {device_path}")
-                    if self.camera_controller.set_parameter(device_path, param_name, param_value):
-                        success_count += 1
-                        logger.debug(f"Successfully set {param_name} on {device_path}")
-                    else:
-                        logger.warning(f"Failed to set {param_name} on {device_path}")
-                
-                if total_count > 0:
-                    applied_count += 1
-                    logger.info(f"Applied startup config for {device_path} ({camera.name}): {success_count}/{total_count} parameters")
-            
-            if applied_count > 0:
-                self.status_var.set(f"Applied startup configurations for {applied_count} cameras")
-                
+            profiles = self._enabled_startup_profiles()
         except Exception as e:
             logger.warning(f"Failed to apply startup configurations: {e}")
+            profiles = {}
+        
+        self._startup_apply_span = profile_begin("apply_startup_configurations", cameras=len(profiles))
+        self.dispatcher.when_done(
+            self.background.apply_profiles(profiles, self.apply_workers, self.apply_timeout),
+            self._on_startup_configs_applied
+        )
+    
+    def _on_startup_configs_applied(self, summary):
+        if summary.device_paths:
+            logger.info(f"Applied startup configurations: {summary.summary()}")
+            for device_path, error in summary.errors.items():
+                logger.warning(f"Failed to apply startup configuration for {device_path}: {error}")
+            self.status_var.set(f"Startup configurations: {summary.summary()}")
+            # Show the values written by the startup configuration
+            self.parameter_frame.refresh_parameters()
+        
+        profile_end(self._startup_apply_span, applied=len(summary.reports), elapsed_ms=round(summary.elapsed_ms, 1))
+        self._finish_startup()
+    
+    def _finish_startup(self):
+        """Mark startup as complete and start tracking camera hotplug"""
+        self.startup_complete = True
+        profile_milestone("startup_complete")
+        logger.info("Startup complete - parameter changes will now be applied")
+        if logger.isEnabledFor(logging.DEBUG) and self.camera_controller:
+            logger.debug("External commands during startup:\n" + self.camera_controller.executor.format_stats())
+        
+        # Track camera hotplug from now on
+        self.start_device_watcher()
+        self.start_config_enforcer()
+    
+    def start_config_enforcer(self):
+        """Re-apply startup configurations when cameras reconnect or drift (--enforce)"""
+        if self.enforce_interval is None or not self.camera_controller:
+            return
+        if isinstance(self.camera_controller, RemoteCameraController):
+            return  # Enforcement is up to the daemon (--daemon --enforce)
+        
+        self.enforcer = ConfigEnforcer(
+            self.camera_controller,
+            self._enabled_startup_profiles,
+            interval=self.enforce_interval,
+            callback=self._on_profile_enforced,
+            submit=self.background.submit_settled
+        )
+        if self.device_watcher:
+            self.device_watcher.add_listener(self.enforcer.on_device_event)
+        self.enforcer.start()
+    
+    def _on_profile_enforced(self, device_path, report):
+        """Enforcer callback (enforcer thread) - hand over to the Tk thread"""
+        self.dispatcher.call_soon(self._show_enforced_profile, device_path, report)
+    
+    def _show_enforced_profile(self, device_path, report):
+        if report.written:
+            self.status_var.set(f"Re-applied startup configuration to {device_path}: "
+                                f"{len(report.written)} control(s)")
+        self._show_parameter_changes(device_path, report.written)
+    
+    def _on_parameter_unlocked(self, device_path, names):
+        """The user unlocked a parameter: keep the enforcer off the auto modes involved"""
+        if self.enforcer:
+            self.enforcer.ignore(device_path, names)
+    
+    def _enabled_startup_profiles(self) -> dict:
+        """Enabled startup profiles by the current device path of their camera"""
+        return profiles_by_device(self.startup_profiles.get(), self.camera_controller.get_camera)
+    
+    def apply_startup_configuration(self, device_path: str):
+        """Apply the startup configuration of a single (re)connected camera"""
+        try:
+            camera = self.camera_controller.get_camera(device_path)
+            config = self._load_startup_configs().get(camera.key if camera else device_path)
+        except Exception as e:
+            logger.warning(f"Failed to apply startup configuration for {device_path}: {e}")
+            return
+        
+        if config:
+            self.dispatcher.when_done(
+                self.background.submit(device_path, self._apply_startup_config,
+                                       self.camera_controller, device_path, config),
+                on_error=lambda e: logger.warning(f"Failed to apply startup configuration for {device_path}: {e}")
+            )
     
     def on_closing(self):
-        """Handle application closing"""
+        """Handle application closing
+        
+        Queued parameter writes, saving the configuration and stopping the
+        controller run in the background; the window is hidden right away
+        and destroyed when they are done.
+        """
+        if self._closing:
+            return
+        self._closing = True
+        
         try:
+            # Stop hotplug tracking and profile enforcement
+            if self.device_watcher:
+                self.device_watcher.stop()
+                self.device_watcher = None
+            if self.enforcer:
+                self.enforcer.stop()
+                if self.enforcer.reapply_stats.count:
+                    logger.info(f"Startup profile re-apply after reconnect: {self.enforcer.stats()}")
+                self.enforcer = None
+            
             # Stop preview
             self.preview_frame.stop_preview()
-            
-            # Save current configuration if camera is selected
-            if self.current_camera:
-                self.config_manager.save_camera_config(self.current_camera)
-            
-            # Close application
-            self.root.destroy()
-            
+            self.root.withdraw()
         except Exception as e:
             logger.error(f"Error during application shutdown: {e}")
+        
+        camera = self.current_camera
+        controller = self.camera_controller
+        
+        def shutdown():
+            # Write the last slider values before the controller goes away
+            self.parameter_writer.close()
+            
+            # Save current configuration if camera is selected, and wait until it is on disk
+            if camera:
+                self.config_manager.save_camera_config(camera)
+            if not self.config_manager.close():
+                logger.error("Configuration changes could not be saved")
+            if controller:
+                controller.close()
+        
+        def finished(result=None):
+            self.background.shutdown()
             self.root.destroy()
+        
+        def failed(e):
+            logger.error(f"Error during application shutdown: {e}")
+            finished()
+        
+        self.dispatcher.when_done(self.background.submit(None, shutdown), finished, failed)
     
     def run(self):
         """Run the application"""
@@ -9,6 +9,7 @@ import logging
 from typing import Optional, Callable
 
 from camera.controller import CameraDevice, V4L2Parameter
+from camera.dependencies import locking_controls, manual_value
 from utils.parameter_tooltips import get_parameter_tooltip
 
 logger = logging.getLogger(__name__)
@@ -61,19 +62,23 @@ class ToolTip:
 class ParameterFrame(ttk.LabelFrame):
     """Frame for displaying and controlling camera parameters"""
     
-    def __init__(self, parent, parameter_changed_callback: Callable[[str, any], None]):
+    def __init__(self, parent, parameter_changed_callback: Callable[[str, any], None],
+                 unlock_callback: Optional[Callable[[str, list], None]] = None):
         super().__init__(parent, text="Camera Parameters", padding="10")
         
         self.parameter_changed_callback = parameter_changed_callback
+        self.unlock_callback = unlock_callback  # (device_path, [parameter and its auto modes])
         self.camera: Optional[CameraDevice] = None
-        self.camera_controller = None  # Will be set later
+        self.background = None  # Will be set later
+        self.dispatcher = None
         self.parameter_widgets = {}
         
         self.setup_ui()
     
-    def set_camera_controller(self, camera_controller):
-        """Set the camera controller for unlock functionality"""
-        self.camera_controller = camera_controller
+    def set_background(self, background, dispatcher):
+        """Set the background controller and UI dispatcher used for refresh and unlock"""
+        self.background = background
+        self.dispatcher = dispatcher
     
     def setup_ui(self):
         """Setup the parameter control interface"""
@@ -117,6 +122,16 @@ class ParameterFrame(ttk.LabelFrame):
         self.camera = camera
         self.create_parameter_controls()
     
+    def show_message(self, text: str):
+        """Show a message instead of parameters (e.g. while they are loading)"""
+        self.camera = None
+        self.clear_parameters()
+        ttk.Label(
+            self.scrollable_frame,
+            text=text,
+            font=("Arial", 10, "italic")
+        ).pack(pady=20)
+    
     def create_parameter_controls(self):
         """Create controls for all camera parameters"""
         # Clear existing widgets
@@ -246,7 +261,8 @@ class ParameterFrame(ttk.LabelFrame):
             'frame': frame,
             'control': control,
             'value_var': value_var,
-            'param': param
+            'param': param,
+            'locked': param.is_locked
         }
         
         # Add text entry reference if it exists
@@ -389,42 +405,105 @@ class ParameterFrame(ttk.LabelFrame):
                 logger.warning(f"Failed to destroy widget: {e}")
     
     def refresh_parameters(self):
-        """Refresh parameter values from camera"""
+        """Refresh parameter values from camera
+        
+        The values are read in the background; rows are updated when the
+        read completes (or right away with the last known values if there
+        is no background controller).
+        """
         if not self.camera:
             return
         
+        if not self.background:
+            self._show_values(self.camera)
+            return
+        
+        camera = self.camera
+        
+        def failed(e):
+            logger.warning(f"Failed to read current parameter values: {e}")
+            self._show_values(camera)
+        
+        # Pull current hardware values for all displayed parameters in one read
+        self.dispatcher.when_done(
+            self.background.get_parameters(camera.device_path, list(self.parameter_widgets)),
+            lambda values: self._show_values(camera),
+            failed
+        )
+    
+    def _show_values(self, camera: CameraDevice):
+        if camera is not self.camera:
+            return  # Another camera was selected meanwhile
         for param_name, widget_info in self.parameter_widgets.items():
-            param = widget_info['param']
-            value_var = widget_info['value_var']
-            control = widget_info['control']
-            
-            # Update value display
-            value_var.set(str(param.value))
+            self._show_value(widget_info)
+    
+    def update_parameters(self, names):
+        """Update only the rows of parameters whose state changed
+        
+        Rows whose lock state changed are rebuilt in place (lock indicator,
+        unlock button, enabled state); other rows just show the new value.
+        """
+        if not self.camera:
+            return
+        
+        for name in names:
+            widget_info = self.parameter_widgets.get(name)
+            param = self.camera.parameters.get(name)
+            if not widget_info or not param:
+                continue
             
-            # Update control widget
-            if isinstance(control, ttk.Scale):
-                control.set(param.value)
-            elif isinstance(control, ttk.Checkbutton):
-                # Get the associated BooleanVar and update it
-                control.invoke() if bool(param.value) != control.instate(['selected']) else None
+            if param.is_locked != widget_info['locked'] or param is not widget_info['param']:
+                old_frame = widget_info['frame']
+                self.create_parameter_control(param, 0)
+                self.parameter_widgets[name]['frame'].pack(fill="x", pady=2, before=old_frame)
+                old_frame.destroy()
+            else:
+                self._show_value(widget_info)
+    
+    def _show_value(self, widget_info: dict):
+        """Show a parameter's current value in its row"""
+        param = widget_info['param']
+        value_var = widget_info['value_var']
+        control = widget_info['control']
+        
+        # Update value display
+        value_var.set(str(param.value))
+        
+        # Update control widget
+        if isinstance(control, ttk.Scale):
+            control.set(param.value)
+        elif isinstance(control, ttk.Checkbutton):
+            # Get the associated BooleanVar and update it
+            control.invoke() if bool(param.value) != control.instate(['selected']) else None
     
     def try_unlock_parameter(self, param_name: str):
-        """Try to unlock a parameter"""
-        if not self.camera or not self.camera_controller:
+        """Try to unlock a parameter (runs in the background)"""
+        if not self.camera or not self.background:
+            return
+        
+        camera = self.camera
+        self.dispatcher.when_done(
+            self.background.try_unlock_parameter(camera.device_path, param_name),
+            lambda unlocked: self._show_unlock_result(camera, param_name, unlocked)
+        )
+    
+    def _show_unlock_result(self, camera: CameraDevice, param_name: str, unlocked: bool):
+        """Report the outcome of an automatic unlock attempt"""
+        if camera is not self.camera:
             return
         
         # Import here to avoid circular imports
         from tkinter import messagebox
         
-        # First try automatic unlock
-        if self.camera_controller.try_unlock_parameter(self.camera.device_path, param_name):
+        if unlocked:
+            if self.unlock_callback:
+                self.unlock_callback(camera.device_path, [param_name] + self._get_locking_parameters(param_name))
+            # The affected rows are updated through the controller's parameter
+            # listener, no full reload needed
             messagebox.showinfo(
                 "Success",
-                f"Parameter '{param_name}' has been unlocked!\n\nRefreshing parameter display..."
+                f"Parameter '{param_name}' has been unlocked!"
             )
-            # Refresh the parameter display
-            self.camera_controller.refresh_camera(self.camera.device_path)
-            self.create_parameter_controls()
             return
         
         # If automatic unlock failed, show manual instructions
@@ -432,8 +511,8 @@ class ParameterFrame(ttk.LabelFrame):
         
         if locking_params:
             message = f"Automatic unlock failed. To unlock '{param_name}', try manually disabling these auto modes:\n\n"
-            message += "\n".join([f"• {param}" for param in locking_params])
-            message += f"\n\nSet these parameters to 0 (Manual mode) to unlock '{param_name}'."
+            message += "\n".join([f"• {param} = {manual_value(param)}" for param in locking_params])
+            message += f"\n\nSet these parameters to the value shown (Manual mode) to unlock '{param_name}'."
             
             # Add current values of locking parameters
             message += "\n\nCurrent values:"
@@ -457,17 +536,7 @@ class ParameterFrame(ttk.LabelFrame):
     
     def _get_locking_parameters(self, param_name: str) -> list:
         """Get list of parameters that might be locking the given parameter"""
-        unlock_strategies = {
-            'exposure_absolute': ['exposure_auto'],
-            'focus_absolute': ['focus_auto'],
-            'white_balance_temperature': ['white_balance_temperature_auto'],
-            'gain': ['gain_automatic'],
-            'brightness': ['auto_exposure'],
-            'contrast': ['auto_exposure'],
-            'saturation': ['auto_exposure'],
-        }
-        
-        return unlock_strategies.get(param_name, [])
+        return locking_controls(param_name, self.camera.parameters if self.camera else None)
     
     def _disable_control(self, control):
         """Disable a control widget"""
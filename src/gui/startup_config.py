@@ -5,27 +5,41 @@ Allows users to configure which cameras start with which parameters
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
 import logging
 from typing import Dict, List, Optional
-from pathlib import Path
 
+from camera.background import BackgroundController
 from camera.controller import CameraController, CameraDevice, V4L2Parameter
+from camera.identity import CameraIndex
+from camera.profile import apply_profile
 from config.manager import ConfigManager
+from config.startup import load_startup_configs, save_startup_configs
+from gui.dispatch import UiDispatcher
 
 logger = logging.getLogger(__name__)
 
 class StartupConfigWindow:
-    """Window for configuring startup camera parameters"""
+    """Window for configuring startup camera parameters
     
-    def __init__(self, parent, camera_controller: CameraController, config_manager: ConfigManager):
+    Device I/O (detection, test apply, parameter loading) runs through the
+    main window's BackgroundController; results arrive via its dispatcher.
+    """
+    
+    def __init__(self, parent, camera_controller: CameraController, config_manager: ConfigManager,
+                 background: BackgroundController, dispatcher: UiDispatcher):
         self.parent = parent
         self.camera_controller = camera_controller
         self.config_manager = config_manager
+        self.background = background
+        self.dispatcher = dispatcher
+        
+        # Controller detected by refresh_cameras (the main window's one is not ours to close)
+        self._refreshed_controller: Optional[CameraController] = None
         
         # Create window
         self.window = tk.Toplevel(parent)
         self.window.title("Startup Configuration")
+        self.window.bind("<Destroy>", self._on_destroy, add="+")
         self.window.geometry("800x600")
         self.window.resizable(True, True)
         
@@ -130,14 +144,33 @@ class StartupConfigWindow:
         ttk.Button(buttons_frame, text="Test Selected", command=self.test_selected_config).pack(side="left")
     
     def refresh_cameras(self):
-        """Refresh available cameras"""
-        try:
-            self.camera_controller = CameraController()
+        """Refresh available cameras (detection runs in the background)"""
+        def done(controller):
+            if not self.window.winfo_exists():
+                self.background.close_controller(controller)
+                return
+            self._close_refreshed_controller()
+            self.camera_controller = self._refreshed_controller = controller
             self.populate_camera_list()
-            messagebox.showinfo("Success", "Camera list refreshed")
-        except Exception as e:
+            messagebox.showinfo("Success", "Camera list refreshed", parent=self.window)
+        
+        def failed(e):
             logger.error(f"Failed to refresh cameras: {e}")
             messagebox.showerror("Error", f"Failed to refresh cameras: {e}")
+        
+        self.dispatcher.when_done(
+            self.background.detect(probe_workers=self.camera_controller.probe_workers),
+            done, failed
+        )
+    
+    def _close_refreshed_controller(self):
+        if self._refreshed_controller:
+            self.background.close_controller(self._refreshed_controller)
+            self._refreshed_controller = None
+    
+    def _on_destroy(self, event):
+        if event.widget is self.window:
+            self._close_refreshed_controller()
     
     def populate_camera_list(self):
         """Populate the camera configuration list"""
@@ -149,7 +182,7 @@ class StartupConfigWindow:
         cameras = self.camera_controller.get_cameras()
         
         for camera in cameras:
-            config = self.startup_configs.get(camera.device_path, {})
+            config = self.startup_configs.get(camera.key, {})
             enabled = config.get("enabled", False)
             param_count = len(config.get("parameters", {}))
             
@@ -158,7 +191,8 @@ class StartupConfigWindow:
             if not camera.is_available:
                 camera_name += " (No Preview)"
             
-            self.tree.insert("", "end", values=(
+            # Items are identified by the camera key the configuration is saved under
+            self.tree.insert("", "end", iid=camera.key, values=(
                 camera_name,
                 camera.device_path,
                 "Yes" if enabled else "No",
@@ -186,11 +220,8 @@ class StartupConfigWindow:
             messagebox.showwarning("Warning", "Please select a camera to edit")
             return
         
-        item = self.tree.item(selection[0])
-        device_path = item["values"][1]
-        
         # Find camera
-        camera = self.camera_controller.get_camera(device_path)
+        camera = self.camera_controller.get_camera(selection[0])
         if not camera:
             messagebox.showerror("Error", "Camera not found")
             return
@@ -204,24 +235,32 @@ class StartupConfigWindow:
             messagebox.showwarning("Warning", "Please select a camera to remove")
             return
         
-        item = self.tree.item(selection[0])
-        device_path = item["values"][1]
-        camera_name = item["values"][0]
+        camera_key = selection[0]
+        camera_name = self.tree.item(camera_key)["values"][0]
         
         if messagebox.askyesno("Confirm", f"Remove startup configuration for {camera_name}?"):
-            if device_path in self.startup_configs:
-                del self.startup_configs[device_path]
+            if camera_key in self.startup_configs:
+                del self.startup_configs[camera_key]
             self.populate_camera_list()
     
     def show_camera_config_dialog(self, camera: Optional[CameraDevice] = None):
         """Show camera configuration dialog"""
-        dialog = CameraConfigDialog(self.window, self.camera_controller, camera, self.startup_configs)
+        if camera and not camera.parameters_loaded:
+            # Enumerate the controls in the background, then open the dialog
+            self.dispatcher.when_done(
+                self.background.submit(camera.device_path, camera.load_parameters),
+                lambda result: self.show_camera_config_dialog(camera) if self.window.winfo_exists() else None
+            )
+            return
+        
+        dialog = CameraConfigDialog(self.window, self.camera_controller, camera, self.startup_configs,
+                                    self.background, self.dispatcher)
         self.window.wait_window(dialog.window)
         
         # Refresh list if configuration was updated
         if dialog.result:
-            device_path, config = dialog.result
-            self.startup_configs[device_path] = config
+            camera_key, config = dialog.result
+            self.startup_configs[camera_key] = config
             self.populate_camera_list()
     
     def test_selected_config(self):
@@ -231,41 +270,39 @@ class StartupConfigWindow:
             messagebox.showwarning("Warning", "Please select a camera to test")
             return
         
-        item = self.tree.item(selection[0])
-        device_path = item["values"][1]
-        
-        if device_path not in self.startup_configs:
+        camera_key = selection[0]
+        if camera_key not in self.startup_configs:
             messagebox.showwarning("Warning", "No configuration found for selected camera")
             return
         
-        config = self.startup_configs[device_path]
+        config = self.startup_configs[camera_key]
         if not config.get("enabled", False):
             messagebox.showinfo("Info", "Configuration is disabled")
             return
         
-        try:
-            # Apply configuration
-            camera = self.camera_controller.get_camera(device_path)
-            if not camera:
-                messagebox.showerror("Error", "Camera not found")
-                return
-            
-            success_count = 0
-            total_count = 0
-            
-            for param_name, param_value in config.get("parameters", {}).items():
-                total_count += 1
-                if self.camera_controller.set_parameter(device_path, param_name, param_value):
-                    success_count += 1
-            
+        # Apply configuration
+        camera = self.camera_controller.get_camera(camera_key)
+        if not camera:
+            messagebox.showerror("Error", "Camera not found")
+            return
+        
+        device_path = camera.device_path
+        parameters = config.get("parameters", {})
+        
+        def done(report):
             messagebox.showinfo(
                 "Test Result", 
-                f"Applied {success_count}/{total_count} parameters successfully"
+                f"Applied configuration: {report.summary()}"
             )
-            
-        except Exception as e:
+        
+        def failed(e):
             logger.error(f"Failed to test configuration: {e}")
             messagebox.showerror("Error", f"Failed to test configuration: {e}")
+        
+        self.dispatcher.when_done(
+            self.background.submit(device_path, apply_profile, self.camera_controller, device_path, parameters),
+            done, failed
+        )
     
     def apply_configs(self):
         """Apply current configurations"""
@@ -290,28 +327,19 @@ class StartupConfigWindow:
         self.window.destroy()
     
     def load_startup_configs(self):
-        """Load startup configurations from file"""
+        """Load startup configurations from the config store"""
         try:
-            config_path = Path.home() / ".camloader" / "startup_config.json"
-            if config_path.exists():
-                with open(config_path, 'r') as f:
-                    self.startup_configs = json.load(f)
-                logger.info("Loaded startup configurations")
+            self.startup_configs = load_startup_configs()
+            logger.info("Loaded startup configurations")
             self.populate_camera_list()
         except Exception as e:
             logger.warning(f"Failed to load startup configurations: {e}")
             self.populate_camera_list()
     
     def save_startup_configs(self):
-        """Save startup configurations to file"""
+        """Save startup configurations to the config store"""
         try:
-            config_path = Path.home() / ".camloader"
-            config_path.mkdir(exist_ok=True)
-            
-            config_file = config_path / "startup_config.json"
-            with open(config_file, 'w') as f:
-                json.dump(self.startup_configs, f, indent=2)
-            
+            save_startup_configs(self.startup_configs)
             logger.info("Saved startup configurations")
         except Exception as e:
             logger.error(f"Failed to save startup configurations: {e}")
@@ -320,9 +348,12 @@ class StartupConfigWindow:
 class CameraConfigDialog:
     """Dialog for configuring individual camera parameters"""
     
-    def __init__(self, parent, camera_controller: CameraController, camera: Optional[CameraDevice], startup_configs: Dict):
+    def __init__(self, parent, camera_controller: CameraController, camera: Optional[CameraDevice], startup_configs: Dict,
+                 background: BackgroundController, dispatcher: UiDispatcher):
         self.parent = parent
         self.camera_controller = camera_controller
+        self.background = background
+        self.dispatcher = dispatcher
         self.camera = camera
         self.startup_configs = startup_configs
         self.result = None
@@ -392,10 +423,11 @@ class CameraConfigDialog:
         selection_frame.pack(fill="x", pady=(0, 10))
         
         cameras = self.camera_controller.get_cameras()
-        camera_names = [f"{cam.name} ({cam.device_path})" for cam in cameras]
+        self.camera_index = CameraIndex(cameras)
         
         self.camera_var = tk.StringVar()
-        camera_combo = ttk.Combobox(selection_frame, textvariable=self.camera_var, values=camera_names, state="readonly")
+        camera_combo = ttk.Combobox(selection_frame, textvariable=self.camera_var, values=self.camera_index.labels(),
+                                    state="readonly")
         camera_combo.pack(fill="x")
         camera_combo.bind("<<ComboboxSelected>>", self.on_camera_selected)
         
@@ -412,13 +444,25 @@ class CameraConfigDialog:
         if not selection:
             return
         
-        # Extract device path
-        device_path = selection.split("(")[1].split(")")[0]
-        self.camera = self.camera_controller.get_camera(device_path)
+        self.camera = self.camera_index.by_label(selection)
         
-        if self.camera:
+        if self.camera and not self.camera.parameters_loaded:
+            # Enumerate the controls in the background first
+            camera = self.camera
+            self.dispatcher.when_done(
+                self.background.submit(camera.device_path, camera.load_parameters),
+                lambda result: self._show_parameter_selection(camera)
+            )
+        elif self.camera:
             self.create_parameter_selection(self.window.children['!frame'])
     
+    def _show_parameter_selection(self, camera: CameraDevice):
+        if camera is not self.camera or not self.window.winfo_exists():
+            return  # Selection changed or dialog closed meanwhile
+        if hasattr(self, 'param_frame'):
+            self.param_frame.destroy()
+        self.create_parameter_selection(self.window.children['!frame'])
+    
     def create_parameter_selection(self, parent):
         """Create parameter selection interface"""
         self.param_frame = ttk.LabelFrame(parent, text="Parameter Configuration", padding="10")
@@ -426,8 +470,8 @@ class CameraConfigDialog:
         
         # Enable checkbox
         self.enabled_var = tk.BooleanVar()
-        if self.camera and self.camera.device_path in self.startup_configs:
-            self.enabled_var.set(self.startup_configs[self.camera.device_path].get("enabled", False))
+        if self.camera and self.camera.key in self.startup_configs:
+            self.enabled_var.set(self.startup_configs[self.camera.key].get("enabled", False))
         
         enable_frame = ttk.Frame(self.param_frame)
         enable_frame.pack(fill="x", pady=(0, 10))
@@ -458,8 +502,8 @@ class CameraConfigDialog:
         # Create parameter controls
         if self.camera and self.camera.parameters:
             existing_config = {}
-            if self.camera.device_path in self.startup_configs:
-                existing_config = self.startup_configs[self.camera.device_path].get("parameters", {})
+            if self.camera.key in self.startup_configs:
+                existing_config = self.startup_configs[self.camera.key].get("parameters", {})
             
             for param_name, param in sorted(self.camera.parameters.items()):
                 self.create_parameter_control(scrollable_frame, param, existing_config.get(param_name))
@@ -570,7 +614,7 @@ class CameraConfigDialog:
                 value_var = self.param_values[param_name]
                 config["parameters"][param_name] = value_var.get()
         
-        self.result = (self.camera.device_path, config)
+        self.result = (self.camera.key, config)
         self.window.destroy()
     
     def cancel_clicked(self):
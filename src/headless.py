@@ -0,0 +1,96 @@
+"""
+Headless Apply
+Pushes the startup configurations to the cameras without starting the GUI
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import time
+from typing import Dict, Optional, TextIO
+
+from camera.async_controller import AsyncCameraController
+from camera.identity import find_device_paths
+from camera.profile import DEFAULT_APPLY_TIMEOUT, DEFAULT_APPLY_WORKERS
+from config.startup import enabled_profiles, load_startup_configs, profiles_by_device
+
+logger = logging.getLogger(__name__)
+
+async def apply_profiles(profiles: Dict[str, Dict], dry_run: bool = False,
+                         max_workers: Optional[int] = DEFAULT_APPLY_WORKERS,
+                         timeout: Optional[float] = DEFAULT_APPLY_TIMEOUT,
+                         **controller_options) -> Dict:
+    """Detect the cameras named in profiles and apply them concurrently
+    
+    Camera keys are resolved to device nodes through sysfs first, so only
+    those nodes are probed (or restored from the detection cache); other
+    cameras are never opened.
+    
+    Args:
+        profiles: Mapping of camera key (stable ID or device path) to parameter values
+        dry_run: Only read and diff, write nothing
+        max_workers: Cameras applied at the same time
+        timeout: Seconds per camera before it is reported as failed
+        **controller_options: Passed to CameraController
+    
+    Returns:
+        ApplySummary.to_dict() by device path (camera key if not found); each
+        camera entry also has its name, ``camera_id`` and ``found``
+    """
+    devices = sorted(set(find_device_paths(profiles).values()))
+    controller = await AsyncCameraController.detect(devices=devices, **controller_options)
+    try:
+        profiles = profiles_by_device(profiles, controller.get_camera)
+        summary = await controller.apply_all(profiles, dry_run, max_workers, timeout)
+    finally:
+        await controller.close()
+    logger.info(f"Applied startup configurations: {summary.summary()}")
+    
+    result = summary.to_dict()
+    for device_path, entry in result['cameras'].items():
+        camera = controller.get_camera(device_path)
+        entry['found'] = camera is not None
+        entry['name'] = camera.name if camera else None
+        entry['camera_id'] = camera.key if camera else device_path
+        if device_path in summary.reports:
+            entry['summary'] = summary.reports[device_path].summary()
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("External command statistics:\n" + controller.controller.executor.format_stats())
+    return result
+
+def run_apply(config_file: Optional[str] = None, dry_run: bool = False,
+              max_workers: Optional[int] = DEFAULT_APPLY_WORKERS,
+              timeout: Optional[float] = DEFAULT_APPLY_TIMEOUT,
+              output: TextIO = sys.stdout, **controller_options) -> int:
+    """Apply the enabled startup configurations and print a JSON summary
+    
+    Returns:
+        Exit code: 0 if every camera was applied completely, 1 if a camera
+        was missing, timed out or a control failed, 2 if the configuration
+        was unreadable
+    """
+    started = time.perf_counter()
+    try:
+        profiles = enabled_profiles(load_startup_configs(config_file))
+    except Exception as e:
+        logger.error(f"Failed to read startup configurations: {e}")
+        json.dump({'ok': False, 'error': str(e)}, output)
+        output.write("\n")
+        return 2
+    
+    result = asyncio.run(apply_profiles(profiles, dry_run, max_workers, timeout, **controller_options)) if profiles else {}
+    cameras = result.get('cameras', {})
+    ok = all(entry['found'] and not entry.get('error') and not entry['failed'] for entry in cameras.values())
+    
+    json.dump({
+        'ok': ok,
+        'dry_run': dry_run,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        'apply_ms': result.get('elapsed_ms', 0.0),
+        'summary': result.get('summary', "No enabled startup configurations"),
+        'cameras': cameras,
+    }, output, indent=2)
+    output.write("\n")
+    return 0 if ok else 1
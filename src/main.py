@@ -30,8 +30,12 @@ src_dir = Path(__file__).parent
 if str(src_dir) not in sys.path:
     sys.path.insert(0, str(src_dir))
 
-from gui.main_window import CamLoaderMainWindow
+from camera.enforcer import ConfigEnforcer
+from camera.executor import get_executor
+from camera.profile import DEFAULT_APPLY_TIMEOUT, DEFAULT_APPLY_WORKERS
+from camera.writer import ParameterWriteQueue
 from utils.logger import setup_logging
+from utils.profiler import DEFAULT_TRACE_FILE, enable_profiler, get_profiler, profile_span
 
 def parse_arguments():
     """Parse command line arguments"""
@@ -42,6 +46,12 @@ def parse_arguments():
 Examples:
   %(prog)s              # Start normally
   %(prog)s --minimized  # Start minimized to tray/taskbar
+  %(prog)s --profile-startup          # Log startup phase timings, write a Chrome trace
+  %(prog)s --apply-startup            # Apply startup configs without GUI, print JSON summary
+  %(prog)s --apply-startup --dry-run  # Show what would be written
+  %(prog)s --daemon                   # Serve the cameras to other processes over a Unix socket
+  %(prog)s --connect                  # Start the GUI as a client of a running daemon
+  %(prog)s --enforce                  # Re-apply startup configs after reconnects and drift
   %(prog)s --version    # Show version information
         '''
     )
@@ -61,16 +71,182 @@ Examples:
     parser.add_argument(
         '--debug',
         action='store_true',
-        help='Enable debug logging'
+        help='Enable debug logging, including per-command latency statistics'
     )
     
-    return parser.parse_args()
+    parser.add_argument(
+        '--rescan',
+        action='store_true',
+        help='Ignore the detection cache and re-probe all cameras'
+    )
+    
+    parser.add_argument(
+        '--no-prefetch',
+        action='store_true',
+        help='Load camera parameters only when a camera is selected'
+    )
+    
+    parser.add_argument(
+        '--probe-workers',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Number of cameras probed concurrently during detection (default: 4)'
+    )
+    
+    parser.add_argument(
+        '--write-rate',
+        type=float,
+        default=ParameterWriteQueue.DEFAULT_MAX_RATE,
+        metavar='HZ',
+        help='Maximum writes per second to a single control while dragging a slider (default: %(default)g)'
+    )
+    
+    parser.add_argument(
+        '--profile-startup',
+        nargs='?',
+        const=str(DEFAULT_TRACE_FILE),
+        default=None,
+        metavar='TRACE_FILE',
+        help='Time the startup phases, log them as a table and write a Chrome trace '
+             f'(default file: {DEFAULT_TRACE_FILE})'
+    )
+    
+    parser.add_argument(
+        '--apply-startup',
+        action='store_true',
+        help='Apply the enabled startup configurations without starting the GUI, '
+             'print a JSON summary and exit (exit code 1 if anything failed)'
+    )
+    
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='With --apply-startup: report the planned changes without writing them'
+    )
+    
+    parser.add_argument(
+        '--startup-config',
+        default=None,
+        metavar='FILE',
+        help='With --apply-startup: startup configuration JSON file (default: the config store, ~/.camloader/camloader.db)'
+    )
+    
+    parser.add_argument(
+        '--apply-workers',
+        type=int,
+        default=DEFAULT_APPLY_WORKERS,
+        metavar='N',
+        help='Number of cameras whose startup configuration is applied concurrently (default: %(default)s)'
+    )
+    
+    parser.add_argument(
+        '--apply-timeout',
+        type=float,
+        default=DEFAULT_APPLY_TIMEOUT,
+        metavar='SECONDS',
+        help='Give up on a camera whose startup configuration takes longer (default: %(default)g)'
+    )
+    
+    parser.add_argument(
+        '--daemon',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='SOCKET',
+        help='Run the camera control daemon without GUI until interrupted '
+             '(default socket: $XDG_RUNTIME_DIR/camloader.sock or ~/.camloader/camloader.sock)'
+    )
+    
+    parser.add_argument(
+        '--connect',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='SOCKET',
+        help='Start the GUI as a client of a running daemon instead of opening the cameras itself'
+    )
+    
+    parser.add_argument(
+        '--enforce',
+        nargs='?',
+        type=float,
+        const=ConfigEnforcer.DEFAULT_INTERVAL,
+        default=None,
+        metavar='SECONDS',
+        help='Watch the cameras with an enabled startup configuration and re-apply drifted controls, '
+             'checking every SECONDS (default: %(const)g) and backing off to '
+             f'{ConfigEnforcer.DEFAULT_MAX_INTERVAL:g} s while nothing changes'
+    )
+    
+    args = parser.parse_args()
+    if args.apply_workers < 1 or args.apply_timeout <= 0:
+        parser.error("--apply-workers and --apply-timeout must be positive")
+    if args.enforce is not None and args.enforce <= 0:
+        parser.error("--enforce interval must be positive")
+    if args.enforce is not None and (args.apply_startup or args.connect is not None):
+        parser.error("--enforce cannot be combined with --apply-startup or --connect (enforce on the daemon instead)")
+    if args.daemon is not None and (args.apply_startup or args.connect is not None):
+        parser.error("--daemon cannot be combined with --apply-startup or --connect")
+    if (args.dry_run or args.startup_config) and not args.apply_startup:
+        parser.error("--dry-run and --startup-config require --apply-startup")
+    return args
+
+def run_headless(args) -> int:
+    """Apply startup configurations without importing the GUI"""
+    # stdout carries the JSON summary, logs go to stderr
+    quiet_level = logging.INFO if args.profile_startup else logging.WARNING
+    setup_logging(level=logging.DEBUG if args.debug else quiet_level, stream=sys.stderr)
+    
+    from headless import run_apply
+    with profile_span("headless apply"):
+        exit_code = run_apply(
+            config_file=args.startup_config,
+            dry_run=args.dry_run,
+            max_workers=args.apply_workers,
+            timeout=args.apply_timeout,
+            probe_workers=args.probe_workers,
+            force_probe=args.rescan
+        )
+    
+    # No window, so no first-paint milestone: report right away
+    profiler = get_profiler()
+    if profiler:
+        profiler.report()
+    return exit_code
+
+def run_daemon(args) -> int:
+    """Serve the cameras over a Unix socket without importing the GUI"""
+    setup_logging(level=logging.DEBUG if args.debug else logging.INFO)
+    logger = logging.getLogger(__name__)
+    
+    import asyncio
+    from camera.daemon import serve
+    try:
+        asyncio.run(serve(args.daemon or None, enforce_interval=args.enforce,
+                          probe_workers=args.probe_workers, force_probe=args.rescan))
+    except Exception as e:
+        logger.error(f"Camera daemon failed: {e}", exc_info=args.debug)
+        return 1
+    
+    if args.debug:
+        logger.debug("External command statistics:\n" + get_executor().format_stats())
+    return 0
 
 def main():
     """Main entry point for the application"""
     # Parse command line arguments
     args = parse_arguments()
     
+    if args.profile_startup:
+        enable_profiler(args.profile_startup)
+    
+    if args.apply_startup:
+        sys.exit(run_headless(args))
+    
+    if args.daemon is not None:
+        sys.exit(run_daemon(args))
+    
     # Setup logging
     log_level = logging.DEBUG if args.debug else logging.INFO
     setup_logging(level=log_level)
@@ -79,10 +255,29 @@ def main():
     try:
         logger.info(f"Starting CamLoader v{__version__}...")
         
+        # Imported here so headless runs never load tkinter
+        with profile_span("import gui"):
+            from gui.main_window import CamLoaderMainWindow
+        
         # Create and run the main application
-        app = CamLoaderMainWindow(start_minimized=args.minimized, version=__version__)
+        with profile_span("CamLoaderMainWindow init"):
+            app = CamLoaderMainWindow(
+                start_minimized=args.minimized,
+                version=__version__,
+                probe_workers=args.probe_workers,
+                force_probe=args.rescan,
+                prefetch_parameters=not args.no_prefetch,
+                write_rate=args.write_rate,
+                daemon_socket=args.connect,
+                enforce_interval=args.enforce,
+                apply_workers=args.apply_workers,
+                apply_timeout=args.apply_timeout
+            )
         app.run()
         
+        if args.debug:
+            logger.debug("External command statistics:\n" + get_executor().format_stats())
+    
     except Exception as e:
         logger.error(f"Failed to start application: {e}", exc_info=True)
         sys.exit(1)
@@ -7,13 +7,14 @@ import logging
 import sys
 from pathlib import Path
 
-def setup_logging(log_level: str = "INFO", log_file: str = None, level: int = None):
+def setup_logging(log_level: str = "INFO", log_file: str = None, level: int = None, stream=None):
     """Setup application logging
     
     Args:
         log_level: String log level (INFO, DEBUG, etc.) - deprecated, use level instead
         log_file: Optional file path for log output
         level: Integer log level (logging.INFO, logging.DEBUG, etc.)
+        stream: Console stream (default: stdout)
     """
     
     # Use level parameter if provided, otherwise use log_level string
@@ -32,7 +33,7 @@ def setup_logging(log_level: str = "INFO", log_file: str = None, level: int = No
     )
     
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(stream or sys.stdout)
     console_handler.setLevel(log_level_int)
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
@@ -0,0 +1,143 @@
+"""
+Startup Profiler
+Records timed spans during startup and writes them as a table and a Chrome trace
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_FILE = Path.home() / ".camloader" / "startup-trace.json"
+
+class StartupProfiler:
+    """Collects spans (name, category, start, duration, thread) from any thread
+    
+    Times are relative to the profiler's creation. The report is written
+    once every milestone (e.g. first paint, startup complete) was reached.
+    The trace file uses the Chrome trace event format and can be opened in
+    chrome://tracing or https://ui.perfetto.dev.
+    """
+    
+    def __init__(self, trace_file: Optional[str] = None,
+                 milestones: Tuple[str, ...] = ("first_paint", "startup_complete")):
+        self.trace_file = Path(trace_file) if trace_file else DEFAULT_TRACE_FILE
+        self._origin = time.perf_counter()
+        self._events: List[Dict] = []
+        self._threads: Dict[int, str] = {}
+        self._pending_milestones = set(milestones)
+        self._reported = False
+        self._lock = threading.Lock()
+    
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1e6
+    
+    def _add(self, event: Dict):
+        thread = threading.current_thread()
+        event['pid'] = os.getpid()
+        event['tid'] = thread.ident
+        with self._lock:
+            self._threads[thread.ident] = thread.name
+            self._events.append(event)
+    
+    def begin(self, name: str, category: str = "startup", **args) -> Dict:
+        """Start a span that is ended elsewhere (possibly on another thread)"""
+        return {'name': name, 'cat': category, 'ts': self._now_us(), 'args': args}
+    
+    def end(self, token: Dict, **args):
+        """End a span started with begin()"""
+        token['args'].update(args)
+        self._add(dict(token, ph='X', dur=self._now_us() - token['ts']))
+    
+    @contextmanager
+    def span(self, name: str, category: str = "startup", **args):
+        token = self.begin(name, category, **args)
+        try:
+            yield token['args']
+        finally:
+            self.end(token)
+    
+    def milestone(self, name: str, **args):
+        """Record an instant event; writes the report after the last milestone"""
+        self._add({'name': name, 'cat': "milestone", 'ph': 'i', 's': 'g', 'ts': self._now_us(), 'args': args})
+        with self._lock:
+            self._pending_milestones.discard(name)
+            ready = not self._pending_milestones and not self._reported
+            if ready:
+                self._reported = True
+        if ready:
+            self.report()
+    
+    def events(self) -> List[Dict]:
+        with self._lock:
+            return sorted(self._events, key=lambda event: event['ts'])
+    
+    def format_table(self) -> str:
+        """Spans and milestones sorted by start time"""
+        lines = [f"{'start ms':>9} {'dur ms':>9}  {'thread':<22} {'category':<10} name"]
+        with self._lock:
+            threads = dict(self._threads)
+        for event in self.events():
+            duration = f"{event['dur'] / 1000:9.1f}" if event['ph'] == 'X' else f"{'':>9}"
+            lines.append(
+                f"{event['ts'] / 1000:9.1f} {duration}  {threads.get(event['tid'], '?'):<22.22} "
+                f"{event['cat']:<10} {event['args'].get('command', event['name'])}"
+            )
+        return "\n".join(lines)
+    
+    def chrome_trace(self) -> Dict:
+        with self._lock:
+            threads = dict(self._threads)
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+            for tid, name in threads.items()
+        ]
+        return {'traceEvents': metadata + self.events(), 'displayTimeUnit': 'ms'}
+    
+    def report(self):
+        """Log the table and write the Chrome trace file"""
+        logger.info("Startup profile:\n" + self.format_table())
+        try:
+            self.trace_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.trace_file, 'w') as f:
+                json.dump(self.chrome_trace(), f)
+            logger.info(f"Startup trace written to {self.trace_file}")
+        except Exception as e:
+            logger.warning(f"Failed to write startup trace: {e}")
+
+# Process-wide profiler, only set with --profile-startup
+_profiler: Optional[StartupProfiler] = None
+
+def enable_profiler(trace_file: Optional[str] = None) -> StartupProfiler:
+    global _profiler
+    _profiler = StartupProfiler(trace_file)
+    return _profiler
+
+def get_profiler() -> Optional[StartupProfiler]:
+    return _profiler
+
+def profile_span(name: str, category: str = "startup", **args):
+    """Context manager timing a span; does nothing unless profiling is enabled"""
+    if _profiler is None:
+        return nullcontext({})
+    return _profiler.span(name, category, **args)
+
+def profile_begin(name: str, category: str = "startup", **args) -> Optional[Dict]:
+    """Start a span ended by profile_end(); returns None unless profiling is enabled"""
+    if _profiler is None:
+        return None
+    return _profiler.begin(name, category, **args)
+
+def profile_end(token: Optional[Dict], **args):
+    if _profiler is not None and token is not None:
+        _profiler.end(token, **args)
+
+def profile_milestone(name: str, **args):
+    if _profiler is not None:
+        _profiler.milestone(name, **args)
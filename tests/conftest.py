@@ -0,0 +1,9 @@
+"""
+Test Configuration
+Makes the application packages under src importable (as scripts/ does)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
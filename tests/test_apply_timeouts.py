@@ -0,0 +1,63 @@
+"""
+Apply Timeout Tests
+A timed-out camera is reported, but keeps its slot and device lock until its write returns
+"""
+
+import asyncio
+import threading
+import time
+
+from camera import background as background_module
+from camera.async_controller import AsyncCameraController
+from camera.background import BackgroundController
+from camera.profile import ApplyPlan, ApplyReport
+
+def test_background_timeout_keeps_slot(monkeypatch):
+    release = threading.Event()
+    running = []
+    overlapped = []
+    
+    def apply_profile(controller, device_path, values):
+        if running:
+            overlapped.append(device_path)
+        running.append(device_path)
+        if device_path == "/dev/video0":
+            release.wait(5)
+        running.remove(device_path)
+        return ApplyReport(ApplyPlan.for_missing_camera(device_path, values))
+    
+    monkeypatch.setattr(background_module, "apply_profile", apply_profile)
+    background = BackgroundController(controller=object())
+    try:
+        future = background.apply_profiles({"/dev/video0": {}, "/dev/video2": {}}, max_workers=1, timeout=0.05)
+        time.sleep(0.2)
+        assert running == ["/dev/video0"]  # video2 still waits for the slot
+        release.set()
+        summary = future.result(5)
+    finally:
+        background.shutdown()
+    
+    assert "No result" in summary.errors["/dev/video0"]
+    assert "/dev/video2" in summary.reports
+    assert overlapped == []
+
+def test_async_timeout_keeps_device_lock():
+    async def scenario():
+        controller = AsyncCameraController(controller=None)
+        release = asyncio.Event()
+        
+        async def apply_profile(device_path, values, dry_run=False):
+            async with controller._lock(device_path):
+                await release.wait()
+                return ApplyReport(ApplyPlan.for_missing_camera(device_path, values))
+        
+        controller.apply_profile = apply_profile
+        summary = await controller.apply_all({"/dev/video0": {}}, max_workers=1, timeout=0.05)
+        assert "No result" in summary.errors["/dev/video0"]
+        assert controller._lock("/dev/video0").locked()
+        
+        release.set()
+        await asyncio.sleep(0.01)
+        assert not controller._lock("/dev/video0").locked()
+    
+    asyncio.run(scenario())
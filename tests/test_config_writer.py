@@ -0,0 +1,72 @@
+"""
+Config Writer Tests
+Failed background writes are retried, never reported as saved
+"""
+
+import errno
+import json
+import threading
+
+import pytest
+
+from config.writer import BatchWriteError, ConfigWriter, write_json_files
+
+class FlakyStore:
+    """Batch writer failing while the disk is full"""
+    
+    def __init__(self):
+        self.full = True
+        self.written = {}
+    
+    def write_batch(self, batch):
+        if self.full:
+            raise OSError(errno.ENOSPC, "No space left on device")
+        self.written.update(batch)
+
+def make_writer(store) -> ConfigWriter:
+    writer = ConfigWriter(delay=0, write_batch=store.write_batch)
+    writer.RETRY_DELAY = 60
+    return writer
+
+def test_failed_write_is_retried():
+    store = FlakyStore()
+    writer = make_writer(store)
+    writer.submit("camera", {"brightness": 1})
+    
+    assert not writer.flush(5)
+    assert writer.pending("camera") == {"brightness": 1}
+    store.full = False
+    assert writer.flush(5)
+    assert store.written == {"camera": {"brightness": 1}}
+    assert writer.close()
+
+def test_newer_save_wins_over_failed_entry():
+    started, release = threading.Event(), threading.Event()
+    
+    def write_batch(batch):
+        started.set()
+        release.wait(5)
+        raise OSError(errno.EACCES, "Permission denied")
+    
+    writer = ConfigWriter(delay=0, write_batch=write_batch)
+    writer.RETRY_DELAY = 60
+    writer.submit("camera", "old")
+    assert started.wait(5)
+    writer.submit("camera", "new")
+    release.set()
+    assert not writer.flush(5)
+    assert writer.pending("camera") == "new"
+    writer.write_batch = lambda batch: None
+    assert writer.flush(5)
+
+def test_close_reports_unwritten_saves():
+    writer = make_writer(FlakyStore())
+    writer.submit("camera", {})
+    assert not writer.close(timeout=1)
+
+def test_json_files_report_only_failed_paths(tmp_path):
+    good, bad = tmp_path / "good.json", tmp_path / "missing" / "bad.json"
+    with pytest.raises(BatchWriteError) as caught:
+        write_json_files({good: {"a": 1}, bad: {"b": 2}})
+    assert list(caught.value.failed) == [bad]
+    assert json.loads(good.read_text()) == {"a": 1}
@@ -0,0 +1,38 @@
+"""
+Detection Cache Tests
+Lazily loaded parameters must reach the detection cache
+"""
+
+from camera.controller import CameraController, V4L2Parameter
+
+class FakeCache:
+    """DetectionCache stand-in returning fixed entries and recording saves"""
+    
+    def __init__(self, entries):
+        self.entries = entries
+        self.saved = []
+    
+    def load(self):
+        return self.entries
+    
+    def save(self, entries):
+        self.saved.append(entries)
+
+def test_lazily_loaded_parameters_are_cached(monkeypatch):
+    def load_camera_parameters(self, camera):
+        camera.parameters["brightness"] = V4L2Parameter("brightness", 128, 0, 255, 1)
+    
+    monkeypatch.setattr(CameraController, "_load_camera_parameters", load_camera_parameters)
+    cache = FakeCache([
+        {'device_path': "/dev/video0", 'name': "Camera", 'is_available': True, 'formats': [], 'parameters': None},
+    ])
+    controller = CameraController(use_ioctl=False, cache=cache, lazy_parameters=True)
+    camera = controller.get_camera("/dev/video0")
+    assert not camera.parameters_loaded
+    assert cache.saved == []
+    
+    assert "brightness" in camera.parameters
+    
+    assert len(cache.saved) == 1
+    (entry,) = cache.saved[0]
+    assert entry['parameters']['brightness']['value'] == 128
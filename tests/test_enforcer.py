@@ -0,0 +1,58 @@
+"""
+Config Enforcer Tests
+Checks run through the submit hook and are not queued twice
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import SimpleNamespace
+
+from camera import enforcer as enforcer_module
+from camera.enforcer import ConfigEnforcer
+
+class FakeController:
+    def get_camera(self, device_path):
+        return SimpleNamespace(device_path=device_path)
+
+def drifted_plan(monkeypatch, threads):
+    """Every check finds brightness drifted; record the threads that wrote it"""
+    def plan_profile(controller, device_path, targets):
+        return SimpleNamespace(changes={name: (0, value) for name, value in targets.items()})
+    
+    def write_plan(controller, plan):
+        threads.append(threading.current_thread().name)
+        return SimpleNamespace(written=list(plan.changes), failed=[])
+    
+    monkeypatch.setattr(enforcer_module, "plan_profile", plan_profile)
+    monkeypatch.setattr(enforcer_module, "write_plan", write_plan)
+
+def test_check_runs_on_submitted_worker(monkeypatch):
+    threads = []
+    drifted_plan(monkeypatch, threads)
+    worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="device-worker")
+    enforcer = ConfigEnforcer(FakeController(), lambda: {"/dev/video0": {"brightness": 128}},
+                              submit=lambda device_path, func, *args: worker.submit(func, *args))
+    try:
+        assert enforcer.check() == 1
+    finally:
+        worker.shutdown()
+    assert len(threads) == 1 and threads[0].startswith("device-worker")
+
+def test_busy_device_is_not_submitted_again(monkeypatch):
+    drifted_plan(monkeypatch, [])
+    monkeypatch.setattr(ConfigEnforcer, "CHECK_TIMEOUT", 0.01)
+    submitted = []
+    
+    def submit(device_path, func, *args):
+        future = Future()  # Stuck behind other work on the device
+        submitted.append(future)
+        return future
+    
+    enforcer = ConfigEnforcer(FakeController(), lambda: {"/dev/video0": {"brightness": 128}}, submit=submit)
+    assert enforcer.check() == 0
+    assert enforcer.check() == 0
+    assert len(submitted) == 1
+    
+    submitted[0].set_result(True)
+    enforcer.check()
+    assert len(submitted) == 2
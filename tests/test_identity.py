@@ -0,0 +1,78 @@
+"""
+Device Identity Tests
+Stable IDs from a fake sysfs tree, including identical cameras
+"""
+
+import pytest
+
+from camera import controller as controller_module
+from camera.controller import CameraController, CameraDevice
+from camera.identity import CameraIndex, find_device_paths, read_stable_id, stable_ids
+
+def add_usb_camera(tmp_path, node: str, port: str, serial: str, vendor: str = "046d", product: str = "0825"):
+    """Create /dev/<node> and its sysfs entry below USB device <port>"""
+    usb_dir = tmp_path / "sys" / "devices" / "usb1" / port
+    interface_dir = usb_dir / f"{port}:1.0"
+    interface_dir.mkdir(parents=True)
+    (usb_dir / "idVendor").write_text(f"{vendor}\n")
+    (usb_dir / "idProduct").write_text(f"{product}\n")
+    (usb_dir / "serial").write_text(f"{serial}\n")
+    
+    node_dir = tmp_path / "sys" / "class" / "video4linux" / node
+    node_dir.mkdir(parents=True)
+    (node_dir / "index").write_text("0\n")
+    (node_dir / "device").symlink_to(interface_dir)
+    
+    (tmp_path / "dev").mkdir(exist_ok=True)
+    (tmp_path / "dev" / node).touch()
+    return str(tmp_path / "dev" / node)
+
+@pytest.fixture
+def roots(tmp_path):
+    return {
+        'dev_root': str(tmp_path / "dev"),
+        'sysfs_root': str(tmp_path / "sys" / "class" / "video4linux"),
+        'by_id_dir': str(tmp_path / "by-id"),
+    }
+
+def test_unique_camera_keeps_serial_id(tmp_path, roots):
+    video0 = add_usb_camera(tmp_path, "video0", "1-1", "ABC123")
+    add_usb_camera(tmp_path, "video2", "1-2", "DEF456")
+    
+    assert stable_ids(**roots)[video0] == "usb/046d:0825:ABC123#0"
+    assert read_stable_id(video0, roots['sysfs_root'], roots['by_id_dir']) == "usb/046d:0825:ABC123#0"
+
+def test_shared_serial_gets_port_qualified_ids(tmp_path, roots):
+    video0 = add_usb_camera(tmp_path, "video0", "1-1", "0001")
+    video2 = add_usb_camera(tmp_path, "video2", "1-2", "0001")
+    
+    ids = stable_ids(**roots)
+    assert ids[video0] == "usb/046d:0825:0001@1-1#0"
+    assert ids[video2] == "usb/046d:0825:0001@1-2#0"
+    
+    # Asking for one of them gives the same ID as a full scan
+    assert stable_ids([video2], **roots)[video2] == ids[video2]
+    assert find_device_paths([ids[video0], ids[video2]], **roots) == {ids[video0]: video0, ids[video2]: video2}
+
+def test_controller_keys_identical_cameras_apart(tmp_path, roots, monkeypatch):
+    video0 = add_usb_camera(tmp_path, "video0", "1-1", "0001")
+    video2 = add_usb_camera(tmp_path, "video2", "1-2", "0001")
+    
+    def detect(self):
+        for device_path in (video0, video2):
+            self._camera_found(CameraDevice(device_path, "Camera"))
+    
+    monkeypatch.setattr(controller_module, "IS_LINUX", True)
+    monkeypatch.setattr(controller_module, "read_stable_id",
+                        lambda path: read_stable_id(path, roots['sysfs_root'], roots['by_id_dir']))
+    monkeypatch.setattr(controller_module, "stable_ids", lambda paths: stable_ids(paths, **roots))
+    monkeypatch.setattr(CameraController, "_detect_cameras", detect)
+    controller = CameraController(use_ioctl=False, use_cache=False)
+    
+    keys = [camera.key for camera in controller.get_cameras()]
+    assert keys == ["usb/046d:0825:0001@1-1#0", "usb/046d:0825:0001@1-2#0"]
+    
+    index = CameraIndex(controller.get_cameras(), label=lambda camera: camera.device_path)
+    assert index.get(keys[0]).device_path == video0
+    assert index.get(keys[1]).device_path == video2
+    assert controller.get_camera(keys[1]).device_path == video2
@@ -0,0 +1,97 @@
+"""
+Parameter Write Queue Tests
+Queued slider writes share the device worker with every other device operation
+"""
+
+import threading
+import time
+
+from camera.background import BackgroundController
+from camera.writer import ParameterWriteQueue
+
+class FakeController:
+    """Records device calls and whether any of them overlapped"""
+    
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+        self.overlapped = False
+        self.release = threading.Event()
+        self.release.set()
+        self._busy = threading.Lock()
+    
+    def get_camera(self, device_path):
+        return None
+    
+    def _call(self, *call):
+        if not self._busy.acquire(blocking=False):
+            self.overlapped = True
+            return False
+        try:
+            self.threads.add(threading.current_thread().name)
+            self.calls.append(call)
+            return True
+        finally:
+            self._busy.release()
+    
+    def set_parameter(self, device_path, name, value):
+        return self._call("set", name, value)
+    
+    def set_parameters(self, device_path, values):
+        self._busy.acquire()
+        try:
+            self.calls.append(("apply", values))
+            self.release.wait(5)
+        finally:
+            self._busy.release()
+        return {name: True for name in values}
+    
+    def get_parameters(self, device_path, names=None):
+        self._call("get")
+        return {}
+
+def make_background(controller, max_rate=ParameterWriteQueue.DEFAULT_MAX_RATE):
+    writer = ParameterWriteQueue(controller, max_rate=max_rate)
+    return writer, BackgroundController(controller=controller, writer=writer)
+
+def test_writes_wait_for_running_operation():
+    controller = FakeController()
+    writer, background = make_background(controller)
+    try:
+        controller.release.clear()
+        applied = background.set_parameters("/dev/video0", {"gain": 1})
+        while not controller.calls:
+            time.sleep(0.01)
+        for value in range(1, 6):
+            writer.submit("/dev/video0", "brightness", value)
+        time.sleep(0.1)
+        assert controller.calls == [("apply", {"gain": 1})]
+        
+        controller.release.set()
+        applied.result(5)
+        assert writer.flush(5)
+    finally:
+        writer.close()
+        background.shutdown()
+    
+    assert not controller.overlapped
+    assert controller.calls[-1] == ("set", "brightness", 5)
+    assert controller.threads == {"camloader-video0_0"}
+
+def test_settled_operation_runs_after_queued_writes():
+    controller = FakeController()
+    writer, background = make_background(controller, max_rate=0.1)
+    try:
+        writer.submit("/dev/video0", "brightness", 1)
+        assert writer.flush(5)
+        writer.submit("/dev/video0", "brightness", 2)  # Rate limited for 10 s
+        started = time.monotonic()
+        background.get_parameters("/dev/video0").result(5)
+        elapsed = time.monotonic() - started
+    finally:
+        writer.close()
+        background.shutdown()
+    
+    assert controller.calls[-1] == ("get",)
+    assert ("set", "brightness", 2) in controller.calls
+    assert elapsed < 1.0
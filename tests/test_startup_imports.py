@@ -0,0 +1,46 @@
+"""
+Startup Import Tests
+The headless --apply-startup path must not load the GUI toolkit or image libraries
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FORBIDDEN = ("tkinter", "cv2", "PIL")
+
+# Runs main.py as the command line does and prints the loaded modules at exit
+PROBE = """
+import atexit, json, runpy, sys
+sys.path.insert(0, {src!r})
+atexit.register(lambda: print("MODULES " + json.dumps(sorted(sys.modules))))
+sys.argv = ["main.py"] + {args!r}
+runpy.run_path({main!r}, run_name="__main__")
+"""
+
+def run_probe(args, home: Path) -> subprocess.CompletedProcess:
+    code = PROBE.format(src=str(ROOT / "src"), main=str(ROOT / "src" / "main.py"), args=args)
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60,
+                          env=dict(os.environ, HOME=str(home)))
+
+def test_apply_startup_does_not_import_gui_modules(tmp_path):
+    startup_file = tmp_path / "startup_config.json"
+    startup_file.write_text(json.dumps({
+        "usb/ffff:ffff:NOTCONNECTED#0": {"enabled": True, "parameters": {"brightness": 128}},
+    }))
+    result = run_probe(["--apply-startup", "--dry-run", "--startup-config", str(startup_file)], tmp_path)
+    
+    modules_line = next(line for line in result.stdout.splitlines() if line.startswith("MODULES "))
+    loaded = json.loads(modules_line[len("MODULES "):])
+    leaked = [name for name in loaded if name.split(".")[0] in FORBIDDEN]
+    assert leaked == [], f"--apply-startup imported {', '.join(leaked)}"
+    assert "headless" in loaded
+
+def test_startup_import_check_passes():
+    result = subprocess.run([sys.executable, str(ROOT / "scripts" / "check_startup_imports.py")],
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stdout + result.stderr
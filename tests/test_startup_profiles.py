@@ -0,0 +1,43 @@
+"""
+Startup Profile Tests
+Enabled profiles are only re-read after the startup configurations changed
+"""
+
+import json
+
+from config import startup
+from config.startup import EnabledProfileCache
+from config.store import ConfigStore
+
+def test_store_revision_counts_startup_changes(tmp_path):
+    store = ConfigStore(tmp_path / "camloader.db")
+    assert store.startup_revision() == 0
+    store.replace_startup_configs({"usb/046d:0825:ABC#0": {"enabled": True, "parameters": {}}})
+    store.replace_startup_configs({})
+    assert store.startup_revision() == 2
+    
+    other = ConfigStore(tmp_path / "camloader.db")
+    other.replace_startup_configs({})
+    assert store.startup_revision() == 3
+    other.close()
+    store.close()
+
+def test_cache_rereads_only_after_a_change(tmp_path, monkeypatch):
+    config_file = tmp_path / "startup_config.json"
+    config_file.write_text(json.dumps({"usb/046d:0825:ABC#0": {"enabled": True, "parameters": {"brightness": 100}}}))
+    loads = []
+    load_startup_configs = startup.load_startup_configs
+    monkeypatch.setattr(startup, "load_startup_configs", lambda path: loads.append(path) or load_startup_configs(path))
+    
+    cache = EnabledProfileCache(config_file)
+    assert cache.get() == {"usb/046d:0825:ABC#0": {"brightness": 100}}
+    assert cache.get() == {"usb/046d:0825:ABC#0": {"brightness": 100}}
+    assert len(loads) == 1
+    
+    startup.save_startup_configs({"usb/046d:0825:ABC#0": {"enabled": False, "parameters": {}}}, config_file)
+    assert cache.get() == {}
+    assert len(loads) == 2
+    
+    cache.invalidate()
+    cache.get()
+    assert len(loads) == 3
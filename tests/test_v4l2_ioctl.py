@@ -0,0 +1,189 @@
+"""
+V4L2 ioctl Backend Tests
+Control enumeration and reads/writes against a fake device behind fcntl.ioctl
+"""
+
+import errno
+import os
+
+import pytest
+
+from camera import controller as controller_module
+from camera import v4l2_ioctl
+from camera.controller import CameraController, CameraDevice
+from camera.v4l2_ioctl import (
+    V4L2_CAP_VIDEO_CAPTURE, V4L2_CTRL_FLAG_DISABLED, V4L2_CTRL_FLAG_NEXT_CTRL, V4L2_CTRL_FLAG_READ_ONLY,
+    V4L2_CTRL_FLAG_SLIDER, V4L2_CTRL_FLAG_WRITE_ONLY, V4L2_CTRL_TYPE_CTRL_CLASS, V4L2_CTRL_TYPE_INTEGER,
+    V4L2_CTRL_TYPE_MENU, VIDIOC_G_CTRL, VIDIOC_G_EXT_CTRLS, VIDIOC_QUERYCAP, VIDIOC_QUERYCTRL,
+    VIDIOC_QUERYMENU, VIDIOC_S_CTRL, VIDIOC_S_EXT_CTRLS, V4L2IoctlBackend,
+)
+
+BRIGHTNESS = 0x00980900
+POWER_LINE = 0x00980918
+
+class FakeDevice:
+    """A UVC-like camera answering the ioctls issued through fcntl.ioctl"""
+    
+    # id, type, name, min, max, step, default, flags
+    CONTROLS = [
+        (0x00980001, V4L2_CTRL_TYPE_CTRL_CLASS, b"User Controls", 0, 0, 0, 0,
+         V4L2_CTRL_FLAG_READ_ONLY | V4L2_CTRL_FLAG_WRITE_ONLY),
+        (BRIGHTNESS, V4L2_CTRL_TYPE_INTEGER, b"Brightness", 0, 255, 1, 128, V4L2_CTRL_FLAG_SLIDER),
+        (0x00980903, V4L2_CTRL_TYPE_INTEGER, b"Hue", -180, 180, 1, 0, V4L2_CTRL_FLAG_DISABLED),
+        (POWER_LINE, V4L2_CTRL_TYPE_MENU, b"Power Line Frequency", 0, 2, 1, 1, 0),
+    ]
+    MENUS = {(POWER_LINE, 0): b"Disabled", (POWER_LINE, 2): b"60 Hz"}  # Index 1 is a gap
+    
+    def __init__(self, ext_controls: bool = True, errors=None):
+        self.values = {BRIGHTNESS: 100, POWER_LINE: 2}
+        self.ext_controls = ext_controls
+        self.errors = errors or {}  # request -> errno
+        self.requests = []
+    
+    @staticmethod
+    def fail(code: int):
+        raise OSError(code, os.strerror(code))
+    
+    def ioctl(self, fd, request, arg, mutate=True):
+        self.requests.append(request)
+        if request in self.errors:
+            self.fail(self.errors[request])
+        
+        if request == VIDIOC_QUERYCAP:
+            arg.capabilities = V4L2_CAP_VIDEO_CAPTURE
+        elif request == VIDIOC_QUERYCTRL:
+            if arg.id & V4L2_CTRL_FLAG_NEXT_CTRL:
+                after = arg.id & ~V4L2_CTRL_FLAG_NEXT_CTRL
+                control = next((c for c in self.CONTROLS if c[0] > after), None)
+            else:
+                control = next((c for c in self.CONTROLS if c[0] == arg.id), None)
+            if control is None:
+                self.fail(errno.EINVAL)
+            (arg.id, arg.type, arg.name, arg.minimum, arg.maximum, arg.step,
+             arg.default_value, arg.flags) = control
+        elif request == VIDIOC_QUERYMENU:
+            name = self.MENUS.get((arg.id, arg.index))
+            if name is None:
+                self.fail(errno.EINVAL)
+            arg.name = name
+        elif request in (VIDIOC_G_EXT_CTRLS, VIDIOC_S_EXT_CTRLS):
+            if not self.ext_controls:
+                self.fail(errno.ENOTTY)
+            for i in range(arg.count):
+                self._access(request == VIDIOC_S_EXT_CTRLS, arg.controls[i])
+        elif request in (VIDIOC_G_CTRL, VIDIOC_S_CTRL):
+            self._access(request == VIDIOC_S_CTRL, arg)
+        else:
+            self.fail(errno.ENOTTY)
+    
+    def _access(self, write: bool, control):
+        if control.id not in self.values:
+            self.fail(errno.EINVAL)
+        if write:
+            self.values[control.id] = control.value
+        else:
+            control.value = self.values[control.id]
+
+@pytest.fixture
+def device(monkeypatch):
+    device = FakeDevice()
+    monkeypatch.setattr(v4l2_ioctl.fcntl, "ioctl", device.ioctl)
+    return device
+
+def make_backend() -> V4L2IoctlBackend:
+    return V4L2IoctlBackend(opener=lambda path: 3, closer=lambda fd: None)
+
+def test_queryctrl_enumeration(device):
+    controls = {control['name']: control for control in make_backend().list_controls("/dev/video0")}
+    
+    # Class headers and disabled controls are skipped, like v4l2-ctl does
+    assert list(controls) == ["brightness", "power_line_frequency"]
+    brightness = controls["brightness"]
+    assert (brightness['type'], brightness['min'], brightness['max'], brightness['step'], brightness['default']) == \
+        ("int", 0, 255, 1, 128)
+    assert brightness['flags'] == ["slider"]
+    assert brightness['value'] == 100
+    assert controls["power_line_frequency"]['value'] == 2
+
+def test_menu_items(device):
+    controls = {control['name']: control for control in make_backend().list_controls("/dev/video0")}
+    assert controls["power_line_frequency"]['menu_items'] == {0: "Disabled", 2: "60 Hz"}
+    assert controls["brightness"]['menu_items'] == {}
+    assert device.requests.count(VIDIOC_QUERYMENU) == 3
+
+def test_ext_controls_round_trip(device):
+    backend = make_backend()
+    assert backend.set_controls("/dev/video0", {"brightness": 50, "power_line_frequency": 0}) == \
+        {"brightness": True, "power_line_frequency": True}
+    assert backend.get_controls("/dev/video0", ["brightness", "power_line_frequency"]) == \
+        {"brightness": 50, "power_line_frequency": 0}
+    assert VIDIOC_S_CTRL not in device.requests and VIDIOC_G_CTRL not in device.requests
+
+def test_g_s_ctrl_round_trip(device):
+    device.ext_controls = False  # Driver without extended controls
+    backend = make_backend()
+    assert backend.set_control("/dev/video0", "brightness", 200)
+    assert backend.get_control("/dev/video0", "brightness") == 200
+    assert device.values[BRIGHTNESS] == 200
+    assert VIDIOC_S_CTRL in device.requests and VIDIOC_G_CTRL in device.requests
+
+def test_rejected_write_is_reported_per_control(device):
+    device.ext_controls = False
+    device.values.pop(POWER_LINE)  # S_CTRL answers EINVAL
+    results = make_backend().set_controls("/dev/video0", {"brightness": 10, "power_line_frequency": 1})
+    assert results == {"brightness": True, "power_line_frequency": False}
+
+def test_invalid_values_fail_without_a_write(device):
+    results = make_backend().set_controls("/dev/video0", {"brightness": "bright", "power_line_frequency": "0"})
+    assert results == {"brightness": False, "power_line_frequency": True}
+    assert device.values == {BRIGHTNESS: 100, POWER_LINE: 0}
+
+def test_invalid_value_fails_only_its_control(device, monkeypatch):
+    monkeypatch.setattr(controller_module, "IS_LINUX", True)
+    monkeypatch.setattr(CameraController, "_detect_cameras", lambda self: None)
+    controller = CameraController(use_cache=False, executor=FakeExecutor(), lazy_parameters=False)
+    controller._ioctl_backend = make_backend()
+    camera = CameraDevice("/dev/video0", "Camera")
+    controller.cameras[camera.device_path] = camera
+    controller._load_camera_parameters(camera)
+    
+    assert controller.set_parameters("/dev/video0", {"brightness": None, "power_line_frequency": 1.0}) == \
+        {"brightness": False, "power_line_frequency": True}
+    assert device.values == {BRIGHTNESS: 100, POWER_LINE: 1}
+
+class FakeExecutor:
+    """Records v4l2-ctl commands instead of running them"""
+    
+    LIST_OUTPUT = "                     brightness 0x00980900 (int)    : min=0 max=255 step=1 default=128 value=100\n"
+    
+    def __init__(self):
+        self.commands = []
+    
+    def run(self, command, timeout=None):
+        self.commands.append(command[1:])
+        if "--list-ctrls-menus" in command:
+            return True, self.LIST_OUTPUT
+        return True, ""
+
+@pytest.mark.parametrize("request_code, error", [
+    (VIDIOC_QUERYCAP, errno.ENOTTY),
+    (VIDIOC_QUERYCAP, errno.EINVAL),
+    (VIDIOC_QUERYCTRL, errno.ENOTTY),
+])
+def test_controller_falls_back_to_v4l2_ctl(device, monkeypatch, request_code, error):
+    device.errors[request_code] = error
+    monkeypatch.setattr(controller_module, "IS_LINUX", True)
+    monkeypatch.setattr(CameraController, "_detect_cameras", lambda self: None)
+    executor = FakeExecutor()
+    controller = CameraController(use_cache=False, executor=executor, lazy_parameters=False)
+    controller._ioctl_backend = make_backend()
+    
+    camera = CameraDevice("/dev/video0", "Camera")
+    controller.cameras[camera.device_path] = camera
+    controller._load_camera_parameters(camera)
+    assert camera.parameters["brightness"].value == 100
+    
+    assert controller.set_parameter("/dev/video0", "brightness", 50)
+    assert ["--device", "/dev/video0", "--list-ctrls-menus"] in executor.commands
+    assert ["--device", "/dev/video0", "--set-ctrl", "brightness=50"] in executor.commands
+    assert device.values[BRIGHTNESS] == 100  # Nothing went through ioctl
@@ -0,0 +1,85 @@
+"""
+Device Watcher Tests
+Hotplug events from a temporary /dev reach the controller and listeners once
+"""
+
+import threading
+
+from camera.watcher import DeviceWatcher, PollingEventSource
+
+class FakeController:
+    """Treats every video node as a camera"""
+    
+    def __init__(self):
+        self.cameras = {}
+        self.probed = []
+    
+    def get_camera(self, device_path):
+        return self.cameras.get(device_path)
+    
+    def add_device(self, device_path):
+        self.probed.append(device_path)
+        return self.cameras.setdefault(device_path, object())
+    
+    def remove_device(self, device_path):
+        return self.cameras.pop(device_path, None)
+
+class ScriptedEventSource:
+    """Hands out prepared event batches, then signals that all were read"""
+    
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.drained = threading.Event()
+    
+    def read(self, timeout):
+        if self.batches:
+            return self.batches.pop(0)
+        self.drained.set()
+        self.drained.wait(timeout)
+        return []
+    
+    def close(self):
+        pass
+
+def watch(dev_root, source):
+    controller = FakeController()
+    watcher = DeviceWatcher(controller, str(dev_root), event_source=source)
+    notified = []
+    watcher.add_listener(lambda event, device_path, camera: notified.append((event, device_path)))
+    return controller, watcher, notified
+
+def test_add_remove_and_duplicate_add(tmp_path):
+    video0 = tmp_path / "video0"
+    video0.touch()
+    source = ScriptedEventSource([
+        [("added", str(video0))],
+        [("added", str(video0))],  # Duplicate, e.g. a rescan after inotify
+        [("removed", str(video0)), ("removed", str(video0))],
+    ])
+    controller, watcher, notified = watch(tmp_path, source)
+    watcher.start()
+    try:
+        assert source.drained.wait(5)
+    finally:
+        watcher.stop()
+    
+    assert notified == [("added", str(video0)), ("removed", str(video0))]
+    assert controller.probed == [str(video0)]
+    assert controller.cameras == {}
+
+def test_polling_source_reports_node_changes(tmp_path):
+    source = PollingEventSource(str(tmp_path), interval=0)
+    controller, watcher, notified = watch(tmp_path, source)
+    
+    (tmp_path / "video0").touch()
+    (tmp_path / "media0").touch()  # Not a video node
+    for event, device_path in source.read(0):
+        watcher.handle_event(event, device_path)
+    assert source.read(0) == []
+    watcher.handle_event("added", str(tmp_path / "video0"))
+    
+    (tmp_path / "video0").unlink()
+    for event, device_path in source.read(0):
+        watcher.handle_event(event, device_path)
+    
+    assert notified == [("added", str(tmp_path / "video0")), ("removed", str(tmp_path / "video0"))]